@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import upload, profile, insights, report
+from app.routers import upload, profile, insights, report, metrics
 
 app = FastAPI(
     title="TD Profiler API",
@@ -22,6 +22,7 @@ app.include_router(upload.router, prefix="/api", tags=["Upload"])
 app.include_router(profile.router, prefix="/api/profile", tags=["Profile"])
 app.include_router(insights.router, prefix="/api/insights", tags=["Insights"])
 app.include_router(report.router, prefix="/api/report", tags=["Report"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
 @app.get("/")
 async def root():
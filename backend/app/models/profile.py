@@ -8,6 +8,7 @@ class JobResponse(BaseModel):
     file_size_bytes: int
     estimated_time_sec: int
     progress_url: str
+    events_url: Optional[str] = None
 
 class ProfileSummary(BaseModel):
     quality_score: int
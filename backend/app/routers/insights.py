@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from app.services.llm_insights import llm_service
 from app.services.job_manager import job_manager
 from app.utils.rate_limiter import rate_limiter, get_client_ip
@@ -11,7 +12,7 @@ async def get_insights(
     job_id: str,
     model: str = Query("claude-3-5-haiku-latest", description="Model to use for insights (e.g., claude-3-5-haiku-latest, gemini-1.5-flash)")
 ):
-    job = job_manager.get_job(job_id)
+    job = await run_in_threadpool(job_manager.get_job, job_id)
     if not job or job["status"] != "completed":
         raise HTTPException(status_code=404, detail="Profiling job not found or not completed")
 
@@ -51,9 +52,7 @@ async def get_insights(
     insights = await llm_service.generate_insights(results, model_name=model)
 
     # Cache the insights
-    if "insights_cache" not in job:
-        job["insights_cache"] = {}
-    job["insights_cache"][model] = insights
+    await run_in_threadpool(job_manager.cache_insights, job_id, model, insights)
 
     return {
         "job_id": job_id,
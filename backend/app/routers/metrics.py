@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from app.services.profiler.instrumentation import profiler_metrics
+from app.services.job_manager import job_manager
+from app.services.profiling_executor import profiling_executor
+from app.services.result_cache import result_cache
+from app.services.profiler.incremental import chunk_cache
+
+router = APIRouter()
+
+@router.get("")
+async def get_metrics():
+    """
+    Process-wide profiling metrics: per-analyzer totals and the durations of
+    the slowest columns seen by this worker (without their names), profiling queue depth and wait times, result and
+    chunk cache counters, plus job counts.
+    """
+    return {
+        "profiler": profiler_metrics.get_stats(),
+        "queue": profiling_executor.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "chunk_cache": chunk_cache.get_stats(),
+        "jobs": await run_in_threadpool(job_manager.get_stats)
+    }
@@ -1,18 +1,98 @@
+import os
+import asyncio
+from typing import Dict, Any, AsyncIterator
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from app.services.job_manager import job_manager
+from app.services.job_store import dump_json
+from app.services.progress import progress_broker, final_event, TERMINAL_EVENTS
 
 router = APIRouter()
 
+# Idle event streams send a comment this often so proxies keep them open
+PROGRESS_KEEPALIVE_SECONDS = float(os.getenv("PROGRESS_KEEPALIVE_SECONDS", "15"))
+# How often a stream re-reads a job that another worker is profiling
+PROGRESS_POLL_SECONDS = float(os.getenv("PROGRESS_POLL_SECONDS", "1"))
+
 @router.get("/{job_id}")
 async def get_profile(job_id: str):
-    job = job_manager.get_job(job_id)
+    job = await run_in_threadpool(job_manager.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    progress = progress_broker.snapshot(job_id)
+    if progress is not None:
+        return {**job, "progress": progress}
     return job
 
+@router.get("/{job_id}/events")
+async def stream_profile(job_id: str):
+    """
+    Server-Sent Events for a job: each column profile as it finishes, then
+    the summary and scores. Ends with a "completed" or "failed" event.
+    """
+    if await run_in_threadpool(job_manager.get_job_status, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _job_events(job_id: str) -> AsyncIterator[bytes]:
+    subscription = progress_broker.subscribe(job_id)
+    if subscription is None:
+        async for message in _stored_job_events(job_id):
+            yield message
+        return
+
+    events, queue = subscription
+    try:
+        for event, data in events:
+            yield _format_event(event, data)
+        if events and events[-1][0] in TERMINAL_EVENTS:
+            return
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=PROGRESS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield _format_event(event, data)
+            if event in TERMINAL_EVENTS:
+                return
+    finally:
+        progress_broker.unsubscribe(job_id, queue)
+
+async def _stored_job_events(job_id: str) -> AsyncIterator[bytes]:
+    """
+    Events for a job with no progress log in this process: finished already,
+    served from the result cache or run by another worker. Waits for the
+    stored result, then sends it as the same events a live job produces.
+    """
+    # Polls read the status alone; the result is fetched once the job is done
+    while await run_in_threadpool(job_manager.get_job_status, job_id) == "processing":
+        yield b": keepalive\n\n"
+        await asyncio.sleep(PROGRESS_POLL_SECONDS)
+
+    job = await run_in_threadpool(job_manager.get_job, job_id)
+
+    results = job["result"] if job is not None and job["status"] == "completed" else None
+    if results is not None:
+        columns = results["columns"]
+        yield _format_event("start", {"row_count": results["summary"]["row_count"], "column_count": len(columns)})
+        for position, column in enumerate(columns):
+            yield _format_event("column", {
+                "columns_done": position + 1, "columns_total": len(columns), "position": position, "column": column
+            })
+    yield _format_event(*final_event(results))
+
+def _format_event(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dump_json(data) + b"\n\n"
+
 @router.get("/{job_id}/column/{column_name}")
 async def get_column_detail(job_id: str, column_name: str):
-    job = job_manager.get_job(job_id)
+    job = await run_in_threadpool(job_manager.get_job, job_id)
     if not job or job["status"] != "completed":
         raise HTTPException(status_code=404, detail="Job not found or not completed")
     
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from app.services.job_manager import job_manager
 from datetime import datetime
 import json
@@ -20,7 +21,7 @@ async def get_report(
     - csv: Issues and column stats as CSV
     - pdf: Formatted PDF report (coming soon)
     """
-    job = job_manager.get_job(job_id)
+    job = await run_in_threadpool(job_manager.get_job, job_id)
     if not job or job["status"] != "completed":
         raise HTTPException(status_code=404, detail="Job not found or not completed")
 
@@ -41,6 +42,11 @@ async def get_report(
         raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
 
 
+def _reported(value):
+    """Fields of analyzers a restricted profile skipped are None; show them as n/a."""
+    return "n/a" if value is None else value
+
+
 def _export_json(result: dict, filename: str, timestamp: str) -> JSONResponse:
     """Export full profiling results as JSON."""
     return JSONResponse(
@@ -86,8 +92,8 @@ def _export_csv(result: dict, filename: str, timestamp: str) -> StreamingRespons
             semantic_type,
             col.get("null_count", 0),
             f"{col.get('null_percentage', 0):.1f}%",
-            col.get("distinct_count", 0),
-            col.get("quality_score", 0),
+            _reported(col.get("distinct_count", 0)),
+            _reported(col.get("quality_score", 0)),
             issue_text
         ])
 
@@ -142,7 +148,7 @@ def _generate_html_report(result: dict, filename: str, job: dict) -> str:
             <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{col.get("name", "")}</td>
             <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{col.get("inferred_type", "")}</td>
             <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{col.get("null_percentage", 0):.1f}%</td>
-            <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{col.get("quality_score", 0)}</td>
+            <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{_reported(col.get("quality_score", 0))}</td>
             <td style="padding: 8px; border-bottom: 1px solid #e5e7eb;">{issues_html or "None"}</td>
         </tr>
         """
@@ -181,7 +187,7 @@ def _generate_html_report(result: dict, filename: str, job: dict) -> str:
 
         <div class="summary-grid">
             <div class="summary-card">
-                <div class="summary-value">{summary.get("quality_score", 0)}</div>
+                <div class="summary-value">{_reported(summary.get("quality_score", 0))}</div>
                 <div class="summary-label">Quality Score</div>
             </div>
             <div class="summary-card">
@@ -193,7 +199,7 @@ def _generate_html_report(result: dict, filename: str, job: dict) -> str:
                 <div class="summary-label">Columns</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value">{summary.get("duplicate_rows", 0)}</div>
+                <div class="summary-value">{_reported(summary.get("duplicate_rows", 0))}</div>
                 <div class="summary-label">Duplicates</div>
             </div>
         </div>
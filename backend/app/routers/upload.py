@@ -1,48 +1,546 @@
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException, Request, Depends
+import os
+import logging
+import tempfile
+import polars as pl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Dict, Any, Optional, Tuple, List, Callable, FrozenSet
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import FormParserError
 from app.models.profile import JobResponse
-from app.utils.file_parser import parse_file
-from app.services.profiler.engine import profile_dataset
+from app.utils.compression import split_compression, decompress_file, iter_zip_members
+from app.utils.multipart_stream import MultipartFileStream
+from app.utils.file_parser import (
+    parse_file, parse_file_chunks, scan_file, parquet_statistics, excel_sheet_names, get_extension,
+    STREAMABLE_EXTENSIONS, POLARS_EXTENSIONS, EXCEL_EXTENSIONS, ALL_SHEETS, CHUNK_ROWS
+)
+from app.services.profiler.engine import profile_dataset, approximate_conflicts
+from app.services.profiler.analyzers import ALL_ANALYZERS, resolve_analyzers
+from app.services.profiler.compaction import PROFILER_COMPACT
+from app.services.profiler.sampling import profile_sample, sample_conflicts, SAMPLE_MARGIN
+from app.services.profiler.polars_engine import profile_polars
+from app.services.profiler.streaming import profile_chunks, iter_row_chunks, chunked_conflicts
+from app.services.profiler.incremental import chunk_cache
+from app.services.profiler.metadata import profiles_from_statistics, statistics_only_results, add_column_profiles
 from app.services.job_manager import job_manager
+from app.services.progress import progress_broker, scoped
+from app.services.profiling_executor import profiling_executor, QueueFullError
+from app.services.result_cache import result_cache, content_hasher, make_cache_key, cached_copy
 from app.utils.rate_limiter import check_rate_limit
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Max file size: 5MB
 MAX_FILE_SIZE = 5 * 1024 * 1024
+# Streamable files (CSV, NDJSON, Parquet, Arrow) above MAX_FILE_SIZE are profiled in row chunks, up to this size
+MAX_STREAMING_FILE_SIZE = int(os.getenv("MAX_STREAMING_FILE_MB", "1024")) * 1024 * 1024
+# Uploads are written to the spool file in pieces of at least this size
+UPLOAD_READ_SIZE = 1024 * 1024
+# Allowance for multipart boundaries and part headers when checking a declared body size
+MULTIPART_OVERHEAD = 64 * 1024
+# Uploads are spooled to disk here (system temp dir when unset) until profiled
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+# Engine used when an upload does not choose one: "pandas" or "polars"
+PROFILER_ENGINE = os.getenv("PROFILER_ENGINE", "pandas")
+# Sheets of one workbook profiled at the same time when all sheets are requested
+SHEET_WORKERS = int(os.getenv("PROFILER_SHEET_WORKERS", "4"))
 
-async def run_profiling(job_id: str, content: bytes, filename: str):
-    try:
-        df = parse_file(content, filename)
-        if df is None:
-            job_manager.update_job(job_id, "failed")
-            return
+# The upload is streamed by the handler instead of being declared as a File parameter, which
+# FastAPI would parse (receiving and spooling the whole body) before dependencies and the handler run
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
 
-        results = profile_dataset(df)
-        job_manager.update_job(job_id, "completed", result=results)
+def run_profiling(
+    job_id: str,
+    path: str,
+    filename: str,
+    approximate: bool = False,
+    duplicate_groups: int = 0,
+    timings: bool = False,
+    cache_key: Optional[str] = None,
+    engine: str = "pandas",
+    columns: Optional[List[str]] = None,
+    sheet: Optional[str] = None,
+    compact: bool = False,
+    sampling: Optional[Dict[str, Any]] = None,
+    analysis: Optional[Dict[str, Any]] = None
+):
+    """
+    Parses and profiles a spooled upload, then removes it. Runs on the
+    profiling executor's worker threads, never on the event loop. With a
+    `cache_key`, the result is cached and handed to every job that joined this
+    one while it ran. Progress is published for the job's event stream, and a
+    quick preview (when `analysis` asks for one) is stored with the job while
+    the full profile runs.
+    """
+    def preview(quick: Dict[str, Any]):
+        job_manager.update_job(job_id, "processing", result=quick)
+        progress_broker.publish(job_id, "preview", quick)
+
+    results = None
+    try:
+        results = _profile_upload(
+            path, filename, approximate, duplicate_groups, timings, engine, columns, sheet, compact, sampling,
+            progress_broker.reporter(job_id), analysis, preview
+        )
     except Exception as e:
-        print(f"Profiling failed: {e}")
-        job_manager.update_job(job_id, "failed")
-
-@router.post("/upload", response_model=JobResponse, dependencies=[Depends(check_rate_limit("upload"))])
-async def upload_file(request: Request, background_tasks: BackgroundTasks, file: UploadFile = File(...)):
-    content = await file.read()
-
-    # Check file size
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB."
+        logger.exception("Profiling failed: %s", e)
+    finally:
+        _remove_spool(path)
+
+    followers = []
+    if cache_key is not None:
+        followers = result_cache.complete(cache_key, results) if results is not None else result_cache.fail(cache_key)
+    for target in [job_id] + followers:
+        if results is None:
+            job_manager.update_job(target, "failed")
+        else:
+            job_manager.update_job(target, "completed", result=results if target == job_id else cached_copy(results))
+    progress_broker.finish(job_id, results)
+
+
+def _profile_upload(
+    path: str,
+    filename: str,
+    approximate: bool,
+    duplicate_groups: int,
+    timings: bool,
+    engine: str = "pandas",
+    columns: Optional[List[str]] = None,
+    sheet: Optional[str] = None,
+    compact: bool = False,
+    sampling: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    analysis: Optional[Dict[str, Any]] = None,
+    preview: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the profile of `columns` (default all), or None when the file
+    cannot be parsed. Compressed uploads are decompressed to a temp file in
+    pieces first; each file in a zip archive is profiled on its own.
+    """
+    inner_filename, compression = split_compression(filename)
+    if compression is None:
+        return _profile_file(path, filename, approximate, duplicate_groups, timings, engine, columns, sheet, compact, sampling, progress, analysis, preview)
+
+    with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR, prefix="unpack-") as workdir:
+        if compression != "zip":
+            inner_path = os.path.join(workdir, "data")
+            decompress_file(path, compression, inner_path)
+            return _profile_file(inner_path, inner_filename, approximate, duplicate_groups, timings, engine, columns, sheet, compact, sampling, progress, analysis, preview)
+
+        profiles = []
+        for member, member_path in iter_zip_members(path, workdir):
+            results = _profile_file(
+                member_path, member, approximate, duplicate_groups, timings, engine, columns, sheet, compact, sampling,
+                scoped(progress, "filename", member), analysis, preview
+            )
+            if results is not None:
+                profiles.append((member, results))
+    return _grouped_results(profiles, "files", "filename")
+
+
+def _grouped_results(profiles: List[Tuple[str, Dict[str, Any]]], key: str, label: str) -> Optional[Dict[str, Any]]:
+    """
+    Combines the profiles of several files or sheets. A single profile is
+    returned as is. With several, the first is kept at the top level and each
+    one is listed under `key`, named by `label`.
+    """
+    if not profiles:
+        return None
+    if len(profiles) == 1:
+        return profiles[0][1]
+    results = dict(profiles[0][1])
+    results[key] = [{label: name, **profile} for name, profile in profiles]
+    return results
+
+
+def _profile_file(
+    path: str,
+    filename: str,
+    approximate: bool,
+    duplicate_groups: int,
+    timings: bool,
+    engine: str,
+    columns: Optional[List[str]],
+    sheet: Optional[str] = None,
+    compact: bool = False,
+    sampling: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    analysis: Optional[Dict[str, Any]] = None,
+    preview: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Profiles one uncompressed file. Parquet columns that are entirely null or
+    constant are profiled from the footer statistics and not read at all.
+    """
+    extension = get_extension(filename)
+    if extension in EXCEL_EXTENSIONS and sheet == ALL_SHEETS:
+        return _profile_sheets(path, filename, approximate, duplicate_groups, timings, columns, compact, sampling, progress, analysis, preview)
+    if extension != "parquet":
+        return _profile_columns(path, filename, approximate, duplicate_groups, timings, engine, columns, sheet, compact, sampling, progress, analysis, preview)
+
+    total_rows, names, statistics = parquet_statistics(path)
+    if columns is not None and not set(columns) <= set(names):
+        logger.warning("Unknown columns in %s: %s", filename, sorted(set(columns) - set(names)))
+        return None
+    order = columns if columns is not None else names
+    known = profiles_from_statistics(total_rows, statistics, order)
+    if not known:
+        return _profile_columns(path, filename, approximate, duplicate_groups, timings, engine, columns, compact=compact, sampling=sampling, progress=progress, analysis=analysis, preview=preview)
+
+    remaining = [name for name in order if name not in known]
+    if remaining:
+        results = _profile_columns(path, filename, approximate, duplicate_groups, timings, engine, remaining, compact=compact, sampling=sampling, progress=progress, analysis=analysis, preview=preview)
+    else:
+        results = statistics_only_results(total_rows)
+    return add_column_profiles(results, known, order) if results is not None else None
+
+
+def _profile_sheets(
+    path: str,
+    filename: str,
+    approximate: bool,
+    duplicate_groups: int,
+    timings: bool,
+    columns: Optional[List[str]],
+    compact: bool = False,
+    sampling: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    analysis: Optional[Dict[str, Any]] = None,
+    preview: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Profiles every sheet of a workbook, up to SHEET_WORKERS at a time. Each
+    worker reads only its own sheet; the result lists them under `sheets`.
+    """
+    names = excel_sheet_names(path)
+    if not names:
+        return None
+
+    def profile_sheet(name: str) -> Optional[Dict[str, Any]]:
+        # Sheets run at the same time, so none of them stands in for the workbook as a preview
+        return _profile_columns(path, filename, approximate, duplicate_groups, timings, "pandas", columns, name, compact, sampling, scoped(progress, "sheet", name), analysis)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SHEET_WORKERS, len(names))), thread_name_prefix="sheet") as pool:
+        profiles = list(pool.map(profile_sheet, names))
+    return _grouped_results([(name, p) for name, p in zip(names, profiles) if p is not None], "sheets", "sheet")
+
+
+def _profile_columns(
+    path: str,
+    filename: str,
+    approximate: bool,
+    duplicate_groups: int,
+    timings: bool,
+    engine: str,
+    columns: Optional[List[str]],
+    sheet: Optional[str] = None,
+    compact: bool = False,
+    sampling: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    analysis: Optional[Dict[str, Any]] = None,
+    preview: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads and profiles the file. The Polars engine handles the formats it can
+    scan; sketches (approximate) and other formats use pandas. With `sampling`
+    ({"margin", "stratify"}), a sample of the rows is profiled instead.
+    `analysis` ({"analyzers", "preview"}) restricts what runs and asks for a
+    quick preview first; only in-memory pandas profiles honour it. Files over
+    MAX_FILE_SIZE are profiled in chunks, which raise ValueError for options
+    they cannot honour (see chunked_conflicts); upload_file rejects these up
+    front unless the upload was compressed.
+    """
+    if sampling is not None:
+        chunks = parse_file_chunks(path, filename, columns=columns)
+        if chunks is None:
+            df = parse_file(path, filename, columns, sheet)
+            if df is None:
+                return None
+            chunks = iter_row_chunks(df, CHUNK_ROWS)
+        with closing(chunks):
+            return profile_sample(chunks, sampling["margin"], stratify=sampling["stratify"], timings=timings, compact=compact, progress=progress)
+
+    if engine == "polars" and not approximate and analysis is None:
+        lf = scan_file(path, filename, columns)
+        if lf is not None:
+            try:
+                return profile_polars(lf, duplicate_groups=duplicate_groups, timings=timings, progress=progress)
+            except pl.exceptions.PolarsError as e:
+                # e.g. a CSV column whose type changes after the rows used for inference
+                logger.warning("Polars engine failed, falling back to pandas: %s", e)
+
+    # Formats that cannot stream are read whole; only a decompressed upload can exceed the limit here
+    chunks = parse_file_chunks(path, filename, columns=columns, csv_text=True) if os.path.getsize(path) > MAX_FILE_SIZE else None
+    if chunks is not None:
+        with closing(chunks):
+            # compact is not an error here: it may be the server default, and chunks bound memory anyway
+            unsupported = chunked_conflicts(duplicate_groups, False, *_analysis_options(analysis))
+            if unsupported:
+                raise ValueError(_chunked_error(unsupported))
+            # Chunks shared with an earlier upload (e.g. before appended rows) are reused
+            return profile_chunks(
+                chunks, approximate=approximate, timings=timings, chunk_cache=chunk_cache, progress=progress,
+                csv_text=get_extension(filename) == "csv"
+            )
+
+    df = parse_file(path, filename, columns, sheet)
+    if df is None:
+        return None
+    if analysis is not None:
+        return profile_dataset(
+            df, approximate=approximate, duplicate_groups=duplicate_groups, timings=timings, compact=compact, progress=progress,
+            analyzers=analysis["analyzers"], preview=preview if analysis["preview"] else None
         )
+    return profile_dataset(df, approximate=approximate, duplicate_groups=duplicate_groups, timings=timings, compact=compact, progress=progress)
 
-    job_id = job_manager.create_job(file.filename)
+@router.post(
+    "/upload",
+    response_model=JobResponse,
+    dependencies=[Depends(check_rate_limit("upload"))],
+    openapi_extra=UPLOAD_REQUEST_BODY
+)
+async def upload_file(
+    request: Request,
+    approximate: bool = Query(False, description="Use fixed-size sketches for distinct counts, quantiles and top values"),
+    duplicate_groups: int = Query(0, ge=0, le=100, description="Number of most repeated rows to report"),
+    timings: bool = Query(False, description="Include per-stage and per-column timings in the result; results served from the cache have none"),
+    engine: Optional[str] = Query(None, pattern="^(pandas|polars)$", description="Profiling engine; polars scans CSV, NDJSON, Parquet and Arrow on all cores. Defaults to PROFILER_ENGINE"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to profile; others are not read"),
+    sheet: Optional[str] = Query(None, description="Excel sheet to profile (default the first), or * for every sheet"),
+    compact: Optional[bool] = Query(None, description="Convert low-cardinality strings to categoricals and downcast integers before profiling; defaults to PROFILER_COMPACT except for approximate and chunked profiles"),
+    sample: bool = Query(False, description="Profile a random sample of the rows, with confidence intervals; cannot be combined with approximate, duplicate_groups, the polars engine or analyzer selection"),
+    sample_margin: float = Query(SAMPLE_MARGIN, gt=0, lt=0.5, description="Target margin of error for sampled proportions, e.g. 0.01"),
+    stratify: Optional[str] = Query(None, description="Column to stratify the sample by"),
+    level: str = Query("full", pattern="^(quick|standard|full)$", description="Analyzers to run by cost: quick, standard or full"),
+    analyzers: Optional[str] = Query(None, description="Comma-separated analyzers to run instead of a level; requirements are added"),
+    quick_first: bool = Query(False, description="Store a quick profile (types and completeness) while the full one runs")
+):
+    # Shed load when no slot is free; only the headers have been received at this point
+    if profiling_executor.is_full():
+        raise _queue_full()
+
+    selected = _parse_columns(columns)
+    requested_engine, engine = engine, engine or PROFILER_ENGINE
+    try:
+        analysis = _parse_analysis(level, analyzers, quick_first)
+        if sample:
+            unsupported = sample_conflicts(approximate, duplicate_groups, *_analysis_options(analysis), engine=requested_engine)
+            if unsupported:
+                raise ValueError(f"sample does not support {', '.join(unsupported)}")
+        if approximate:
+            unsupported = approximate_conflicts(duplicate_groups, bool(compact), _analysis_options(analysis)[0])
+            if unsupported:
+                raise ValueError(f"approximate does not support {', '.join(unsupported)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sampling = {"margin": sample_margin, "stratify": stratify} if sample else None
+
+    filename, path, size, digest = await _spool_upload(request, engine)
+    inner_filename, compression = split_compression(filename)
+    extension = get_extension(inner_filename)
+    # Decompressed sizes are only known once profiling starts, where the same check fails the job
+    if compression is None and not sample and _profiled_in_chunks(extension, size, engine, approximate, analysis):
+        unsupported = chunked_conflicts(duplicate_groups, bool(compact), *_analysis_options(analysis))
+        if unsupported:
+            _remove_spool(path)
+            raise HTTPException(status_code=400, detail=_chunked_error(unsupported))
+    if compact is None:
+        compact = PROFILER_COMPACT and not approximate
+
+    job_id = await run_in_threadpool(job_manager.create_job, filename)
+    status = "processing"
+    cache_key = None
+    if result_cache.enabled:
+        cache_key = make_cache_key(
+            digest,
+            extension=extension,
+            compression=compression,
+            approximate=approximate,
+            duplicate_groups=duplicate_groups,
+            engine=engine,
+            columns=selected,
+            sheet=sheet,
+            compact=compact,
+            sampling=sampling,
+            analysis=analysis
+        )
+        outcome, cached = result_cache.lookup(cache_key, job_id)
+        if outcome == "hit":
+            await run_in_threadpool(job_manager.update_job, job_id, "completed", cached)
+            status = "completed"
+        if outcome != "leader":
+            # Served from the cache, or completed together with the in-flight job
+            _remove_spool(path)
+            return _job_response(job_id, status, filename, size)
 
-    background_tasks.add_task(run_profiling, job_id, content, file.filename)
-    
+    progress_broker.open(job_id)
+    try:
+        profiling_executor.submit(
+            run_profiling, job_id, path, filename, approximate, duplicate_groups, timings, cache_key, engine, selected, sheet, compact, sampling, analysis
+        )
+    except QueueFullError:
+        _remove_spool(path)
+        progress_broker.finish(job_id, None)
+        await run_in_threadpool(job_manager.delete_job, job_id)
+        for follower in result_cache.fail(cache_key) if cache_key else []:
+            await run_in_threadpool(job_manager.update_job, follower, "failed")
+        raise _queue_full()
+
+    return _job_response(job_id, status, filename, size)
+
+
+def _parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Splits the `columns` query value; None (all columns) when empty."""
+    if columns is None:
+        return None
+    selected = [name.strip() for name in columns.split(",") if name.strip()]
+    return selected or None
+
+
+def _parse_analysis(level: str, analyzers: Optional[str], quick_first: bool) -> Optional[Dict[str, Any]]:
+    """
+    The analyzers to run and whether to preview a quick profile; None for a
+    full profile without preview. Raises ValueError for unknown analyzers.
+    """
+    names = [name.strip() for name in analyzers.split(",") if name.strip()] if analyzers else None
+    resolved = resolve_analyzers(level, names or None)
+    if resolved == ALL_ANALYZERS and not quick_first:
+        return None
+    return {"analyzers": sorted(resolved), "preview": quick_first}
+
+
+def _analysis_options(analysis: Optional[Dict[str, Any]]) -> Tuple[FrozenSet[str], bool]:
+    """The analyzers to run and whether a quick preview was asked for."""
+    if analysis is None:
+        return ALL_ANALYZERS, False
+    return frozenset(analysis["analyzers"]), analysis["preview"]
+
+
+def _profiled_in_chunks(extension: str, size: int, engine: str, approximate: bool, analysis: Optional[Dict[str, Any]]) -> bool:
+    """Whether an uncompressed file of `size` bytes is profiled in row chunks (see _profile_columns)."""
+    polars = engine == "polars" and not approximate and analysis is None and extension in POLARS_EXTENSIONS
+    return size > MAX_FILE_SIZE and extension in STREAMABLE_EXTENSIONS and not polars
+
+
+def _chunked_error(unsupported: List[str]) -> str:
+    return f"Files over {MAX_FILE_SIZE // (1024 * 1024)}MB are profiled in chunks, which do not support {', '.join(unsupported)}"
+
+
+def _max_upload_size(filename: str, engine: str) -> int:
+    """
+    Streamable formats, and those Polars scans, may exceed the in-memory limit.
+    Compressed uploads are checked by their compressed size and the format inside.
+    """
+    inner_filename, compression = split_compression(filename)
+    extension = get_extension(inner_filename)
+    streamable = (
+        compression == "zip"
+        or extension in STREAMABLE_EXTENSIONS
+        or (engine == "polars" and extension in POLARS_EXTENSIONS)
+    )
+    return MAX_STREAMING_FILE_SIZE if streamable else MAX_FILE_SIZE
+
+
+async def _spool_upload(request: Request, engine: str) -> Tuple[str, str, int, str]:
+    """
+    Writes the "file" field of the multipart body to a temp file as the body
+    arrives, hashing it so repeats of the same content are recognised. Once
+    the filename is known, a declared body size over its limit is rejected
+    with 413 before any data is read, and otherwise as soon as more than the
+    limit has arrived. Returns the filename, path, size and content digest.
+    """
+    try:
+        stream = MultipartFileStream(request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    declared = request.headers.get("content-length")
+    hasher = content_hasher()
+    size = 0
+    max_size = None
+    buffered: List[bytes] = []
+    spool = tempfile.NamedTemporaryFile(dir=UPLOAD_SPOOL_DIR, prefix="upload-", delete=False)
+    try:
+        with spool:
+            async for body in request.stream():
+                try:
+                    pieces = stream.feed(body)
+                except FormParserError as e:
+                    raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+                if max_size is None and stream.filename is not None:
+                    max_size = _max_upload_size(stream.filename, engine)
+                    if declared is not None and declared.isdigit() and int(declared) > max_size + MULTIPART_OVERHEAD:
+                        raise _too_large(max_size)
+                for piece in pieces:
+                    size += len(piece)
+                    if size > max_size:
+                        raise _too_large(max_size)
+                    hasher.update(piece)
+                    buffered.append(piece)
+                if sum(map(len, buffered)) >= UPLOAD_READ_SIZE:
+                    await run_in_threadpool(spool.write, b"".join(buffered))
+                    buffered = []
+            if buffered:
+                await run_in_threadpool(spool.write, b"".join(buffered))
+            stream.finish()
+        if not stream.complete:
+            raise HTTPException(status_code=422, detail="Expected a file in the 'file' form field")
+    except BaseException:
+        _remove_spool(spool.name)
+        raise
+    return stream.filename, spool.name, size, hasher.hexdigest()
+
+
+def _remove_spool(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB."
+    )
+
+
+def _job_response(job_id: str, status: str, filename: str, size: int) -> Dict[str, Any]:
     return {
         "job_id": job_id,
-        "status": "processing",
-        "filename": file.filename,
-        "file_size_bytes": len(content),
-        "estimated_time_sec": 5, # Mock estimation
-        "progress_url": f"/api/profile/{job_id}"
+        "status": status,
+        "filename": filename,
+        "file_size_bytes": size,
+        "estimated_time_sec": profiling_executor.estimated_seconds() if status == "processing" else 0,
+        "progress_url": f"/api/profile/{job_id}",
+        "events_url": f"/api/profile/{job_id}/events"
     }
+
+
+def _queue_full() -> HTTPException:
+    retry_after = profiling_executor.retry_after()
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error": "Profiling queue full",
+            "retry_after_seconds": retry_after,
+            "message": "The server is busy profiling other files. Please try again shortly."
+        },
+        headers={"Retry-After": str(retry_after)}
+    )
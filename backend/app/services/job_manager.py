@@ -1,78 +1,59 @@
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
-import threading
+from app.services.job_store import JobStore, create_job_store
 
 class JobManager:
     """
-    In-memory job storage with automatic expiration.
-    Jobs expire after 1 hour to free up memory.
+    Job bookkeeping on top of a pluggable JobStore.
+    Jobs expire after 1 hour to free up memory. The in-memory store is
+    process-local; the Redis store (JOB_STORE=redis) lets any uvicorn worker
+    or node serve a job created by another. Its calls block on the network
+    and (de)compress results, so async endpoints make them through
+    run_in_threadpool rather than on the event loop.
     """
 
-    def __init__(self, expiration_minutes: int = 60):
-        self.jobs: Dict[str, Any] = {}
+    def __init__(self, expiration_minutes: int = 60, store: Optional[JobStore] = None):
         self.expiration_minutes = expiration_minutes
-        self.lock = threading.Lock()
+        self.store = store or create_job_store(expiration_minutes)
 
     def create_job(self, filename: str) -> str:
         job_id = str(uuid.uuid4())
-        with self.lock:
-            # Clean up expired jobs on each create
-            self._cleanup_expired()
-
-            self.jobs[job_id] = {
-                "job_id": job_id,
-                "status": "processing",
-                "filename": filename,
-                "result": None,
-                "created_at": datetime.now(),
-                "insights_cache": {}
-            }
+        self.store.create({
+            "job_id": job_id,
+            "status": "processing",
+            "filename": filename,
+            "result": None,
+            "created_at": datetime.now(),
+            "insights_cache": {}
+        })
         return job_id
 
     def update_job(self, job_id: str, status: str, result: Any = None):
-        with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]["status"] = status
-                if result:
-                    self.jobs[job_id]["result"] = result
+        self.store.update(job_id, status, result)
+
+    def delete_job(self, job_id: str):
+        self.store.delete(job_id)
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        with self.lock:
-            job = self.jobs.get(job_id)
-            if job and self._is_expired(job):
-                del self.jobs[job_id]
-                return None
-            return job
+        return self.store.get(job_id)
 
-    def _is_expired(self, job: Dict[str, Any]) -> bool:
-        """Check if a job has expired."""
-        created_at = job.get("created_at")
-        if not created_at:
-            return False
-        expiration_time = created_at + timedelta(minutes=self.expiration_minutes)
-        return datetime.now() > expiration_time
+    def get_job_status(self, job_id: str) -> Optional[str]:
+        """The job's status without loading its result; None when it does not exist."""
+        return self.store.get_status(job_id)
 
-    def _cleanup_expired(self):
-        """Remove all expired jobs."""
-        expired_ids = [
-            job_id for job_id, job in self.jobs.items()
-            if self._is_expired(job)
-        ]
-        for job_id in expired_ids:
-            del self.jobs[job_id]
+    def cache_insights(self, job_id: str, model: str, insights: Any):
+        """Stores generated insights with the job so later requests skip the LLM."""
+        self.store.set_insights(job_id, model, insights)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about current jobs (for monitoring)."""
-        with self.lock:
-            self._cleanup_expired()
-            return {
-                "total_jobs": len(self.jobs),
-                "jobs_by_status": {
-                    status: sum(1 for j in self.jobs.values() if j["status"] == status)
-                    for status in ["processing", "completed", "failed"]
-                }
-            }
+        jobs_by_status = self.store.count_by_status()
+        return {
+            "total_jobs": sum(jobs_by_status.values()),
+            "jobs_by_status": jobs_by_status,
+            "store": self.store.get_store_stats()
+        }
 
 
 # Singleton instance
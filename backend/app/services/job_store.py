@@ -0,0 +1,364 @@
+import os
+import time
+import heapq
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterator, List, Tuple
+
+import numpy as np
+import orjson
+import redis
+import zstandard
+
+# "memory" keeps jobs in this process; "redis" shares them across workers and nodes
+JOB_STORE = os.getenv("JOB_STORE", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+JOB_KEY_PREFIX = os.getenv("JOB_KEY_PREFIX", "tdprofiler:job:")
+ZSTD_LEVEL = int(os.getenv("JOB_ZSTD_LEVEL", "3"))
+# Results held by the in-memory store beyond this are evicted, least recently used first
+JOB_MEMORY_BUDGET_MB = int(os.getenv("JOB_MEMORY_BUDGET_MB", "512"))
+# How often the in-memory store's background reaper drops expired jobs
+JOB_REAPER_INTERVAL = float(os.getenv("JOB_REAPER_INTERVAL_SECONDS", "30"))
+
+JOB_STATUSES = ["processing", "completed", "failed"]
+
+# Keys fetched per SCAN call, and statuses read per pipeline, when counting Redis jobs
+SCAN_BATCH = 500
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def dump_json(value: Any) -> bytes:
+    """Results as JSON bytes; NumPy scalars and arrays become plain JSON values."""
+    return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def encode_payload(value: Any) -> bytes:
+    """orjson + zstd encoding used for results stored outside the process."""
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(dump_json(value))
+
+
+def payload_size(value: Any) -> int:
+    """Approximate in-memory footprint of a result: its serialised JSON length."""
+    return len(dump_json(value))
+
+
+def decode_payload(data: bytes) -> Any:
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(data))
+
+
+class JobStore(ABC):
+    """
+    Storage backend for JobManager. Jobs are dicts with job_id, status,
+    filename, result, created_at and insights_cache; backends expire them
+    after `expiration_minutes`.
+    """
+
+    def __init__(self, expiration_minutes: int = 60):
+        self.expiration_minutes = expiration_minutes
+
+    @abstractmethod
+    def create(self, job: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    def update(self, job_id: str, status: str, result: Any = None):
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_status(self, job_id: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        pass
+
+    @abstractmethod
+    def set_insights(self, job_id: str, model: str, insights: Any):
+        pass
+
+    @abstractmethod
+    def count_by_status(self) -> Dict[str, int]:
+        pass
+
+    def get_store_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job storage. Only the worker that created a job can see it.
+
+    Expiry is a min-heap of deadlines: due jobs are popped in O(log n) by a
+    background reaper thread and on each create, instead of scanning every job.
+    Each job's result and cached insights are sized once (their serialised
+    length); when the total exceeds `memory_budget_bytes`, finished jobs are
+    evicted least recently used first.
+    """
+
+    def __init__(
+        self,
+        expiration_minutes: int = 60,
+        memory_budget_bytes: int = JOB_MEMORY_BUDGET_MB * 1024 * 1024,
+        reaper_interval: float = JOB_REAPER_INTERVAL
+    ):
+        super().__init__(expiration_minutes)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.clock = time.monotonic
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        self.deadlines: Dict[str, float] = {}
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.status_counts = {status: 0 for status in JOB_STATUSES}
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+
+        self._stop = threading.Event()
+        if reaper_interval > 0:
+            self._reaper = threading.Thread(
+                target=self._reap_forever, args=(reaper_interval,), name="job-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def create(self, job: Dict[str, Any]):
+        with self.lock:
+            self._expire_due()
+            job_id = job["job_id"]
+            deadline = self.clock() + self.expiration_minutes * 60
+            self.jobs[job_id] = job
+            self.sizes[job_id] = 0
+            self.deadlines[job_id] = deadline
+            heapq.heappush(self.expiry_heap, (deadline, job_id))
+            self.status_counts[job["status"]] = self.status_counts.get(job["status"], 0) + 1
+
+    def update(self, job_id: str, status: str, result: Any = None):
+        # Sized outside the lock so serialising a large result does not block other jobs
+        size = payload_size(result) if result else 0
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            self.status_counts[job["status"]] -= 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            job["status"] = status
+            if result:
+                job["result"] = result
+                self._resize(job_id, size)
+            self.jobs.move_to_end(job_id)
+            self._enforce_budget(keep=job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if self.deadlines[job_id] <= self.clock():
+                self._remove(job_id)
+                self.expirations += 1
+                return None
+            self.jobs.move_to_end(job_id)
+            return job
+
+    def get_status(self, job_id: str) -> Optional[str]:
+        job = self.get(job_id)
+        return job["status"] if job is not None else None
+
+    def delete(self, job_id: str):
+        with self.lock:
+            if job_id in self.jobs:
+                self._remove(job_id)
+
+    def set_insights(self, job_id: str, model: str, insights: Any):
+        size = payload_size(insights)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.setdefault("insights_cache", {})[model] = insights
+            self._resize(job_id, self.sizes[job_id] + size)
+            self._enforce_budget(keep=job_id)
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self.lock:
+            return {status: self.status_counts.get(status, 0) for status in JOB_STATUSES}
+
+    def get_store_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "backend": "memory",
+                "resident_bytes": self.resident_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def close(self):
+        """Stops the reaper thread."""
+        self._stop.set()
+
+    def _reap_forever(self, interval: float):
+        while not self._stop.wait(interval):
+            with self.lock:
+                self._expire_due()
+
+    def _expire_due(self):
+        """Pops jobs whose deadline has passed. Stale heap entries are skipped."""
+        now = self.clock()
+        while self.expiry_heap and self.expiry_heap[0][0] <= now:
+            deadline, job_id = heapq.heappop(self.expiry_heap)
+            if self.deadlines.get(job_id) == deadline:
+                self._remove(job_id)
+                self.expirations += 1
+
+    def _resize(self, job_id: str, size: int):
+        self.resident_bytes += size - self.sizes[job_id]
+        self.sizes[job_id] = size
+
+    def _enforce_budget(self, keep: str):
+        """Evicts least recently used jobs holding results until under budget."""
+        if self.resident_bytes <= self.memory_budget_bytes:
+            return
+        for job_id, job in list(self.jobs.items()):
+            if self.resident_bytes <= self.memory_budget_bytes:
+                break
+            # Running jobs are never evicted, even when they hold a preview: their
+            # final update would find nothing and the client would get a 404
+            if job_id == keep or job["status"] == "processing" or self.sizes[job_id] == 0:
+                continue
+            self._remove(job_id)
+            self.evictions += 1
+
+    def _remove(self, job_id: str):
+        job = self.jobs.pop(job_id)
+        self.status_counts[job["status"]] -= 1
+        self.resident_bytes -= self.sizes.pop(job_id)
+        # The heap entry stays behind and is skipped when popped
+        del self.deadlines[job_id]
+
+
+class RedisJobStore(JobStore):
+    """
+    Redis-backed job storage shared by every worker and node.
+    Each job is one hash with plain status/filename/created_at fields, the
+    result as compressed orjson, and one compressed field per cached insights
+    model. Expiry is the key's TTL, so no cleanup pass is needed.
+    """
+
+    def __init__(self, client: "redis.Redis", expiration_minutes: int = 60, prefix: str = JOB_KEY_PREFIX):
+        super().__init__(expiration_minutes)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL, expiration_minutes: int = 60) -> "RedisJobStore":
+        return cls(redis.Redis.from_url(url), expiration_minutes)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}"
+
+    def create(self, job: Dict[str, Any]):
+        key = self._key(job["job_id"])
+        fields = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "filename": job["filename"] or "",
+            "created_at": job["created_at"].isoformat(),
+        }
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.expiration_minutes * 60)
+        pipe.execute()
+
+    def update(self, job_id: str, status: str, result: Any = None):
+        key = self._key(job_id)
+        fields: Dict[str, Any] = {"status": status}
+        if result:
+            fields["result"] = encode_payload(result)
+        # Only touch jobs that still exist, so an expired job is not recreated without a TTL
+        self._hset_existing(key, fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        fields = self.client.hgetall(self._key(job_id))
+        if not fields:
+            return None
+        fields = {name.decode(): value for name, value in fields.items()}
+        return {
+            "job_id": fields["job_id"].decode(),
+            "status": fields["status"].decode(),
+            "filename": fields["filename"].decode(),
+            "result": decode_payload(fields["result"]) if "result" in fields else None,
+            "created_at": datetime.fromisoformat(fields["created_at"].decode()),
+            "insights_cache": {
+                name[len("insights:"):]: decode_payload(value)
+                for name, value in fields.items() if name.startswith("insights:")
+            },
+        }
+
+    def get_status(self, job_id: str) -> Optional[str]:
+        """Reads only the status field, without fetching and decoding the result."""
+        status = self.client.hget(self._key(job_id), "status")
+        return status.decode() if status is not None else None
+
+    def delete(self, job_id: str):
+        self.client.delete(self._key(job_id))
+
+    def set_insights(self, job_id: str, model: str, insights: Any):
+        self._hset_existing(self._key(job_id), {f"insights:{model}": encode_payload(insights)})
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Scans the job keys and reads their statuses one pipelined batch at a time."""
+        counts = {status: 0 for status in JOB_STATUSES}
+        keys = self._scan_keys()
+        while True:
+            batch = list(itertools.islice(keys, SCAN_BATCH))
+            if not batch:
+                return counts
+            pipe = self.client.pipeline(transaction=False)
+            for key in batch:
+                pipe.hget(key, "status")
+            for status in pipe.execute():
+                if status is not None and status.decode() in counts:
+                    counts[status.decode()] += 1
+
+    def get_store_stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+    def _scan_keys(self) -> Iterator[bytes]:
+        return self.client.scan_iter(match=f"{self.prefix}*", count=SCAN_BATCH)
+
+    def _hset_existing(self, key: str, fields: Dict[str, Any]):
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    if not pipe.exists(key):
+                        pipe.unwatch()
+                        return
+                    pipe.multi()
+                    pipe.hset(key, mapping=fields)
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+
+def create_job_store(expiration_minutes: int = 60) -> JobStore:
+    """Builds the backend selected by JOB_STORE."""
+    if JOB_STORE == "redis":
+        return RedisJobStore.from_url(REDIS_URL, expiration_minutes)
+    if JOB_STORE != "memory":
+        raise ValueError(f"Unknown JOB_STORE: {JOB_STORE}")
+    return InMemoryJobStore(expiration_minutes)
@@ -0,0 +1,529 @@
+import copy
+import os
+import sys
+import numpy as np
+import pandas as pd
+from collections import Counter
+from typing import Dict, Any, List, Optional, Callable
+from app.services.profiler.type_inference import infer_column_type, infer_column_type_details, to_datetime_values
+from app.services.profiler.patterns import weighted_pattern_counts, coarse_pattern_counts, summarize_pattern_counts
+from app.services.profiler.sketches import HyperLogLog, KLLSketch, MisraGries, SKETCH_ERROR_BOUNDS
+from app.services.profiler.column import build_column_profile
+from app.services.profiler.results import build_results
+from app.services.profiler.duplicates import row_hashes, DuplicateCounter
+from app.utils.semantic_types import detect_semantic_type
+from app.utils.file_parser import CHUNK_ROWS, csv_text_kind, combine_csv_kinds, csv_dtype, convert_csv_text
+
+# Non-null values kept from the start of each column. Covers the head() samples
+# used by type inference (100), semantic detection (100) and patterns (500).
+HEAD_SIZE = 500
+
+# Distinct values a column's exact counts may hold before it switches to sketches; one chunk's rows by default
+EXACT_DISTINCT_LIMIT = int(os.getenv("PROFILER_EXACT_DISTINCT_LIMIT") or CHUNK_ROWS)
+
+
+class ColumnAccumulator:
+    """
+    Mergeable per-column profiling state.
+    Each chunk updates counts, nulls, moments, min/max, string lengths, pattern
+    counts and value counts; merge() combines two accumulators built over
+    consecutive row ranges. Memory depends on column cardinality, not row count,
+    and exact value counts are capped: a column with more than
+    EXACT_DISTINCT_LIMIT distinct values switches to the sketches below, and
+    its profile lists what became estimates under "estimated_fields".
+    Numbers and datetimes stored as text are converted as they are in memory:
+    moments cover every text value that parses as a number, and each chunk's
+    datetime range uses the format resolved from that chunk's values.
+
+    With csv_text=True, chunks hold CSV cells read as text, so every chunk has
+    the same schema. Each chunk records which kind of values it holds, and
+    finalize() converts the column once to the type pd.read_csv would infer
+    for the whole file, merging counts of values that convert equal.
+
+    With approximate=True the exact value counts are replaced by fixed-size
+    sketches (HyperLogLog, KLL, Misra-Gries), so memory is bounded regardless
+    of cardinality and distinct_count, median, outliers and top_values become
+    estimates.
+    """
+
+    def __init__(self, name: Any, approximate: bool = False, csv_text: bool = False):
+        self.name = name
+        self.approximate = approximate
+        self.csv_text = csv_text
+        self.row_count = 0
+        self.null_count = 0
+        self.empty_string_count = 0
+        self.dtype = None
+        self.head: List[Any] = []
+        # csv_text_kind() of the values so far, for csv_text columns
+        self.text_kind: Optional[str] = None
+        self.memory_bytes = 0
+
+        if approximate:
+            self.value_counts = None
+            self.distinct = HyperLogLog()
+            self.quantiles = KLLSketch()
+            self.top_k = MisraGries()
+            self.pattern_counts = MisraGries()
+            self.coarse_pattern_counts = MisraGries()
+        else:
+            self.value_counts: Counter = Counter()
+            self.pattern_counts: Counter = Counter()
+            self.coarse_pattern_counts: Counter = Counter()
+
+        # Numeric moments (Chan et al. parallel variance)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+        # Range of datetime values, native or parsed from text
+        self.datetime_min = None
+        self.datetime_max = None
+
+        # Lengths of string values
+        self.length_min = None
+        self.length_max = None
+        self.length_sum = 0
+        self.length_count = 0
+
+    def update(self, series: pd.Series):
+        """Folds one chunk of the column into the accumulator."""
+        self.merge(ColumnAccumulator.from_series(self.name, series, self.approximate, self.csv_text))
+
+    @classmethod
+    def from_series(cls, name: Any, series: pd.Series, approximate: bool = False, csv_text: bool = False) -> "ColumnAccumulator":
+        """Builds the accumulator for a single chunk."""
+        acc = cls(name, approximate, csv_text)
+        acc.row_count = len(series)
+        acc.dtype = series.dtype
+        acc.memory_bytes = int(series.memory_usage(deep=True, index=False))
+
+        null_mask = series.isna()
+        acc.null_count = int(null_mask.sum())
+        nonnull = series[~null_mask] if acc.null_count else series
+        acc.head = nonnull.head(HEAD_SIZE).tolist()
+
+        # Exact counts within the chunk; bounded by the chunk size. Unsorted, they are in order of
+        # first occurrence, which merged counts keep, so most_common() breaks ties as the kernel does
+        value_counts = nonnull.value_counts(sort=False)
+        if csv_text:
+            acc.text_kind = csv_text_kind(value_counts.index)
+        if series.dtype == 'object' and "" in value_counts.index:
+            acc.empty_string_count = int(value_counts[""])
+        if approximate:
+            acc.distinct.add(value_counts.index.to_numpy())
+            acc.top_k.update_value_counts(value_counts)
+        else:
+            acc.value_counts = Counter(dict(zip(value_counts.index, value_counts.tolist())))
+
+        if pd.api.types.is_numeric_dtype(series) and len(nonnull) > 0:
+            acc._add_numbers(nonnull.to_numpy(dtype="f8"))
+        elif pd.api.types.is_datetime64_any_dtype(series) and len(nonnull) > 0:
+            acc.datetime_min, acc.datetime_max = nonnull.min(), nonnull.max()
+        elif series.dtype == 'object' and len(value_counts) > 0:
+            # Lengths and patterns are taken once per distinct value, weighted by count
+            text = value_counts.index.astype(str)
+            lengths = text.str.len().to_numpy()
+            counts = value_counts.to_numpy()
+            acc.length_min = int(lengths.min())
+            acc.length_max = int(lengths.max())
+            acc.length_sum = int((lengths * counts).sum())
+            acc.length_count = int(counts.sum())
+            fine = weighted_pattern_counts(value_counts)
+            chunk_patterns = Counter(fine.to_dict())
+            chunk_coarse = Counter(coarse_pattern_counts(fine).to_dict())
+            if approximate:
+                acc.pattern_counts.update_counts(chunk_patterns.items())
+                acc.coarse_pattern_counts.update_counts(chunk_coarse.items())
+            else:
+                acc.pattern_counts = chunk_patterns
+                acc.coarse_pattern_counts = chunk_coarse
+
+            # Numbers stored as text count towards the moments in case the column is inferred numeric
+            numbers = _text_numbers(value_counts.index)
+            if acc.text_kind == "boolean":
+                # A boolean CSV column is numeric once typed, as True / False
+                numbers = convert_csv_text(value_counts.index, "boolean").to_numpy(dtype="f8")
+            parsed = ~np.isnan(numbers)
+            if parsed.any():
+                acc._add_numbers(np.repeat(numbers[parsed], counts[parsed]))
+            details = infer_column_type_details(nonnull)
+            if details["type"] == "datetime":
+                timestamps = to_datetime_values(pd.Series(value_counts.index, dtype=object), details["datetime_format"]).dropna()
+                if not timestamps.empty:
+                    acc.datetime_min, acc.datetime_max = timestamps.min(), timestamps.max()
+
+        return acc
+
+    def _add_numbers(self, values: np.ndarray):
+        """Sets the moments (and the quantile sketch) of a chunk's numeric values."""
+        if self.approximate:
+            self.quantiles.update(values)
+        self.n = len(values)
+        self.mean = float(values.mean())
+        self.m2 = float(((values - self.mean) ** 2).sum())
+        self.min = values.min()
+        self.max = values.max()
+
+    def merge(self, other: "ColumnAccumulator"):
+        """Merges an accumulator covering the rows that follow this one. `other` is left unchanged."""
+        if self.approximate and not other.approximate:
+            other = copy.copy(other)
+            other._switch_to_sketches()
+        elif other.approximate and not self.approximate:
+            self._switch_to_sketches()
+
+        if other.dtype is not None:
+            self.dtype = other.dtype if self.dtype is None else _common_dtype(self.dtype, other.dtype)
+
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        self.empty_string_count += other.empty_string_count
+        self.text_kind = combine_csv_kinds(self.text_kind, other.text_kind)
+        self.memory_bytes += other.memory_bytes
+        if len(self.head) < HEAD_SIZE:
+            self.head.extend(other.head[:HEAD_SIZE - len(self.head)])
+        if self.approximate:
+            self.distinct.merge(other.distinct)
+            self.quantiles.merge(other.quantiles)
+            self.top_k.merge(other.top_k)
+            self.pattern_counts.merge(other.pattern_counts)
+            self.coarse_pattern_counts.merge(other.coarse_pattern_counts)
+        else:
+            self.value_counts.update(other.value_counts)
+            self.pattern_counts.update(other.pattern_counts)
+            self.coarse_pattern_counts.update(other.coarse_pattern_counts)
+            if len(self.value_counts) > EXACT_DISTINCT_LIMIT:
+                self._switch_to_sketches()
+
+        if other.n:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+            self.n = n
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+        if other.datetime_min is not None:
+            self.datetime_min = other.datetime_min if self.datetime_min is None else min(self.datetime_min, other.datetime_min)
+            self.datetime_max = other.datetime_max if self.datetime_max is None else max(self.datetime_max, other.datetime_max)
+
+        if other.length_min is not None:
+            self.length_min = other.length_min if self.length_min is None else min(self.length_min, other.length_min)
+            self.length_max = other.length_max if self.length_max is None else max(self.length_max, other.length_max)
+            self.length_sum += other.length_sum
+            self.length_count += other.length_count
+
+    def _switch_to_sketches(self):
+        """
+        Replaces the exact counts with sketches built from them. Only assigns
+        attributes, so a shallow copy can switch without touching the original.
+        """
+        keys = list(self.value_counts.keys())
+        counts = np.fromiter(self.value_counts.values(), dtype=np.int64, count=len(keys))
+        self.distinct = HyperLogLog()
+        # Through an Index so keys hash with the dtype a chunk's value_counts() would have
+        self.distinct.add(pd.Index(keys).to_numpy())
+        self.quantiles = KLLSketch()
+        if self.dtype is not None and (pd.api.types.is_numeric_dtype(self.dtype) or self.dtype == 'object'):
+            numbers, cumulative = self._sorted_counts()
+            self.quantiles.update_counts(numbers, np.diff(cumulative, prepend=0))
+        self.top_k = MisraGries()
+        self.top_k.update_value_counts(pd.Series(counts, index=pd.Index(keys, dtype=object)))
+        pattern_counts, coarse_counts = MisraGries(), MisraGries()
+        pattern_counts.update_counts(self.pattern_counts.items())
+        coarse_counts.update_counts(self.coarse_pattern_counts.items())
+        self.pattern_counts, self.coarse_pattern_counts = pattern_counts, coarse_counts
+        self.value_counts = None
+        self.approximate = True
+
+    def _with_csv_types(self) -> "ColumnAccumulator":
+        """
+        A copy whose dtype, head and counts are those of the column as
+        pd.read_csv would type it; this accumulator is left unchanged.
+        """
+        typed = copy.copy(self)
+        typed.csv_text = False
+        typed.dtype = csv_dtype(self.text_kind, self.null_count > 0)
+        if self.text_kind in (None, "text"):
+            return typed
+        typed.head = list(convert_csv_text(pd.Index(self.head, dtype=object), self.text_kind))
+        if self.approximate:
+            typed.top_k = copy.copy(self.top_k)
+            typed.top_k.counters = _convert_counts(self.top_k.counters, self.text_kind)
+            if self.text_kind == "boolean":
+                # Spellings of the same boolean were counted apart; the top-k counters hold every value
+                typed.distinct = HyperLogLog()
+                typed.distinct.add(pd.Index(list(typed.top_k.counters)).to_numpy())
+        else:
+            typed.value_counts = Counter(_convert_counts(self.value_counts, self.text_kind))
+        return typed
+
+    def final_memory_bytes(self) -> int:
+        """In-memory size of the column as profile_dataset would hold it."""
+        if not self.csv_text or self.text_kind == "text":
+            return self.memory_bytes
+        dtype = csv_dtype(self.text_kind, self.null_count > 0)
+        if dtype != object:
+            return self.row_count * dtype.itemsize
+        # Booleans with missing cells: pointers to bools and NaN floats
+        nonnull = self.row_count - self.null_count
+        return self.row_count * 8 + nonnull * sys.getsizeof(True) + self.null_count * sys.getsizeof(np.nan)
+
+    def finalize(self, total_rows: int) -> Dict[str, Any]:
+        """Produces the column profile in the same schema as profile_column."""
+        if self.csv_text:
+            return self._with_csv_types().finalize(total_rows)
+        dtype = self.dtype if self.dtype is not None else np.dtype(object)
+        sample = pd.Series(self.head, dtype=dtype)
+        inferred_type = infer_column_type(sample)
+        # Exact mode knows every distinct value; sketches only keep heavy hitters
+        column_counts = None
+        if not self.approximate and dtype == 'object':
+            column_counts = pd.Series(list(self.value_counts.values()), index=pd.Index(list(self.value_counts.keys()), dtype=object))
+        semantic_type = detect_semantic_type(sample, value_counts=column_counts)
+
+        nonnull_count = self.row_count - self.null_count
+        if self.approximate:
+            # HLL can overshoot; a column cannot have more distinct values than non-null rows
+            distinct_count = min(self.distinct.count(), nonnull_count)
+            is_unique = bool(self.null_count == 0 and distinct_count >= total_rows * (1 - 3 * self.distinct.relative_error))
+        else:
+            distinct_count = len(self.value_counts)
+            is_unique = distinct_count == total_rows
+
+        stats: Dict[str, Any] = {}
+        outliers: Dict[str, Any] = {"count": 0, "threshold": "N/A"}
+        # Numeric columns, and text columns inferred numeric (their moments hold the parsed values)
+        numeric = pd.api.types.is_numeric_dtype(dtype) or (dtype == 'object' and inferred_type in ["integer", "float"])
+        if numeric and self.n > 0:
+            if self.approximate:
+                q1, median, q3 = (self.quantiles.quantile(q) for q in (0.25, 0.5, 0.75))
+            else:
+                keys, cumulative = self._sorted_counts()
+                q1 = _quantile_from_counts(keys, cumulative, 0.25)
+                q3 = _quantile_from_counts(keys, cumulative, 0.75)
+                median = _median_from_counts(keys, cumulative)
+            if inferred_type in ["integer", "float"]:
+                stats = {
+                    "min": float(self.min),
+                    "max": float(self.max),
+                    "mean": float(self.mean),
+                    "median": float(median),
+                    "std": float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else 0
+                }
+            iqr = q3 - q1
+            lower_bound = q1 - 1.5 * iqr
+            upper_bound = q3 + 1.5 * iqr
+            if self.approximate:
+                outlier_count = self.quantiles.count_below(lower_bound) + self.quantiles.count_above(upper_bound)
+            else:
+                below = np.searchsorted(keys, lower_bound, side="left")
+                above = np.searchsorted(keys, upper_bound, side="right")
+                outlier_count = (cumulative[below - 1] if below > 0 else 0) + (self.n - cumulative[above - 1] if above > 0 else self.n)
+            outliers = {
+                "count": int(outlier_count),
+                "lower_bound": float(lower_bound),
+                "upper_bound": float(upper_bound),
+                "threshold": "IQR * 1.5"
+            }
+        elif inferred_type == "string" and self.length_count > 0:
+            stats = {
+                "min_length": self.length_min,
+                "max_length": self.length_max,
+                "mean_length": float(self.length_sum / self.length_count)
+            }
+        elif inferred_type == "datetime" and self.datetime_min is not None:
+            stats = {"min": self.datetime_min.isoformat(), "max": self.datetime_max.isoformat()}
+
+        metrics = {
+            "null_count": self.null_count,
+            "null_percentage": float((self.null_count / total_rows) * 100 if total_rows > 0 else 0),
+            "empty_string_count": self.empty_string_count,
+            "distinct_count": distinct_count,
+            "is_unique": is_unique,
+            "stats": stats,
+            "outliers": outliers,
+            "top_values": self._top_values(dtype, total_rows),
+        }
+        patterns = {}
+        if dtype == 'object':
+            if self.approximate:
+                patterns = summarize_pattern_counts(
+                    dict(self.pattern_counts.top(5)), self.pattern_counts.total, dict(self.coarse_pattern_counts.top(5))
+                )
+            else:
+                patterns = summarize_pattern_counts(self.pattern_counts, coarse_counts=self.coarse_pattern_counts)
+
+        profile = build_column_profile(self.name, inferred_type, semantic_type, metrics, patterns, total_rows)
+        if self.approximate:
+            profile["estimated_fields"] = self._estimated_fields(stats, outliers)
+        return profile
+
+    def _estimated_fields(self, stats: Dict[str, Any], outliers: Dict[str, Any]) -> List[str]:
+        """Fields of this column's profile that come from sketches."""
+        fields = ["distinct_count", "is_unique", "top_values"]
+        if "median" in stats:
+            fields.append("stats.median")
+        if "lower_bound" in outliers:
+            fields.append("outliers")
+        return fields
+
+    def _top_values(self, dtype, total_rows: int, top_n: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent values, rendered through the column's final dtype."""
+        top = self.top_k.top(top_n) if self.approximate else self.value_counts.most_common(top_n)
+        # Chunks parsed as int and float share keys; render them as the final dtype would
+        values = pd.Series([val for val, _ in top], dtype=dtype)
+        return [
+            {
+                "value": str(val),
+                "count": int(count),
+                "percentage": round((count / total_rows) * 100, 2)
+            }
+            for val, (_, count) in zip(values, top)
+        ]
+
+    def _sorted_counts(self):
+        """Distinct numeric values in ascending order with cumulative counts."""
+        counts = np.fromiter(self.value_counts.values(), dtype=np.int64, count=len(self.value_counts))
+        if self.dtype == 'object':
+            # Text keys that parse as numbers, as in _add_numbers
+            keys = _text_numbers(pd.Index(list(self.value_counts.keys()), dtype=object))
+            parsed = ~np.isnan(keys)
+            keys, counts = keys[parsed], counts[parsed]
+        else:
+            keys = np.fromiter(self.value_counts.keys(), dtype="f8", count=len(self.value_counts))
+        order = np.argsort(keys, kind="stable")
+        return keys[order], np.cumsum(counts[order])
+
+
+def _convert_counts(counts: Dict[Any, int], kind: str) -> Dict[Any, int]:
+    """Counts keyed by CSV text, re-keyed by the converted values; text that converts equal (1.5, 1.50) is summed."""
+    if not counts:
+        return {}
+    keys = convert_csv_text(pd.Index(list(counts.keys()), dtype=object), kind)
+    summed = pd.Series(list(counts.values()), index=keys).groupby(level=0, sort=False).sum()
+    return dict(zip(summed.index, summed.tolist()))
+
+
+def _text_numbers(values: pd.Index) -> np.ndarray:
+    """Values of an object index as floats, NaN where they do not parse (as to_numeric_values)."""
+    stripped = values.astype(str).str.strip()
+    return pd.to_numeric(stripped, errors="coerce").to_numpy(dtype="f8", na_value=np.nan)
+
+
+def _common_dtype(a, b):
+    """Dtype a column ends up with when chunks of dtype a and b are concatenated."""
+    if a == b:
+        return a
+    if isinstance(a, np.dtype) and isinstance(b, np.dtype) and a.kind in "iuf" and b.kind in "iuf":
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+def _value_at(keys: np.ndarray, cumulative: np.ndarray, index: int) -> float:
+    """Value at a 0-based position in the sorted multiset."""
+    return keys[np.searchsorted(cumulative, index, side="right")]
+
+
+def _quantile_from_counts(keys: np.ndarray, cumulative: np.ndarray, q: float) -> float:
+    """Exact linear-interpolation quantile (NumPy's default method) over value counts."""
+    position = (cumulative[-1] - 1) * q
+    lower = int(np.floor(position))
+    a = _value_at(keys, cumulative, lower)
+    b = _value_at(keys, cumulative, min(lower + 1, int(cumulative[-1]) - 1))
+    t = position - lower
+    # Same lerp as np.percentile so results match the in-memory path
+    return b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
+
+
+def _median_from_counts(keys: np.ndarray, cumulative: np.ndarray) -> float:
+    """Exact median over value counts (mean of the middle pair for even counts)."""
+    n = int(cumulative[-1])
+    if n % 2:
+        return _value_at(keys, cumulative, n // 2)
+    return np.mean([_value_at(keys, cumulative, n // 2 - 1), _value_at(keys, cumulative, n // 2)])
+
+
+class DatasetAccumulator:
+    """
+    Mergeable dataset-level state: one ColumnAccumulator per column plus row
+    count and 64-bit row hashes for duplicate detection, which spill to disk
+    past a memory budget (see DuplicateCounter).
+    `csv_text` is passed to every column (see ColumnAccumulator).
+    """
+
+    def __init__(self, approximate: bool = False, csv_text: bool = False):
+        self.approximate = approximate
+        self.csv_text = csv_text
+        self.row_count = 0
+        self.columns: Dict[Any, ColumnAccumulator] = {}
+        self.duplicates = DuplicateCounter()
+
+    def update(self, chunk: pd.DataFrame):
+        """Folds one chunk of rows into the accumulator."""
+        self.merge(DatasetAccumulator.from_chunk(chunk, self.approximate, csv_text=self.csv_text))
+
+    @classmethod
+    def from_chunk(
+        cls, chunk: pd.DataFrame, approximate: bool = False, hashes: Optional[np.ndarray] = None, csv_text: bool = False
+    ) -> "DatasetAccumulator":
+        """Builds the accumulator for a single chunk. `hashes` reuses already computed row hashes."""
+        acc = cls(approximate, csv_text)
+        acc.row_count = len(chunk)
+        acc.duplicates.add(row_hashes(chunk) if hashes is None else hashes)
+        for col_name in chunk.columns:
+            acc.columns[col_name] = ColumnAccumulator.from_series(col_name, chunk[col_name], approximate, csv_text)
+        return acc
+
+    def merge(self, other: "DatasetAccumulator"):
+        """Merges an accumulator covering the rows that follow this one. `other` is left unchanged."""
+        self.row_count += other.row_count
+        self.duplicates.merge(other.duplicates)
+        for col_name, column in other.columns.items():
+            if col_name not in self.columns:
+                self.columns[col_name] = ColumnAccumulator(col_name, self.approximate, self.csv_text)
+            self.columns[col_name].merge(column)
+
+    def duplicate_rows(self) -> int:
+        """
+        Rows whose hash was already seen earlier in the file. This is an
+        estimate, and the summary lists it under "estimated_fields": unlike
+        find_duplicate_rows, equal hashes are not checked against the rows, so
+        a 64-bit collision counts as a duplicate.
+        """
+        return self.duplicates.count()
+
+    def finalize(self, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Produces profile_dataset-shaped results. `progress` gets the same
+        events as in profile_dataset, as each column is finalized. Spilled
+        row hashes are removed once counted.
+        """
+        if progress is not None:
+            progress("start", {"row_count": self.row_count, "column_count": len(self.columns)})
+        column_profiles = []
+        for position, acc in enumerate(self.columns.values()):
+            column_profiles.append(acc.finalize(self.row_count))
+            if progress is not None:
+                progress("column", {"position": position, "column": column_profiles[-1]})
+
+        # Sized as one frame with a RangeIndex, like the parsed file in memory
+        memory_bytes = pd.RangeIndex(self.row_count).memory_usage() + sum(acc.final_memory_bytes() for acc in self.columns.values())
+        summary = {
+            "row_count": self.row_count,
+            "column_count": len(self.columns),
+            "memory_mb": float(memory_bytes / (1024 * 1024)),
+            "duplicate_rows": self.duplicate_rows(),
+            # Hashes are never checked against the rows, which are gone by now
+            "estimated_fields": ["duplicate_rows"]
+        }
+        self.duplicates.close()
+        results = build_results(summary, column_profiles)
+        # Columns past EXACT_DISTINCT_LIMIT are sketched even in exact mode
+        if any(column.approximate for column in self.columns.values()):
+            results["approximation"] = SKETCH_ERROR_BOUNDS
+        return results
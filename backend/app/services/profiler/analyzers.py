@@ -0,0 +1,67 @@
+from typing import Dict, Any, FrozenSet, Iterable, Optional
+
+# Relative cost tiers: one vectorised pass or a fixed-size sample; a hash pass
+# over the values; sorting, row hashing or per-value string work
+CHEAP, MODERATE, EXPENSIVE = 1, 2, 3
+
+# Every analyzer a profile can run, what it fills in and what it needs first.
+# Fields of skipped analyzers are None, and without outliers, patterns or
+# duplicates the profile is not scored (quality_score None).
+ANALYZERS: Dict[str, Dict[str, Any]] = {
+    "types": {"cost": CHEAP, "scope": "column", "fields": ["inferred_type"], "requires": []},
+    "completeness": {"cost": CHEAP, "scope": "column", "fields": ["null_count", "null_percentage"], "requires": []},
+    "memory": {"cost": MODERATE, "scope": "dataset", "fields": ["summary.memory_mb"], "requires": []},
+    "distinct": {"cost": MODERATE, "scope": "column", "fields": ["distinct_count", "is_unique"], "requires": []},
+    "top_values": {"cost": MODERATE, "scope": "column", "fields": ["top_values"], "requires": ["distinct"]},
+    "semantic_types": {"cost": MODERATE, "scope": "column", "fields": ["semantic_type"], "requires": ["distinct"]},
+    "stats": {"cost": EXPENSIVE, "scope": "column", "fields": ["stats"], "requires": []},
+    "outliers": {"cost": EXPENSIVE, "scope": "column", "fields": ["outliers"], "requires": ["stats"]},
+    "patterns": {"cost": EXPENSIVE, "scope": "column", "fields": ["patterns"], "requires": ["distinct"]},
+    "duplicates": {"cost": EXPENSIVE, "scope": "dataset", "fields": ["summary.duplicate_rows"], "requires": []},
+}
+
+# Types and null counts feed every other analyzer and the column score
+REQUIRED_ANALYZERS = frozenset(["types", "completeness"])
+
+# Named levels run every analyzer up to a cost tier
+PROFILE_LEVELS = {"quick": CHEAP, "standard": MODERATE, "full": EXPENSIVE}
+
+ALL_ANALYZERS = frozenset(ANALYZERS)
+
+
+def level_analyzers(level: str) -> FrozenSet[str]:
+    if level not in PROFILE_LEVELS:
+        raise ValueError(f"Unknown profile level: {level}")
+    return frozenset(name for name, analyzer in ANALYZERS.items() if analyzer["cost"] <= PROFILE_LEVELS[level])
+
+
+def resolve_analyzers(level: Optional[str] = None, analyzers: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """
+    The analyzers to run for a level (default "full") or an explicit list,
+    which takes precedence. Required analyzers and every dependency are added.
+    """
+    if analyzers is None:
+        selected = set(level_analyzers(level or "full"))
+    else:
+        selected = set(analyzers)
+        unknown = selected - ALL_ANALYZERS
+        if unknown:
+            raise ValueError(f"Unknown analyzers: {', '.join(sorted(unknown))}")
+    selected |= REQUIRED_ANALYZERS
+
+    pending = list(selected)
+    while pending:
+        for requirement in ANALYZERS[pending.pop()]["requires"]:
+            if requirement not in selected:
+                selected.add(requirement)
+                pending.append(requirement)
+    return frozenset(selected)
+
+
+def analyzer_summary(analyzers: FrozenSet[str]) -> Dict[str, Any]:
+    """What a restricted profile ran and skipped, for the result."""
+    return {
+        "ran": sorted(analyzers, key=list(ANALYZERS).index),
+        "skipped": [name for name in ANALYZERS if name not in analyzers],
+        "cost": sum(ANALYZERS[name]["cost"] for name in analyzers),
+    }
@@ -0,0 +1,82 @@
+import pandas as pd
+from app.services.profiler.type_inference import infer_column_type_details
+from app.services.profiler.kernel import compute_column_metrics
+from app.services.profiler.patterns import analyze_patterns
+from app.utils.semantic_types import detect_semantic_type
+from app.utils.scoring import calculate_column_score
+from app.services.profiler.instrumentation import StageTimer
+from app.services.profiler.analyzers import ALL_ANALYZERS
+from typing import Dict, Any, Optional, FrozenSet
+
+def profile_column(
+    col_name: Any,
+    series: pd.Series,
+    total_rows: int,
+    timer: Optional[StageTimer] = None,
+    analyzers: FrozenSet[str] = ALL_ANALYZERS
+) -> Dict[str, Any]:
+    """
+    Profiles a single column and scores it, running only `analyzers`.
+    Stage timings are recorded on `timer` when one is given.
+    """
+    timer = timer.for_column(col_name) if timer else StageTimer(enabled=False)
+    rows = len(series)
+
+    with timer.stage("type_inference", rows=rows):
+        type_details = infer_column_type_details(series)
+    inferred_type = type_details["type"]
+    metrics = compute_column_metrics(
+        series, inferred_type, datetime_format=type_details["datetime_format"], timer=timer, analyzers=analyzers
+    )
+    semantic_type = None
+    if "semantic_types" in analyzers:
+        with timer.stage("semantic_detection", rows=rows):
+            semantic_type = detect_semantic_type(series, value_counts=metrics["value_counts"])
+    patterns = None
+    if "patterns" in analyzers:
+        with timer.stage("patterns", rows=rows):
+            patterns = analyze_patterns(series, value_counts=metrics["value_counts"], coarse=True)
+
+    return build_column_profile(col_name, inferred_type, semantic_type, metrics, patterns, total_rows)
+
+
+def build_column_profile(
+    col_name: Any,
+    inferred_type: str,
+    semantic_type: Optional[str],
+    metrics: Dict[str, Any],
+    patterns: Dict[str, Any],
+    total_rows: int
+) -> Dict[str, Any]:
+    """
+    Scores a column and assembles its profile from the computed metrics.
+    Shared by the in-memory and chunked profilers so both emit the same schema.
+    Outliers or patterns that were not analyzed (None) still let the other
+    checks report issues, but leave the column unscored (quality_score None).
+    """
+    # Calculate column score and identify issues
+    col_data_for_scoring = {
+        "null_percentage": metrics["null_percentage"],
+        "outliers": metrics["outliers"] or {},
+        "patterns": patterns or {},
+        "total_rows": total_rows
+    }
+    col_score, col_issues = calculate_column_score(col_data_for_scoring)
+    if metrics["outliers"] is None or patterns is None:
+        col_score = None
+
+    return {
+        "name": col_name,
+        "inferred_type": inferred_type,
+        "semantic_type": semantic_type,
+        "null_count": metrics["null_count"],
+        "null_percentage": metrics["null_percentage"],
+        "distinct_count": metrics["distinct_count"],
+        "is_unique": metrics["is_unique"],
+        "stats": metrics["stats"],
+        "outliers": metrics["outliers"],
+        "patterns": patterns,
+        "top_values": metrics["top_values"],
+        "quality_score": col_score,
+        "issues": col_issues
+    }
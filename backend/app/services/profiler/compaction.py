@@ -0,0 +1,83 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+
+# Compact parsed frames before profiling unless the upload says otherwise
+PROFILER_COMPACT = os.getenv("PROFILER_COMPACT", "false").lower() == "true"
+# String columns with at most this share of distinct values become categoricals
+COMPACT_MAX_DISTINCT_RATIO = float(os.getenv("PROFILER_COMPACT_MAX_DISTINCT_RATIO", "0.5"))
+
+_POINTER_BYTES = np.dtype(object).itemsize
+
+
+def compact_dataframe(df: pd.DataFrame, max_distinct_ratio: float = COMPACT_MAX_DISTINCT_RATIO) -> Dict[str, Any]:
+    """
+    Shrinks `df` in place so a job holds less memory while it is profiled:
+    string columns with few distinct values become categoricals and integers
+    are downcast to the smallest type holding their range. Both are lossless
+    and every analyzer reads the compact dtypes directly, so profiles do not
+    change. Floats are kept, since float32 would change the precision of
+    their means.
+
+    Returns the bytes saved, worked out from dtypes, row counts and the
+    distinct values rather than by walking every string, and the columns
+    converted.
+    """
+    saved = 0
+    categorical_columns = []
+    downcast_columns = []
+    for position, name in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if series.dtype == 'object':
+            compacted, column_saved = _to_categorical(series, max_distinct_ratio)
+            converted = categorical_columns
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind == "i" and series.dtype.itemsize > 1:
+            compacted = _downcast_integers(series)
+            column_saved = len(series) * (series.dtype.itemsize - compacted.dtype.itemsize) if compacted is not None else 0
+            converted = downcast_columns
+        else:
+            continue
+        if compacted is None:
+            continue
+
+        saved += column_saved
+        df.isetitem(position, compacted)
+        converted.append(name)
+
+    return {
+        "bytes_saved": int(saved),
+        "categorical_columns": categorical_columns,
+        "downcast_columns": downcast_columns,
+    }
+
+
+def _to_categorical(series: pd.Series, max_distinct_ratio: float) -> Tuple[Optional[pd.Series], int]:
+    """
+    A categorical copy of a string column and the bytes it saves, or None
+    when it has mixed types or too many distinct values. Categories keep the
+    order of first occurrence, as value_counts() does, so ties in top values
+    come out in the same order.
+    """
+    values = series.to_numpy()
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0 or len(uniques) > max_distinct_ratio * len(values):
+        return None, 0
+    if pd.api.types.infer_dtype(uniques, skipna=False) != "string":
+        return None, 0
+
+    # What memory_usage(deep=True) would report before and after, from one size per distinct value
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    sizes = np.fromiter(map(sys.getsizeof, uniques), dtype=np.int64, count=len(uniques))
+    nulls = sum(map(sys.getsizeof, values[codes < 0]))
+    before = len(values) * _POINTER_BYTES + int(counts @ sizes) + nulls
+
+    categorical = pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object))
+    after = categorical.codes.nbytes + len(uniques) * _POINTER_BYTES + int(sizes.sum())
+    return pd.Series(categorical, index=series.index, name=series.name), before - after
+
+
+def _downcast_integers(series: pd.Series) -> Optional[pd.Series]:
+    downcast = pd.to_numeric(series, downcast="integer")
+    return downcast if downcast.dtype != series.dtype else None
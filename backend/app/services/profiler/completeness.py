@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Dict, Union
+from app.services.profiler.type_inference import is_text_dtype
 
 def calculate_completeness(series: pd.Series) -> Dict[str, Union[int, float]]:
     """
@@ -11,7 +12,7 @@ def calculate_completeness(series: pd.Series) -> Dict[str, Union[int, float]]:
     
     # Detect empty strings explicitly if object type
     empty_string_count = 0
-    if series.dtype == 'object':
+    if is_text_dtype(series):
         empty_string_count = (series == "").sum()
         
     return {
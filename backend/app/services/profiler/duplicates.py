@@ -0,0 +1,190 @@
+import os
+import numbers
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Iterator, Optional
+
+# Row hashes a chunked profile keeps in memory before spilling them to disk
+DUPLICATE_HASH_MB = int(os.getenv("PROFILER_DUPLICATE_HASH_MB", "64"))
+# Directory for spilled row hashes; the system temp dir when unset
+SPILL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+# Spilled hashes are split by their top bits into this many files
+SPILL_BITS = 8
+SPILL_BUCKETS = 1 << SPILL_BITS
+
+
+def find_duplicate_rows(df: pd.DataFrame, top_groups: int = 0) -> Dict[str, Any]:
+    """
+    Counts duplicate rows (same semantics as df.duplicated().sum()).
+    Rows are bucketed by a vectorised 64-bit row hash of the canonical
+    values (see row_hashes), so rows duplicated() considers equal always
+    share a bucket; only rows whose hash occurs more than once are compared
+    exactly, so the factorised multi-column key is built over a small
+    candidate subset instead of the whole frame. Optionally returns the
+    `top_groups` most repeated rows.
+    """
+    result: Dict[str, Any] = {"duplicate_rows": 0}
+    if top_groups:
+        result["top_groups"] = []
+    if len(df) < 2 or len(df.columns) == 0:
+        return result
+
+    hashes = row_hashes(df)
+    candidates = _colliding_positions(hashes)
+    if len(candidates) == 0:
+        return result
+
+    # Exact check on candidates only; positions stay in file order so "first" matches
+    subset = df.iloc[candidates]
+    duplicated = subset.duplicated()
+    result["duplicate_rows"] = int(duplicated.sum())
+
+    if top_groups and result["duplicate_rows"]:
+        result["top_groups"] = _top_groups(subset, candidates, hashes[candidates], top_groups)
+    return result
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of every row, ignoring the index. Values are canonicalised
+    first so that values duplicated() treats as equal hash equally: -0.0
+    becomes 0.0, every NaN the same NaN, and numbers floats whatever their
+    column's dtype (1, 1.0 and True alike), so an integer column that turns
+    float in a later chunk still hashes its rows the same. Unequal rows may
+    still collide.
+    """
+    canonical = None
+    for position in range(len(df.columns)):
+        series = df.iloc[:, position]
+        if pd.api.types.is_float_dtype(series) or pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+            # Adding 0.0 turns -0.0 into 0.0; fillna writes one NaN over every NaN payload
+            replacement = (series.astype("float64") + 0.0).fillna(np.nan)
+        elif series.dtype == 'object' and pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+            replacement = series.map(_canonical_object)
+        else:
+            continue
+        if canonical is None:
+            canonical = df.copy(deep=False)
+        canonical.isetitem(position, replacement)
+    return pd.util.hash_pandas_object(df if canonical is None else canonical, index=False).to_numpy()
+
+
+class DuplicateCounter:
+    """
+    Counts rows whose hash repeats an earlier one across the chunks of a
+    file. Hashes stay in memory up to `max_bytes`; beyond that they are
+    appended to SPILL_BUCKETS files by their top bits, so equal hashes share
+    a file and count() reads one file at a time. Memory stays bounded at any
+    file size. close() removes the files.
+    """
+
+    def __init__(self, max_bytes: int = DUPLICATE_HASH_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.parts: List[np.ndarray] = []
+        self.nbytes = 0
+        self.spill: Optional[tempfile.TemporaryDirectory] = None
+
+    def add(self, hashes: np.ndarray):
+        self.parts.append(hashes)
+        self.nbytes += hashes.nbytes
+        if self.nbytes > self.max_bytes:
+            self._spill()
+
+    def merge(self, other: "DuplicateCounter"):
+        """Adds the hashes of `other`, which is left unchanged."""
+        for hashes in other.parts:
+            self.add(hashes)
+        for hashes in other._spilled():
+            self.add(hashes)
+
+    def count(self) -> int:
+        if self.spill is None:
+            if not self.parts:
+                return 0
+            hashes = np.concatenate(self.parts)
+            return int(len(hashes) - len(np.unique(hashes)))
+        self._spill()
+        return sum(int(len(hashes) - len(np.unique(hashes))) for hashes in self._spilled())
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.cleanup()
+            self.spill = None
+
+    def _path(self, bucket: int) -> str:
+        return os.path.join(self.spill.name, f"{bucket:03d}")
+
+    def _spill(self):
+        if not self.parts:
+            return
+        if self.spill is None:
+            self.spill = tempfile.TemporaryDirectory(dir=SPILL_DIR, prefix="row-hashes-")
+        hashes = np.concatenate(self.parts)
+        buckets = (hashes >> np.uint64(64 - SPILL_BITS)).astype(np.intp)
+        order = np.argsort(buckets, kind="stable")
+        bounds = np.searchsorted(buckets[order], np.arange(SPILL_BUCKETS + 1))
+        for bucket in range(SPILL_BUCKETS):
+            if bounds[bucket] < bounds[bucket + 1]:
+                with open(self._path(bucket), "ab") as f:
+                    hashes[order[bounds[bucket]:bounds[bucket + 1]]].tofile(f)
+        self.parts, self.nbytes = [], 0
+
+    def _spilled(self) -> Iterator[np.ndarray]:
+        if self.spill is None:
+            return
+        for bucket in range(SPILL_BUCKETS):
+            if os.path.exists(self._path(bucket)):
+                yield np.fromfile(self._path(bucket), dtype=np.uint64)
+
+
+def _canonical_object(value: Any) -> Any:
+    if isinstance(value, (numbers.Real, np.bool_)):
+        return float(value) + 0.0
+    return value
+
+
+def _colliding_positions(hashes: np.ndarray) -> np.ndarray:
+    """Sorted row positions whose hash appears at least twice."""
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    same_as_next = sorted_hashes[1:] == sorted_hashes[:-1]
+    in_group = np.zeros(len(hashes), dtype=bool)
+    in_group[1:] |= same_as_next
+    in_group[:-1] |= same_as_next
+    return np.sort(order[in_group])
+
+
+def _top_groups(subset: pd.DataFrame, positions: np.ndarray, hashes: np.ndarray, top_groups: int) -> List[Dict[str, Any]]:
+    """
+    The most repeated rows among the hash-colliding candidates.
+    Buckets are visited largest first and split exactly, since a bucket can
+    hold several distinct rows when hashes collide.
+    """
+    bucket_sizes = pd.Series(hashes).value_counts()
+    groups: List[Dict[str, Any]] = []
+
+    for bucket_hash, bucket_size in bucket_sizes.items():
+        # No row in this or any later bucket can beat a full top list
+        if len(groups) >= top_groups and bucket_size <= groups[top_groups - 1]["count"]:
+            break
+
+        in_bucket = np.flatnonzero(hashes == bucket_hash)
+        rows = subset.iloc[in_bucket]
+        keys = [rows.iloc[:, i] for i in range(rows.shape[1])]
+        for members in rows.groupby(keys, dropna=False, sort=False).indices.values():
+            if len(members) < 2:
+                continue
+            first = rows.iloc[members[0]]
+            groups.append({
+                "row": {
+                    str(col): (str(value) if pd.notna(value) else None)
+                    for col, value in zip(subset.columns, first.tolist())
+                },
+                "count": int(len(members)),
+                "row_positions": positions[in_bucket[members[:5]]].tolist()
+            })
+        groups.sort(key=lambda group: group["count"], reverse=True)
+
+    return groups[:top_groups]
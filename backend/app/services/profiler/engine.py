@@ -1,80 +1,157 @@
 import pandas as pd
-from app.services.profiler.type_inference import infer_column_type
-from app.services.profiler.completeness import calculate_completeness
-from app.services.profiler.statistics import calculate_basic_stats, get_top_values
-from app.services.profiler.outliers import detect_outliers
-from app.services.profiler.patterns import analyze_patterns
-from app.utils.semantic_types import detect_semantic_type
-from app.utils.scoring import calculate_column_score, calculate_overall_score
-from typing import Dict, Any, List
+from app.services.profiler.column import profile_column
+from app.services.profiler.parallel import (
+    PARALLEL_WORKERS, PARALLEL_MIN_CELLS, should_profile_in_parallel, profile_columns_parallel
+)
+from app.services.profiler.wide import WIDE_MIN_COLUMNS, should_profile_wide, profile_columns_wide
+from app.services.profiler.compaction import compact_dataframe
+from app.services.profiler.analyzers import ALL_ANALYZERS, resolve_analyzers, level_analyzers, analyzer_summary
+from app.services.profiler.results import build_results
+from app.services.profiler.duplicates import find_duplicate_rows
+from app.services.profiler.streaming import profile_chunks, iter_row_chunks
+from app.services.profiler.instrumentation import StageTimer, TRACE_MEMORY, traced_memory, finish_timings
+from app.utils.file_parser import CHUNK_ROWS
+from typing import Dict, Any, List, Optional, Callable, Iterable, FrozenSet
 
-def profile_dataset(df: pd.DataFrame) -> Dict[str, Any]:
+def profile_dataset(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    parallel_min_cells: Optional[int] = None,
+    wide_min_columns: Optional[int] = None,
+    approximate: bool = False,
+    duplicate_groups: int = 0,
+    timings: bool = False,
+    trace_memory: Optional[bool] = None,
+    compact: bool = False,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    level: Optional[str] = None,
+    analyzers: Optional[Iterable[str]] = None,
+    preview: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
     """
     Runs full profiling on the provided dataframe.
+    Columns are split across a process pool when `workers` > 1 and the dataset
+    has at least `parallel_min_cells` cells; both default to the
+    PROFILER_WORKERS / PROFILER_PARALLEL_MIN_CELLS settings. Otherwise tables
+    with at least `wide_min_columns` (default PROFILER_WIDE_MIN_COLUMNS)
+    columns profile numeric columns in dtype-grouped batches.
+    With approximate=True, distinct counts, quantiles and top values come from
+    fixed-size sketches (see sketches.py for error bounds).
+    `duplicate_groups` > 0 adds the most repeated rows to the summary.
+    Per-stage and per-column timings always feed the process-wide metrics;
+    `timings` also adds them to the results. `trace_memory` (default
+    PROFILER_TRACE_MEMORY) records peak allocations per stage via tracemalloc.
+    With compact=True, `df` is first converted in place to categoricals and
+    narrower integers (see compaction.py); profiles are unchanged and the
+    summary reports memory before and after.
+    `progress` is called with ("start", {row_count, column_count}) and then
+    ("column", {position, column}) as each column profile is finished, in
+    completion order; the summary and scores are computed after the last.
+    `level` ("quick", "standard" or "full", the default) or an explicit
+    `analyzers` list picks what runs (see analyzers.py); skipped fields are
+    None and a restricted result lists what ran under "analyzers".
+    The approximate path profiles every analyzer serially over row chunks;
+    combining it with duplicate_groups, compact, workers > 1 or restricted
+    analyzers raises ValueError. When `preview` is given and more than the
+    quick level runs, a quick profile is passed to it first.
     """
-    total_rows = len(df)
-    duplicate_rows = int(df.duplicated().sum())
-    
-    results = {
-        "summary": {
-            "row_count": total_rows,
-            "column_count": len(df.columns),
-            "memory_mb": float(df.memory_usage(deep=True).sum() / (1024 * 1024)),
-            "duplicate_rows": duplicate_rows
-        },
-        "columns": [],
-        "issues_summary": {"critical": 0, "warning": 0, "info": 0}
+    trace_memory = TRACE_MEMORY if trace_memory is None else trace_memory
+    selected = resolve_analyzers(level, analyzers)
+    if approximate:
+        unsupported = approximate_conflicts(duplicate_groups, compact, selected, workers)
+        if unsupported:
+            raise ValueError(f"approximate=True does not support {', '.join(unsupported)}")
+    quick = level_analyzers("quick")
+    if preview is not None and selected != quick:
+        preview(_quick_profile(df, quick))
+    if approximate:
+        return profile_chunks(
+            iter_row_chunks(df, CHUNK_ROWS), approximate=True, timings=timings, trace_memory=trace_memory, progress=progress
+        )
+
+    workers = PARALLEL_WORKERS if workers is None else workers
+    parallel_min_cells = PARALLEL_MIN_CELLS if parallel_min_cells is None else parallel_min_cells
+    wide_min_columns = WIDE_MIN_COLUMNS if wide_min_columns is None else wide_min_columns
+
+    timer = StageTimer(trace_memory)
+    compaction = None
+    with traced_memory(trace_memory):
+        total_rows = len(df)
+        if compact:
+            with timer.stage("compaction", rows=total_rows):
+                compaction = compact_dataframe(df)
+        on_column = None
+        if progress is not None:
+            progress("start", {"row_count": total_rows, "column_count": len(df.columns)})
+
+            def on_column(position: int, profile: Dict[str, Any]):
+                progress("column", {"position": position, "column": profile})
+
+        if should_profile_in_parallel(df, workers, parallel_min_cells):
+            column_profiles = profile_columns_parallel(df, total_rows, workers, timer, on_column, selected)
+        elif selected == ALL_ANALYZERS and should_profile_wide(df, wide_min_columns):
+            column_profiles = profile_columns_wide(df, total_rows, timer, on_column=on_column)
+        else:
+            column_profiles = []
+            for position, col_name in enumerate(df.columns):
+                column_profiles.append(profile_column(col_name, df[col_name], total_rows, timer, selected))
+                if on_column is not None:
+                    on_column(position, column_profiles[-1])
+
+        # Whole-row work runs after the columns so the first ones reach clients sooner
+        duplicates = {"duplicate_rows": None, "top_groups": None}
+        if "duplicates" in selected:
+            with timer.stage("duplicates", rows=total_rows):
+                duplicates = find_duplicate_rows(df, top_groups=duplicate_groups)
+
+        memory_bytes = None
+        if "memory" in selected:
+            with timer.stage("memory_usage", rows=total_rows):
+                memory_bytes = df.memory_usage(deep=True).sum()
+
+    summary = {
+        "row_count": total_rows,
+        "column_count": len(df.columns),
+        "memory_mb": float(memory_bytes / (1024 * 1024)) if memory_bytes is not None else None,
+        "duplicate_rows": duplicates["duplicate_rows"]
     }
-    
-    col_scores = []
-    
-    for col_name in df.columns:
-        series = df[col_name]
-        inferred_type = infer_column_type(series)
-        semantic_type = detect_semantic_type(series)
-        completeness = calculate_completeness(series)
-        basic_stats = calculate_basic_stats(series, inferred_type)
-        outliers = detect_outliers(series)
-        patterns = analyze_patterns(series)
-        
-        # Calculate column score and identify issues
-        col_data_for_scoring = {
-            "null_percentage": completeness["null_percentage"],
-            "outliers": outliers,
-            "patterns": patterns,
-            "total_rows": total_rows
+    if duplicate_groups:
+        summary["duplicate_groups"] = duplicates["top_groups"]
+    if compaction is not None:
+        summary["compaction"] = {
+            "memory_mb_before": float((memory_bytes + compaction["bytes_saved"]) / (1024 * 1024)) if memory_bytes is not None else None,
+            "categorical_columns": compaction["categorical_columns"],
+            "downcast_columns": compaction["downcast_columns"],
         }
-        col_score, col_issues = calculate_column_score(col_data_for_scoring)
-        col_scores.append(col_score)
-        
-        # Update issues summary
-        for issue in col_issues:
-            results["issues_summary"][issue["severity"]] += 1
-        
-        distinct_count = int(series.nunique())
-        is_unique = (distinct_count == total_rows)
-        top_values = get_top_values(series)
+    results = build_results(summary, column_profiles)
+    if selected != ALL_ANALYZERS:
+        results["analyzers"] = analyzer_summary(selected)
+    return finish_timings(timer, results, attach=timings)
 
-        col_profile = {
-            "name": col_name,
-            "inferred_type": inferred_type,
-            "semantic_type": semantic_type,
-            "null_count": completeness["null_count"],
-            "null_percentage": completeness["null_percentage"],
-            "distinct_count": distinct_count,
-            "is_unique": is_unique,
-            "stats": basic_stats,
-            "outliers": outliers,
-            "patterns": patterns,
-            "top_values": top_values,
-            "quality_score": col_score,
-            "issues": col_issues
-        }
-        results["columns"].append(col_profile)
-        
-    # Final overall score
-    overall_score, quality_grade = calculate_overall_score(col_scores, duplicate_rows, total_rows)
-    results["summary"]["quality_score"] = overall_score
-    results["summary"]["quality_grade"] = quality_grade
-    
+
+def approximate_conflicts(
+    duplicate_groups: int, compact: bool, selected: FrozenSet[str], workers: Optional[int] = None
+) -> List[str]:
+    """The options an approximate profile would otherwise ignore."""
+    used = [
+        ("duplicate_groups", duplicate_groups > 0),
+        ("compact", compact),
+        ("workers", workers is not None and workers > 1),
+        ("analyzers", selected != ALL_ANALYZERS),
+    ]
+    return [name for name, is_used in used if is_used]
+
+
+def _quick_profile(df: pd.DataFrame, analyzers: FrozenSet[str]) -> Dict[str, Any]:
+    """Types and completeness of every column, serially and without timings."""
+    total_rows = len(df)
+    timer = StageTimer(enabled=False)
+    column_profiles = [
+        profile_column(df.columns[position], df.iloc[:, position], total_rows, timer, analyzers)
+        for position in range(len(df.columns))
+    ]
+    summary = {"row_count": total_rows, "column_count": len(df.columns), "memory_mb": None, "duplicate_rows": None}
+    results = build_results(summary, column_profiles)
+    results["analyzers"] = analyzer_summary(analyzers)
     return results
+
@@ -0,0 +1,102 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.services.profiler.accumulators import DatasetAccumulator, ColumnAccumulator
+
+# Per-chunk accumulators kept so re-uploads of appended files only profile new chunks; 0 disables
+CHUNK_CACHE_MB = int(os.getenv("CHUNK_CACHE_MB", "256"))
+
+# Rough cost of one Counter / dict entry or head value, used to size cached accumulators
+_ENTRY_BYTES = 100
+
+
+def chunk_fingerprint(chunk: pd.DataFrame, hashes: np.ndarray, approximate: bool, csv_text: bool = False) -> str:
+    """
+    Identifies a parsed chunk by its column names, dtypes and row hashes.
+    Chunks with equal fingerprints produce identical accumulators.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    header = (list(chunk.columns), [str(dtype) for dtype in chunk.dtypes], approximate, csv_text)
+    hasher.update(repr(header).encode())
+    hasher.update(hashes.tobytes())
+    return hasher.hexdigest()
+
+
+def _column_size(column: ColumnAccumulator) -> int:
+    size = len(column.head) * _ENTRY_BYTES
+    if column.approximate:
+        size += column.distinct.registers.nbytes + sum(level.nbytes for level in column.quantiles.levels)
+        size += (len(column.top_k.counters) + len(column.pattern_counts.counters) + len(column.coarse_pattern_counts.counters)) * _ENTRY_BYTES
+    else:
+        size += (len(column.value_counts) + len(column.pattern_counts) + len(column.coarse_pattern_counts)) * _ENTRY_BYTES
+    return size
+
+
+def accumulator_size(part: DatasetAccumulator) -> int:
+    """Estimated memory held by a chunk's accumulator."""
+    hashes = part.duplicates.nbytes
+    return hashes + sum(_column_size(column) for column in part.columns.values())
+
+
+class ChunkCache:
+    """
+    Content-addressed cache of per-chunk DatasetAccumulators.
+    A daily snapshot that only appends rows parses into the same leading
+    chunks as the previous upload, so their accumulators are merged from here
+    and only the new chunks are profiled. Cached accumulators are never
+    mutated: merging reads them into the job's own accumulator.
+    """
+
+    def __init__(self, max_bytes: int = CHUNK_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Tuple[DatasetAccumulator, int]]" = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[DatasetAccumulator]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, part: DatasetAccumulator):
+        size = accumulator_size(part)
+        with self.lock:
+            if size > self.max_bytes or key in self.entries:
+                return
+            self.entries[key] = (part, size)
+            self.resident_bytes += size
+            while self.resident_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.resident_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Singleton instance
+chunk_cache = ChunkCache()
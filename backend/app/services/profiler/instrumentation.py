@@ -0,0 +1,231 @@
+import os
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+# tracemalloc slows allocation-heavy code noticeably, so peak tracking is opt-in
+TRACE_MEMORY = os.getenv("PROFILER_TRACE_MEMORY", "false").lower() == "true"
+
+# Slowest columns kept by the process-wide metrics (durations only, never names)
+SLOWEST_COLUMNS = 20
+
+
+class MemoryTracing:
+    """
+    Process-wide tracemalloc bookkeeping. tracemalloc, its peak included, is
+    global to the process and counts every thread's allocations, while the
+    profiling executor runs several jobs on concurrent threads. So runs share
+    one tracing session, started by the first run that asks for it and
+    stopped when the last one ends, and a stage's peak is only measured when
+    its run was the only profiling run in the process for the whole stage.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active_runs = 0
+        self.runs_started = 0
+        self.tracing_runs = 0
+        self.owns_session = False
+
+    def begin(self, trace: bool):
+        with self.lock:
+            self.active_runs += 1
+            self.runs_started += 1
+            if trace:
+                if self.tracing_runs == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self.owns_session = True
+                self.tracing_runs += 1
+
+    def end(self, trace: bool):
+        with self.lock:
+            self.active_runs -= 1
+            if trace:
+                self.tracing_runs -= 1
+                if self.tracing_runs == 0 and self.owns_session:
+                    tracemalloc.stop()
+                    self.owns_session = False
+
+    def start_stage(self) -> Optional[Tuple[int, int]]:
+        """Resets the peak and returns a token for stage_peak(), or None when the peak would be shared."""
+        with self.lock:
+            if self.active_runs != 1 or not tracemalloc.is_tracing():
+                return None
+            tracemalloc.reset_peak()
+            return self.runs_started, tracemalloc.get_traced_memory()[0]
+
+    def stage_peak(self, token: Optional[Tuple[int, int]]) -> Optional[int]:
+        """Peak bytes above the stage's baseline, or None if another run started meanwhile."""
+        with self.lock:
+            if token is None or self.active_runs != 1 or self.runs_started != token[0] or not tracemalloc.is_tracing():
+                return None
+            return max(tracemalloc.get_traced_memory()[1] - token[1], 0)
+
+
+# Singleton instance
+memory_tracing = MemoryTracing()
+
+
+class StageTimer:
+    """
+    Records wall time, rows scanned and (optionally) peak traced allocations
+    for each analyzer stage. Column-scoped views share one list of records.
+    A disabled timer records nothing. Peaks are left out of stages that ran
+    alongside another profiling run in the process (see MemoryTracing).
+    """
+
+    def __init__(self, trace_memory: bool = False, enabled: bool = True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.column: Optional[str] = None
+        self.records: List[Dict[str, Any]] = []
+        self.started = time.perf_counter()
+
+    def for_column(self, column: Any) -> "StageTimer":
+        """A view that tags its records with `column`."""
+        timer = StageTimer(self.trace_memory, self.enabled)
+        timer.column = str(column)
+        timer.records = self.records
+        return timer
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        # Stages never nest, so the peak can be reset for each one
+        token = memory_tracing.start_stage() if self.trace_memory else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "column": self.column,
+                "seconds": time.perf_counter() - start,
+                "rows": int(rows),
+            }
+            peak = memory_tracing.stage_peak(token)
+            if peak is not None:
+                record["peak_bytes"] = peak
+            self.records.append(record)
+
+    def summary(self, total_seconds: float) -> Dict[str, Any]:
+        """Stage totals for the dataset plus a per-column breakdown."""
+        stages: Dict[str, Dict[str, Any]] = {}
+        columns: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            _add_record(stages.setdefault(record["stage"], _empty_totals()), record)
+            if record["column"] is not None:
+                column = columns.setdefault(record["column"], {"name": record["column"], "seconds": 0.0, "stages": {}})
+                column["seconds"] += record["seconds"]
+                _add_record(column["stages"].setdefault(record["stage"], _empty_totals()), record)
+
+        return {
+            "total_seconds": total_seconds,
+            "memory_traced": self.trace_memory,
+            "stages": stages,
+            "columns": list(columns.values()),
+        }
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {"seconds": 0.0, "rows": 0, "calls": 0, "peak_bytes": None}
+
+
+def _max_peak(current: Optional[int], peak: Optional[int]) -> Optional[int]:
+    """Larger of two peaks, where None means the peak was not measured."""
+    if peak is None:
+        return current
+    return peak if current is None else max(current, peak)
+
+
+def _add_record(totals: Dict[str, Any], record: Dict[str, Any]):
+    totals["seconds"] += record["seconds"]
+    totals["rows"] += record["rows"]
+    totals["calls"] += 1
+    totals["peak_bytes"] = _max_peak(totals["peak_bytes"], record.get("peak_bytes"))
+
+
+@contextmanager
+def traced_memory(enabled: bool) -> Iterator[None]:
+    """
+    Wraps one profiling run, traced or not, so MemoryTracing knows when runs
+    overlap. With `enabled`, tracemalloc runs for at least its duration.
+    """
+    memory_tracing.begin(enabled)
+    try:
+        yield
+    finally:
+        memory_tracing.end(enabled)
+
+
+class ProfilerMetrics:
+    """
+    Process-wide aggregate of profiling timings, for the metrics endpoint.
+    The endpoint is unauthenticated, so the slowest columns keep their stage
+    durations but not their names, which come from users' files.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.datasets = 0
+            self.total_seconds = 0.0
+            self.stages: Dict[str, Dict[str, Any]] = {}
+            self.slowest_columns: List[Dict[str, Any]] = []
+
+    def record(self, timings: Dict[str, Any]):
+        with self.lock:
+            self.datasets += 1
+            self.total_seconds += timings["total_seconds"]
+            for name, totals in timings["stages"].items():
+                stage = self.stages.setdefault(name, {**_empty_totals(), "max_seconds": 0.0})
+                stage["seconds"] += totals["seconds"]
+                stage["rows"] += totals["rows"]
+                stage["calls"] += totals["calls"]
+                stage["peak_bytes"] = _max_peak(stage["peak_bytes"], totals["peak_bytes"])
+                stage["max_seconds"] = max(stage["max_seconds"], totals["seconds"])
+
+            self.slowest_columns.extend(
+                {"seconds": column["seconds"], "stages": column["stages"]} for column in timings["columns"]
+            )
+            self.slowest_columns.sort(key=lambda column: column["seconds"], reverse=True)
+            del self.slowest_columns[SLOWEST_COLUMNS:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stages = {
+                name: {
+                    **totals,
+                    "rows_per_second": totals["rows"] / totals["seconds"] if totals["seconds"] else None
+                }
+                for name, totals in self.stages.items()
+            }
+            return {
+                "datasets_profiled": self.datasets,
+                "total_seconds": self.total_seconds,
+                "stages": stages,
+                "slowest_columns": list(self.slowest_columns),
+            }
+
+
+# Singleton instance
+profiler_metrics = ProfilerMetrics()
+
+
+def finish_timings(timer: StageTimer, results: Dict[str, Any], attach: bool) -> Dict[str, Any]:
+    """
+    Adds a run's timings to the process-wide metrics and, if `attach`, to the
+    results under "timings".
+    """
+    timings = timer.summary(time.perf_counter() - timer.started)
+    profiler_metrics.record(timings)
+    if attach:
+        results["timings"] = timings
+    return results
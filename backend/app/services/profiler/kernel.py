@@ -0,0 +1,206 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, FrozenSet
+from app.services.profiler.type_inference import to_datetime_values, to_numeric_values, is_text_dtype
+from app.services.profiler.instrumentation import StageTimer
+from app.services.profiler.analyzers import ALL_ANALYZERS
+
+
+def compute_column_metrics(
+    series: pd.Series,
+    inferred_type: str,
+    top_n: int = 10,
+    datetime_format: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    analyzers: FrozenSet[str] = ALL_ANALYZERS
+) -> Dict[str, Any]:
+    """
+    Fused per-column kernel.
+    Computes completeness, basic stats, IQR outliers, distinct count and top values
+    from a single null mask, one materialised non-null array, one value_counts()
+    and one sort. Output matches calculate_completeness, calculate_basic_stats,
+    detect_outliers, get_top_values and series.nunique() run separately.
+    The non-null value_counts() is returned too so later analyzers can reuse it;
+    it is in descending count order with ties in order of first occurrence,
+    which is also the order of top_values.
+    Numbers and datetimes stored as text are converted once, datetimes with the
+    `datetime_format` resolved during type inference.
+    Only the parts in `analyzers` are computed (see analyzers.py); fields of
+    skipped analyzers are None, and without "distinct" there is no hash pass.
+    """
+    timer = timer or StageTimer(enabled=False)
+    total_count = len(series)
+
+    with timer.stage("completeness", rows=total_count):
+        null_mask = series.isna()
+        null_count = int(null_mask.sum())
+        nonnull = series[~null_mask] if null_count else series
+
+    value_counts = None
+    distinct_count = None
+    empty_string_count = None
+    if "distinct" in analyzers:
+        empty_string_count = 0
+        with timer.stage("distinct", rows=len(nonnull)):
+            # One hash pass shared by distinct_count, is_unique, top_values and empty strings
+            value_counts = _by_frequency(nonnull.value_counts(sort=False))
+            text = is_text_dtype(series)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Categorical value_counts also lists unobserved categories
+                distinct_count = int((value_counts > 0).sum())
+                if text:
+                    # String analyzers read the values from a plain object index
+                    value_counts.index = value_counts.index.astype(object)
+            else:
+                distinct_count = len(value_counts)
+
+            if text and "" in value_counts.index:
+                empty_string_count = int(value_counts[""])
+
+    stats: Dict[str, Any] = {}
+    outliers: Dict[str, Any] = {"count": 0, "threshold": "N/A"}
+
+    values = None
+    sorted_values = None
+    with timer.stage("stats", rows=len(nonnull)):
+        if "stats" in analyzers and len(nonnull) > 0:
+            if pd.api.types.is_numeric_dtype(series):
+                values = _numeric_values(nonnull)
+            elif inferred_type in ["integer", "float"]:
+                values = to_numeric_values(nonnull).to_numpy()
+
+        if values is not None and len(values) > 0:
+            sorted_values = np.sort(values)
+            if inferred_type in ["integer", "float"]:
+                stats = {
+                    "min": float(sorted_values[0]),
+                    "max": float(sorted_values[-1]),
+                    "mean": float(_mean(values)),
+                    "median": float(np.median(sorted_values.astype("f8", copy=False))),
+                    "std": float(_std(values)) if len(values) > 1 else 0
+                }
+        elif "stats" in analyzers and inferred_type == "string" and len(nonnull) > 0:
+            stats = _length_stats(nonnull, value_counts)
+        elif "stats" in analyzers and inferred_type == "datetime" and len(nonnull) > 0:
+            stats = _datetime_range(to_datetime_values(nonnull, datetime_format))
+
+    if sorted_values is not None and "outliers" in analyzers:
+        with timer.stage("outliers", rows=len(sorted_values)):
+            q1, q3 = np.percentile(sorted_values, [25, 75])
+            iqr = q3 - q1
+            lower_bound = q1 - 1.5 * iqr
+            upper_bound = q3 + 1.5 * iqr
+            below = np.searchsorted(sorted_values, lower_bound, side="left")
+            above = len(sorted_values) - np.searchsorted(sorted_values, upper_bound, side="right")
+            outliers = {
+                "count": int(below + above),
+                "lower_bound": float(lower_bound),
+                "upper_bound": float(upper_bound),
+                "threshold": "IQR * 1.5"
+            }
+
+    top_values = None
+    if "top_values" in analyzers:
+        with timer.stage("top_values", rows=len(value_counts)):
+            top_values = _top_values(value_counts, total_count, top_n)
+
+    return {
+        "null_count": null_count,
+        "null_percentage": float((null_count / total_count) * 100 if total_count > 0 else 0),
+        "empty_string_count": empty_string_count,
+        "distinct_count": distinct_count,
+        "is_unique": distinct_count == total_count if distinct_count is not None else None,
+        "stats": stats if "stats" in analyzers else None,
+        "outliers": outliers if "outliers" in analyzers else None,
+        "top_values": top_values,
+        "value_counts": value_counts,
+    }
+
+
+def _by_frequency(value_counts: pd.Series) -> pd.Series:
+    """
+    Unsorted value_counts() (in order of first occurrence) in descending count
+    order. The sort is stable, so ties keep the order of first occurrence;
+    value_counts(sort=True) leaves them in an arbitrary order.
+    """
+    order = np.argsort(-value_counts.to_numpy(dtype=np.int64), kind="stable")
+    return value_counts.iloc[order]
+
+
+def _numeric_values(nonnull: pd.Series) -> np.ndarray:
+    """Returns the non-null numeric values as a plain NumPy array."""
+    if pd.api.types.is_bool_dtype(nonnull):
+        # Booleans have no subtraction, so quantiles run on 0.0/1.0
+        return nonnull.to_numpy(dtype="f8")
+    if isinstance(nonnull.dtype, pd.api.extensions.ExtensionDtype):
+        kind = "i8" if pd.api.types.is_integer_dtype(nonnull) else "f8"
+        return nonnull.to_numpy(dtype=kind)
+    values = nonnull.to_numpy()
+    if values.dtype.kind in "iu" and values.dtype.itemsize < 8:
+        # Narrow (e.g. downcast) integers: quartile interpolation subtracts values, which could overflow
+        return values.astype(np.int64)
+    return values
+
+
+def _mean(values: np.ndarray) -> float:
+    """Mean with the same accumulator dtype as pandas' nanmean."""
+    dtype_sum = values.dtype if values.dtype.kind == "f" else np.float64
+    return values.sum(dtype=dtype_sum) / len(values)
+
+
+def _std(values: np.ndarray) -> float:
+    """Sample standard deviation (ddof=1) using pandas' two-pass nanvar."""
+    if values.dtype.kind != "f":
+        values = values.astype("f8")
+    avg = values.sum(dtype=np.float64) / len(values)
+    variance = ((avg - values) ** 2).sum(dtype=np.float64) / (len(values) - 1)
+    return np.sqrt(variance.astype(values.dtype))
+
+
+def _length_stats(nonnull: pd.Series, value_counts: Optional[pd.Series]) -> Dict[str, Any]:
+    """
+    String length stats. When every value is already a str and value counts
+    were taken, lengths are taken once per distinct value and weighted by its count.
+    """
+    if (
+        value_counts is not None
+        and is_text_dtype(nonnull)
+        and pd.api.types.infer_dtype(value_counts.index, skipna=False) == "string"
+    ):
+        lengths = value_counts.index.str.len().to_numpy()
+        counts = value_counts.to_numpy()
+        return {
+            "min_length": int(lengths.min()),
+            "max_length": int(lengths.max()),
+            "mean_length": float((lengths * counts).sum() / counts.sum())
+        }
+
+    lengths = nonnull.astype(str).str.len()
+    return {
+        "min_length": int(lengths.min()),
+        "max_length": int(lengths.max()),
+        "mean_length": float(lengths.mean())
+    }
+
+
+def _datetime_range(timestamps: pd.Series) -> Dict[str, Any]:
+    """Earliest and latest timestamps as ISO 8601 strings."""
+    timestamps = timestamps.dropna()
+    if timestamps.empty:
+        return {}
+    return {"min": timestamps.min().isoformat(), "max": timestamps.max().isoformat()}
+
+
+def _top_values(value_counts: pd.Series, total: int, top_n: int) -> List[Dict[str, Any]]:
+    """Formats the leading value_counts() entries like get_top_values."""
+    if total == 0:
+        return []
+
+    return [
+        {
+            "value": str(val) if pd.notna(val) else "(null)",
+            "count": int(count),
+            "percentage": round((count / total) * 100, 2)
+        }
+        for val, count in value_counts.head(top_n).items()
+    ]
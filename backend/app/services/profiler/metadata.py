@@ -0,0 +1,103 @@
+import pandas as pd
+import pyarrow as pa
+from typing import Dict, Any, List, Optional
+from app.services.profiler.type_inference import infer_column_type_details
+from app.services.profiler.kernel import compute_column_metrics
+from app.services.profiler.patterns import analyze_patterns
+from app.services.profiler.column import build_column_profile
+from app.services.profiler.results import build_results
+from app.utils.semantic_types import detect_semantic_type
+
+
+def _exact_min_max(arrow_type: pa.DataType) -> bool:
+    """
+    Types whose Parquet min/max are exact and read back by pandas unchanged.
+    Floats are excluded because NaN is neither counted as null nor in min/max.
+    """
+    return (
+        pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type)
+        or pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+        or pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type)
+    )
+
+
+def profile_from_statistics(name: str, statistics: Dict[str, Any], total_rows: int) -> Optional[Dict[str, Any]]:
+    """
+    Profiles a column from footer statistics alone when they determine every
+    metric: the column is entirely null, or holds one value in every row.
+    Returns None when the column has to be scanned.
+
+    The analyzers run on at most two copies of the value, which yields the
+    same stats and outliers as the full column; counts come from the footer.
+    """
+    null_count = statistics["null_count"]
+    if null_count == total_rows:
+        count = 0
+    elif null_count == 0 and statistics["min"] == statistics["max"] and _exact_min_max(statistics["type"]):
+        count = total_rows
+    else:
+        return None
+
+    values = pa.array([statistics["min"]] * min(count, 2), type=statistics["type"]).to_pandas()
+    type_details = infer_column_type_details(values)
+    inferred_type = type_details["type"]
+    metrics = compute_column_metrics(values, inferred_type, datetime_format=type_details["datetime_format"])
+
+    value_counts = None
+    if count:
+        value = values.iloc[0]
+        value_counts = pd.Series([count], index=pd.Index([value], dtype=values.dtype))
+        metrics["empty_string_count"] = count if value == "" else 0
+        metrics["top_values"] = [{
+            "value": str(value),
+            "count": count,
+            "percentage": round((count / total_rows) * 100, 2)
+        }]
+    metrics["null_count"] = null_count
+    metrics["null_percentage"] = float((null_count / total_rows) * 100 if total_rows > 0 else 0)
+    metrics["distinct_count"] = 1 if count else 0
+    metrics["is_unique"] = metrics["distinct_count"] == total_rows
+
+    semantic_type = detect_semantic_type(values, value_counts=value_counts) if count else None
+    patterns = analyze_patterns(values, value_counts=value_counts, coarse=True) if count else {}
+    return build_column_profile(name, inferred_type, semantic_type, metrics, patterns, total_rows)
+
+
+def profiles_from_statistics(total_rows: int, statistics: Dict[str, Dict[str, Any]], columns: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Profiles of the `columns` that footer statistics fully describe."""
+    profiles = {}
+    for name in columns:
+        if name in statistics:
+            profile = profile_from_statistics(name, statistics[name], total_rows)
+            if profile is not None:
+                profiles[name] = profile
+    return profiles
+
+
+def statistics_only_results(total_rows: int) -> Dict[str, Any]:
+    """
+    Dataset result before any column is added, for files where every column
+    came from statistics. Each column is null or constant, so all rows are equal.
+    """
+    summary = {
+        "row_count": total_rows,
+        "column_count": 0,
+        "memory_mb": 0.0,
+        "duplicate_rows": max(total_rows - 1, 0)
+    }
+    return build_results(summary, [])
+
+
+def add_column_profiles(results: Dict[str, Any], profiles: Dict[str, Dict[str, Any]], order: List[str]) -> Dict[str, Any]:
+    """
+    Merges column profiles computed without scanning into a profile result,
+    in `order`, and rescores the dataset. Other result keys are kept.
+    """
+    by_name = {col["name"]: col for col in results["columns"]}
+    by_name.update(profiles)
+    summary = dict(results["summary"])
+    summary["column_count"] = len(order)
+    merged = build_results(summary, (by_name[name] for name in order))
+    for key, value in results.items():
+        merged.setdefault(key, value)
+    return merged
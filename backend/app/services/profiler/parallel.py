@@ -0,0 +1,248 @@
+import os
+import atexit
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+from typing import Dict, Any, List, Optional, Tuple, Callable, FrozenSet, Iterator
+from app.services.profiler.column import profile_column
+from app.services.profiler.instrumentation import StageTimer, traced_memory
+from app.services.profiler.analyzers import ALL_ANALYZERS
+
+# Parallel mode is off unless a worker count is configured
+PARALLEL_WORKERS = int(os.getenv("PROFILER_WORKERS", "0"))
+# Datasets smaller than this many cells (rows x columns) stay on the serial path
+PARALLEL_MIN_CELLS = int(os.getenv("PROFILER_PARALLEL_MIN_CELLS", "2000000"))
+
+# Buffers inside the shared block are aligned so NumPy views are aligned too
+_ALIGNMENT = 64
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+# Runs using each pool; a replaced pool is shut down once its last run is done
+_pool_users: Dict[ProcessPoolExecutor, int] = {}
+_pool_lock = threading.Lock()
+
+
+def should_profile_in_parallel(df: pd.DataFrame, workers: int, min_cells: int) -> bool:
+    """
+    Parallel profiling only pays off once the dataset outweighs process dispatch.
+    """
+    return workers > 1 and len(df.columns) > 1 and len(df) * len(df.columns) >= min_cells
+
+
+def profile_columns_parallel(
+    df: pd.DataFrame,
+    total_rows: int,
+    workers: int,
+    timer: Optional[StageTimer] = None,
+    on_column: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    analyzers: FrozenSet[str] = ALL_ANALYZERS
+) -> List[Dict[str, Any]]:
+    """
+    Profiles columns across a process pool.
+    Column buffers are copied once into a shared memory block that workers map
+    directly; only columns that cannot be laid out as flat buffers are pickled.
+    Results are returned in the original column order. Workers time their own
+    stages and the records are added to `timer`. `on_column(position, profile)`
+    is called as each column finishes, in completion order.
+    """
+    timed = timer is not None and timer.enabled
+    trace_memory = timed and timer.trace_memory
+    layouts, buffers, size = _plan_layout(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for offset, data in buffers:
+            shm.buf[offset:offset + len(data)] = data
+        del buffers
+
+        with _borrow_pool(workers) as pool:
+            futures = {
+                pool.submit(_profile_shared_column, shm.name, col_name, layout, total_rows, timed, trace_memory, analyzers): position
+                for position, (col_name, layout) in enumerate(zip(df.columns, layouts))
+            }
+            column_profiles: List[Optional[Dict[str, Any]]] = [None] * len(futures)
+            for future in as_completed(futures):
+                result, records = future.result()
+                column_profiles[futures[future]] = result
+                if timed:
+                    timer.records.extend(records)
+                if on_column is not None:
+                    on_column(futures[future], result)
+        return column_profiles
+    finally:
+        _close_shared(shm)
+        shm.unlink()
+
+
+def _plan_layout(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[Tuple[int, memoryview]], int]:
+    """
+    Describes where each column lives in the shared block.
+    Returns (per-column layouts, (offset, bytes) pairs to copy, total block size).
+    """
+    layouts = []
+    buffers = []
+    size = 0
+
+    def reserve(data) -> int:
+        nonlocal size
+        offset = size
+        view = memoryview(data.view(np.uint8) if isinstance(data, np.ndarray) else data)
+        buffers.append((offset, view))
+        size += -(-view.nbytes // _ALIGNMENT) * _ALIGNMENT
+        return offset
+
+    for col_name in df.columns:
+        series = df[col_name]
+        dtype = series.dtype
+
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            values = np.ascontiguousarray(series.to_numpy())
+            layouts.append({
+                "kind": "numpy",
+                "dtype": dtype.str,
+                "length": len(values),
+                "offset": reserve(values),
+            })
+        elif dtype == 'object' and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            null_mask = series.isna().to_numpy()
+            encoded = [value.encode("utf-8", "surrogatepass") for value in series[~null_mask]]
+            ends = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            layouts.append({
+                "kind": "strings",
+                "length": len(series),
+                "count": len(encoded),
+                "nulls": reserve(null_mask),
+                "ends": reserve(ends),
+                "data": reserve(b"".join(encoded)),
+                "data_size": int(ends[-1]) if len(ends) else 0,
+            })
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # Codes are shared; the (distinct) categories travel with the task
+            layouts.append({
+                "kind": "categorical",
+                "dtype": series.cat.codes.dtype.str,
+                "length": len(series),
+                "offset": reserve(np.ascontiguousarray(series.cat.codes.to_numpy())),
+                "categories": dtype.categories,
+                "ordered": dtype.ordered,
+            })
+        else:
+            # Extension dtypes and mixed-type objects travel with the task
+            layouts.append({"kind": "pickle", "series": series.reset_index(drop=True)})
+
+    return layouts, buffers, size
+
+
+def _read_column(buf: memoryview, layout: Dict[str, Any]) -> pd.Series:
+    """Rebuilds a column from its layout, viewing shared memory where possible."""
+    if layout["kind"] == "numpy":
+        values = np.frombuffer(buf, dtype=np.dtype(layout["dtype"]), count=layout["length"], offset=layout["offset"])
+        return pd.Series(values, copy=False)
+
+    if layout["kind"] == "strings":
+        length, count = layout["length"], layout["count"]
+        null_mask = np.frombuffer(buf, dtype=np.uint8, count=length, offset=layout["nulls"]).astype(bool)
+        ends = np.frombuffer(buf, dtype=np.int64, count=count, offset=layout["ends"])
+        data = bytes(buf[layout["data"]:layout["data"] + layout["data_size"]])
+
+        strings = []
+        start = 0
+        for end in ends.tolist():
+            strings.append(data[start:end].decode("utf-8", "surrogatepass"))
+            start = end
+
+        values = np.full(length, np.nan, dtype=object)
+        values[~null_mask] = strings
+        return pd.Series(values)
+
+    if layout["kind"] == "categorical":
+        codes = np.frombuffer(buf, dtype=np.dtype(layout["dtype"]), count=layout["length"], offset=layout["offset"])
+        return pd.Series(pd.Categorical.from_codes(codes, categories=layout["categories"], ordered=layout["ordered"]))
+
+    return layout["series"]
+
+
+def _profile_shared_column(
+    shm_name: str,
+    col_name: Any,
+    layout: Dict[str, Any],
+    total_rows: int,
+    timed: bool = False,
+    trace_memory: bool = False,
+    analyzers: FrozenSet[str] = ALL_ANALYZERS
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Worker entry point: attaches to the shared block and profiles one column.
+    Returns the profile and the worker's stage timing records.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    timer = StageTimer(trace_memory, enabled=timed)
+    try:
+        series = _read_column(shm.buf, layout)
+        try:
+            with traced_memory(trace_memory):
+                result = profile_column(col_name, series, total_rows, timer, analyzers)
+        finally:
+            # Drop views into the block before closing it
+            del series
+        return result, timer.records
+    finally:
+        _close_shared(shm)
+
+
+def _close_shared(shm: shared_memory.SharedMemory):
+    """
+    Closes a shared block. Views that outlive the run (e.g. held by the frames
+    of a traceback being raised) make close() raise BufferError; the mapping
+    is then released when they are collected, and the original error is kept.
+    """
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+@contextmanager
+def _borrow_pool(workers: int) -> Iterator[ProcessPoolExecutor]:
+    """
+    The shared worker pool, replaced when the worker count changes. A replaced
+    pool keeps running until the runs that borrowed it are done.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            retired = _pool
+            # spawn works the same on Linux and Windows and avoids forking a threaded server
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+            _pool_workers = workers
+            _pool_users[_pool] = 0
+            if retired is not None and _pool_users[retired] == 0:
+                del _pool_users[retired]
+                retired.shutdown(wait=False)
+        pool = _pool
+        _pool_users[pool] += 1
+    try:
+        yield pool
+    finally:
+        with _pool_lock:
+            _pool_users[pool] -= 1
+            if pool is not _pool and _pool_users[pool] == 0:
+                del _pool_users[pool]
+                pool.shutdown(wait=False)
+
+
+def shutdown_pool():
+    """Stops the worker pools (registered to run at interpreter exit)."""
+    global _pool
+    with _pool_lock:
+        pools = list(_pool_users)
+        _pool_users.clear()
+        _pool = None
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_pool)
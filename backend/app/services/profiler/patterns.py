@@ -1,32 +1,98 @@
 import pandas as pd
 import re
-from typing import Dict, Any, List
+import string
+from typing import Dict, Any, List, Mapping, Optional
+from app.services.profiler.type_inference import is_text_dtype
 
-def analyze_patterns(series: pd.Series) -> Dict[str, Any]:
+# One translation table maps every character class in a single C-level pass
+PATTERN_TABLE = str.maketrans(
+    string.ascii_lowercase + string.ascii_uppercase + string.digits,
+    "a" * 26 + "A" * 26 + "9" * 10
+)
+# Coarse level: runs of a character class collapse to one symbol ("AAA-999" -> "A+-9+")
+RUN_PATTERN = re.compile(r'([aA9])\1+')
+
+def to_pattern(s: str) -> str:
+    """
+    Simplifies a string to its pattern (e.g., "abc-123" -> "aaa-999").
+    """
+    return s.translate(PATTERN_TABLE)
+
+def to_coarse_pattern(pattern: str) -> str:
+    """
+    Collapses character-class runs in a pattern (e.g., "aaa-999" -> "a+-9+").
+    """
+    return RUN_PATTERN.sub(r'\1+', pattern)
+
+def analyze_patterns(
+    series: pd.Series,
+    value_counts: Optional[pd.Series] = None,
+    coarse: bool = False
+) -> Dict[str, Any]:
     """
     Analyzes common string patterns in a column.
     Useful for identifying inconsistent formatting.
+    Every distinct value is converted once and weighted by its count, so the
+    shares cover the whole column. Pass the column's non-null `value_counts`
+    to reuse an existing hash pass; `coarse` adds run-collapsed patterns.
     """
-    if series.dtype != 'object':
+    if not is_text_dtype(series):
         return {}
-        
-    sample = series.dropna().astype(str).head(500)
-    if sample.empty:
+
+    if value_counts is None:
+        value_counts = series.value_counts()
+    if value_counts.empty:
+        return {}
+
+    fine = weighted_pattern_counts(value_counts)
+    result = {"top_patterns": _top_patterns(fine, fine.sum())}
+    if coarse:
+        coarse_counts = coarse_pattern_counts(fine)
+        result["top_coarse_patterns"] = _top_patterns(coarse_counts, fine.sum())
+    return result
+
+def weighted_pattern_counts(value_counts: pd.Series) -> pd.Series:
+    """
+    Pattern counts for a value_counts() result, converting each distinct value once.
+    """
+    patterns = value_counts.index.astype(str).str.translate(PATTERN_TABLE)
+    return pd.Series(value_counts.to_numpy(), index=patterns).groupby(level=0, sort=False).sum()
+
+def _top_patterns(pattern_counts: pd.Series, total: int, top_n: int = 5) -> List[Dict[str, Any]]:
+    """The leading patterns with their share of `total`, as plain floats (counts are NumPy integers)."""
+    top = pattern_counts.sort_values(ascending=False, kind="stable").head(top_n)
+    return [
+        {"pattern": p, "percentage": float(round(count / total * 100, 2))}
+        for p, count in top.items()
+    ]
+
+def coarse_pattern_counts(pattern_counts: pd.Series) -> pd.Series:
+    """Collapses weighted_pattern_counts() to coarse patterns, in order of first occurrence."""
+    return pattern_counts.groupby(pattern_counts.index.map(to_coarse_pattern), sort=False).sum()
+
+def summarize_pattern_counts(
+    pattern_counts: Mapping[str, int],
+    total: Optional[int] = None,
+    coarse_counts: Optional[Mapping[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    Builds the analyze_patterns result from accumulated pattern counts.
+    `total` defaults to the sum of the counts; `coarse_counts` adds
+    top_coarse_patterns.
+    """
+    if total is None:
+        total = sum(pattern_counts.values())
+    if total == 0:
         return {}
-        
-    # Simplify strings to patterns (e.g., "abc-123" -> "aaa-999")
-    def to_pattern(s):
-        s = re.sub(r'[a-z]', 'a', s)
-        s = re.sub(r'[A-Z]', 'A', s)
-        s = re.sub(r'[0-9]', '9', s)
-        return s
-        
-    patterns = sample.apply(to_pattern)
-    pattern_counts = patterns.value_counts(normalize=True).head(5)
-    
-    return {
-        "top_patterns": [
-            {"pattern": p, "percentage": round(count * 100, 2)}
-            for p, count in pattern_counts.items()
-        ]
-    }
+
+    result = {"top_patterns": _top_counted(pattern_counts, total)}
+    if coarse_counts is not None:
+        result["top_coarse_patterns"] = _top_counted(coarse_counts, total)
+    return result
+
+def _top_counted(pattern_counts: Mapping[str, int], total: int, top_n: int = 5) -> List[Dict[str, Any]]:
+    top = sorted(pattern_counts.items(), key=lambda item: item[1], reverse=True)[:top_n]
+    return [
+        {"pattern": p, "percentage": float(round(count / total * 100, 2))}
+        for p, count in top
+    ]
@@ -0,0 +1,346 @@
+import logging
+import pandas as pd
+import polars as pl
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from app.services.profiler.type_inference import infer_column_type_details, TYPE_SAMPLE_SIZE
+from app.services.profiler.column import profile_column, build_column_profile
+from app.services.profiler.patterns import analyze_patterns
+from app.services.profiler.results import build_results
+from app.services.profiler.instrumentation import StageTimer, TRACE_MEMORY, traced_memory, finish_timings
+from app.utils.semantic_types import detect_semantic_type
+
+# Columns whose aggregates are computed by one lazy select
+SELECT_BATCH_COLUMNS = 64
+
+logger = logging.getLogger(__name__)
+
+
+def profile_polars(
+    lf: pl.LazyFrame,
+    duplicate_groups: int = 0,
+    timings: bool = False,
+    trace_memory: Optional[bool] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Profiles a Polars LazyFrame and returns results in the same schema as
+    profile_dataset. The scan is collected once on Polars' thread pool; the
+    per-column aggregates (null counts, n_unique, quantiles, min/max, string
+    lengths) are one lazy select per batch of columns, collected together with
+    one value_counts query per column so Polars runs them in parallel.
+    Only small per-column samples and the value counts of text columns are
+    converted to pandas, via Arrow, for type inference, semantic types and
+    patterns. Statistics are always exact. `progress` gets the same events as
+    in profile_dataset, the column ones as each batch of columns finishes.
+    """
+    trace_memory = TRACE_MEMORY if trace_memory is None else trace_memory
+    timer = StageTimer(trace_memory)
+    with traced_memory(trace_memory):
+        with timer.stage("parse"):
+            df = _normalize(lf.collect())
+        total_rows = df.height
+        if progress is not None:
+            progress("start", {"row_count": total_rows, "column_count": df.width})
+
+        with timer.stage("type_inference", rows=total_rows):
+            samples = _samples(df)
+            types = {name: infer_column_type_details(samples[name]) for name in samples}
+
+        column_profiles = []
+        for start in range(0, df.width, SELECT_BATCH_COLUMNS):
+            names = df.columns[start:start + SELECT_BATCH_COLUMNS]
+            batch_profiles = _profile_batch(df, names, samples, types, timer)
+            if progress is not None:
+                for position, profile in enumerate(batch_profiles, start):
+                    progress("column", {"position": position, "column": profile})
+            column_profiles.extend(batch_profiles)
+
+        with timer.stage("duplicates", rows=total_rows):
+            duplicates = _find_duplicate_rows(df, duplicate_groups)
+
+    summary = {
+        "row_count": total_rows,
+        "column_count": df.width,
+        "memory_mb": float(df.estimated_size() / (1024 * 1024)),
+        "duplicate_rows": duplicates["duplicate_rows"]
+    }
+    if duplicate_groups:
+        summary["duplicate_groups"] = duplicates["top_groups"]
+    return finish_timings(timer, build_results(summary, column_profiles), attach=timings)
+
+
+def _normalize(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Aligns Polars semantics with the pandas engine: NaN counts as null and
+    categoricals are profiled as text.
+    """
+    casts = []
+    for name, dtype in df.schema.items():
+        if dtype.is_float():
+            casts.append(pl.col(name).fill_nan(None))
+        elif isinstance(dtype, (pl.Categorical, pl.Enum)):
+            casts.append(pl.col(name).cast(pl.String))
+    return df.with_columns(casts) if casts else df
+
+
+def _is_supported(dtype: pl.DataType) -> bool:
+    """Dtypes profiled with Polars expressions; the rest go through pandas."""
+    return dtype.is_numeric() or dtype == pl.Boolean or dtype == pl.String or dtype in (pl.Date, pl.Datetime)
+
+
+def _samples(df: pl.DataFrame) -> Dict[str, pd.Series]:
+    """First TYPE_SAMPLE_SIZE non-null values of each supported column, as pandas."""
+    names = [name for name, dtype in df.schema.items() if _is_supported(dtype)]
+    if not names:
+        return {}
+    heads = df.select(pl.col(name).drop_nulls().head(TYPE_SAMPLE_SIZE).implode() for name in names)
+    return {name: heads[name][0].to_pandas() for name in names}
+
+
+def _profile_batch(
+    df: pl.DataFrame,
+    names: List[str],
+    samples: Dict[str, pd.Series],
+    types: Dict[str, Dict[str, Any]],
+    timer: StageTimer
+) -> List[Dict[str, Any]]:
+    total_rows = df.height
+    batch = [name for name in names if name in samples]
+    exprs = [expr for i, name in enumerate(batch) for expr in _column_exprs(df.schema[name], name, i, types[name])]
+    aggregates = pl.DataFrame()
+    counts: List[pl.DataFrame] = []
+    if exprs:
+        with timer.stage("aggregates", rows=total_rows * len(batch)):
+            queries = [df.lazy().select(exprs)] + [_value_counts_query(df, name) for name in batch]
+            try:
+                aggregates, *counts = pl.collect_all(queries)
+                aggregates = _add_outlier_counts(df, aggregates, batch, types)
+            except pl.exceptions.PolarsError as e:
+                # e.g. a datetime format Polars cannot apply; pandas handles the batch instead
+                logger.warning("Polars aggregates failed, profiling batch with pandas: %s", e)
+                batch = []
+
+    profiles = []
+    for name in names:
+        if name not in batch:
+            profiles.append(profile_column(name, df[name].to_pandas(), total_rows, timer))
+            continue
+        i = batch.index(name)
+        metrics = _column_metrics(aggregates, counts[i], i, df.schema[name], types[name]["type"], total_rows)
+        profiles.append(_finish_column(name, samples[name], metrics, types[name]["type"], total_rows, timer))
+    return profiles
+
+
+def _column_exprs(dtype: pl.DataType, name: str, i: int, type_details: Dict[str, Any]) -> List[pl.Expr]:
+    """Aggregate expressions for one column, aliased "<position>:<metric>"."""
+    col = pl.col(name)
+    inferred_type = type_details["type"]
+    exprs = [col.null_count().alias(f"{i}:null_count")]
+
+    values = _numeric_values(col, dtype, inferred_type)
+    if values is not None:
+        exprs += [
+            values.count().alias(f"{i}:n"),
+            # One selection pass for all three; the 0.5 quantile is the median
+            values.quantile([0.25, 0.5, 0.75], "linear").alias(f"{i}:quartiles"),
+        ]
+        if inferred_type in ["integer", "float"]:
+            exprs += [
+                values.min().alias(f"{i}:min"),
+                values.max().alias(f"{i}:max"),
+                values.mean().alias(f"{i}:mean"),
+                values.std().alias(f"{i}:std"),
+            ]
+    elif inferred_type == "string" and dtype == pl.String:
+        lengths = col.str.len_chars()
+        exprs += [
+            lengths.min().alias(f"{i}:min_length"),
+            lengths.max().alias(f"{i}:max_length"),
+            lengths.mean().alias(f"{i}:mean_length"),
+        ]
+    elif inferred_type == "datetime":
+        timestamps = _datetime_values(col, dtype, type_details["datetime_format"])
+        exprs += [timestamps.min().alias(f"{i}:min"), timestamps.max().alias(f"{i}:max")]
+
+    if dtype == pl.String:
+        exprs.append((col == "").sum().alias(f"{i}:empty_string_count"))
+    return exprs
+
+
+def _add_outlier_counts(
+    df: pl.DataFrame,
+    aggregates: pl.DataFrame,
+    batch: List[str],
+    types: Dict[str, Dict[str, Any]]
+) -> pl.DataFrame:
+    """
+    Counts values outside the IQR fences in a second select. The fences are
+    literals by then, so the quartiles are not recomputed per comparison.
+    """
+    exprs = []
+    for i, name in enumerate(batch):
+        bounds = _outlier_bounds(aggregates, i)
+        if bounds is not None:
+            values = _numeric_values(pl.col(name), df.schema[name], types[name]["type"])
+            exprs.append(((values < bounds[0]) | (values > bounds[1])).sum().alias(f"{i}:outlier_count"))
+    if not exprs:
+        return aggregates
+    return aggregates.hstack(df.lazy().select(exprs).collect())
+
+
+def _outlier_bounds(aggregates: pl.DataFrame, i: int) -> Optional[Tuple[float, float]]:
+    """IQR * 1.5 fences, computed as the pandas kernel does, or None without numbers."""
+    alias = f"{i}:quartiles"
+    if alias not in aggregates.columns or not aggregates[f"{i}:n"][0]:
+        return None
+    q1, _, q3 = aggregates[alias][0].to_list()
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def _value_counts_query(df: pl.DataFrame, name: str) -> pl.LazyFrame:
+    """Non-null value counts as "value" / "count" columns; their length is the distinct count."""
+    counts = pl.col(name).drop_nulls().alias("value").value_counts(name="count")
+    return df.lazy().select(counts).unnest("value")
+
+
+def _numeric_values(col: pl.Expr, dtype: pl.DataType, inferred_type: str) -> Optional[pl.Expr]:
+    """Numbers the pandas kernel runs stats and outliers on (booleans as 0/1, numeric text parsed)."""
+    if dtype == pl.Boolean:
+        return col.cast(pl.Float64)
+    if dtype.is_numeric():
+        return col
+    if dtype == pl.String and inferred_type in ["integer", "float"]:
+        return col.str.strip_chars().cast(pl.Float64, strict=False)
+    return None
+
+
+def _datetime_values(col: pl.Expr, dtype: pl.DataType, datetime_format: Optional[str]) -> pl.Expr:
+    if dtype != pl.String:
+        return col
+    text = col.str.strip_chars()
+    if datetime_format in (None, "ISO8601"):
+        return text.str.to_datetime(strict=False)
+    return text.str.to_datetime(datetime_format, strict=False)
+
+
+def _column_metrics(
+    aggregates: pl.DataFrame,
+    value_counts: pl.DataFrame,
+    i: int,
+    dtype: pl.DataType,
+    inferred_type: str,
+    total_rows: int
+) -> Dict[str, Any]:
+    """Turns one column's aggregates into compute_column_metrics' output."""
+    def get(metric: str) -> Any:
+        alias = f"{i}:{metric}"
+        return aggregates[alias][0] if alias in aggregates.columns else None
+
+    null_count = int(get("null_count"))
+    distinct_count = value_counts.height
+
+    stats: Dict[str, Any] = {}
+    outliers: Dict[str, Any] = {"count": 0, "threshold": "N/A"}
+    bounds = _outlier_bounds(aggregates, i)
+    if bounds is not None:
+        if inferred_type in ["integer", "float"]:
+            stats = {
+                "min": float(get("min")),
+                "max": float(get("max")),
+                "mean": float(get("mean")),
+                "median": float(get("quartiles")[1]),
+                "std": float(get("std")) if get("n") > 1 else 0
+            }
+        outliers = {
+            "count": int(get("outlier_count")),
+            "lower_bound": float(bounds[0]),
+            "upper_bound": float(bounds[1]),
+            "threshold": "IQR * 1.5"
+        }
+    elif get("min_length") is not None:
+        stats = {
+            "min_length": int(get("min_length")),
+            "max_length": int(get("max_length")),
+            "mean_length": float(get("mean_length"))
+        }
+    elif inferred_type == "datetime" and get("min") is not None:
+        stats = {"min": pd.Timestamp(get("min")).isoformat(), "max": pd.Timestamp(get("max")).isoformat()}
+
+    return {
+        "null_count": null_count,
+        "null_percentage": float((null_count / total_rows) * 100 if total_rows > 0 else 0),
+        "empty_string_count": int(get("empty_string_count") or 0),
+        "distinct_count": distinct_count,
+        "is_unique": distinct_count == total_rows,
+        "stats": stats,
+        "outliers": outliers,
+        "top_values": _top_values(value_counts, total_rows),
+        "value_counts": value_counts if dtype == pl.String else None,
+    }
+
+
+def _top_values(value_counts: pl.DataFrame, total: int, top_n: int = 10) -> List[Dict[str, Any]]:
+    """Most frequent values; ties are ordered by value so the result is deterministic."""
+    if total == 0:
+        return []
+    top = value_counts.top_k(top_n, by=["count", "value"], reverse=[False, True])
+    top = top.sort(["count", "value"], descending=[True, False])
+    return [
+        {
+            "value": str(val),
+            "count": int(count),
+            "percentage": round((count / total) * 100, 2)
+        }
+        for val, count in top.iter_rows()
+    ]
+
+
+def _finish_column(
+    name: str,
+    sample: pd.Series,
+    metrics: Dict[str, Any],
+    inferred_type: str,
+    total_rows: int,
+    timer: StageTimer
+) -> Dict[str, Any]:
+    """Semantic type and patterns from the text value counts, then scoring."""
+    timer = timer.for_column(name)
+    value_counts = None
+    if metrics["value_counts"] is not None:
+        frame = metrics["value_counts"]
+        value_counts = pd.Series(frame["count"].to_numpy(), index=pd.Index(frame["value"].to_pandas(), dtype=object))
+    with timer.stage("semantic_detection", rows=len(sample)):
+        semantic_type = detect_semantic_type(sample, value_counts=value_counts) if value_counts is not None else None
+    with timer.stage("patterns", rows=len(sample)):
+        patterns = analyze_patterns(sample, value_counts=value_counts, coarse=True) if value_counts is not None else {}
+    return build_column_profile(name, inferred_type, semantic_type, metrics, patterns, total_rows)
+
+
+def _find_duplicate_rows(df: pl.DataFrame, top_groups: int = 0) -> Dict[str, Any]:
+    """Same output as duplicates.find_duplicate_rows, computed with Polars."""
+    result: Dict[str, Any] = {"duplicate_rows": 0}
+    if top_groups:
+        result["top_groups"] = []
+    if df.height < 2 or df.width == 0:
+        return result
+
+    result["duplicate_rows"] = df.height - df.n_unique()
+    if top_groups and result["duplicate_rows"]:
+        groups = (
+            df.with_row_index("__row")
+            .group_by(df.columns)
+            .agg(pl.len().alias("__count"), pl.col("__row").head(5).alias("__rows"))
+            .filter(pl.col("__count") > 1)
+            .sort(["__count", pl.col("__rows").list.first()], descending=[True, False])
+            .head(top_groups)
+        )
+        result["top_groups"] = [
+            {
+                "row": {str(col): (str(group[col]) if group[col] is not None else None) for col in df.columns},
+                "count": int(group["__count"]),
+                "row_positions": list(group["__rows"]),
+            }
+            for group in groups.iter_rows(named=True)
+        ]
+    return result
@@ -0,0 +1,39 @@
+from app.utils.scoring import calculate_overall_score
+from typing import Dict, Any, Iterable
+
+def build_results(summary: Dict[str, Any], column_profiles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregates column profiles into the dataset result and scores it.
+    `summary` must already hold row_count and duplicate_rows. When a column
+    is unscored or duplicate_rows is None (analyzers were skipped), so is the
+    dataset: quality_score and quality_grade are None.
+    """
+    results = {
+        "summary": summary,
+        "columns": [],
+        "issues_summary": {"critical": 0, "warning": 0, "info": 0}
+    }
+
+    col_scores = []
+    
+    for col_profile in column_profiles:
+        col_scores.append(col_profile["quality_score"])
+        
+        # Update issues summary
+        for issue in col_profile["issues"]:
+            results["issues_summary"][issue["severity"]] += 1
+        
+        results["columns"].append(col_profile)
+        
+    # Final overall score
+    if None in col_scores or summary["duplicate_rows"] is None:
+        overall_score, quality_grade = None, None
+    else:
+        overall_score, quality_grade = calculate_overall_score(
+            col_scores, summary["duplicate_rows"], summary["row_count"]
+        )
+    results["summary"]["quality_score"] = overall_score
+    results["summary"]["quality_grade"] = quality_grade
+    
+    return results
+
@@ -0,0 +1,308 @@
+"""
+Uniform row samples of arbitrarily long inputs, for profiling huge files in
+bounded time and memory.
+
+Every row gets a random key and the sample is the rows with the smallest
+keys (a bottom-k reservoir): one pass over the chunks, holding at most the
+sample, and rows whose key cannot enter a full reservoir are skipped without
+being copied. A stratified sample keeps a reservoir per value of one column
+and allocates the final sample proportionally to each stratum's row count,
+so it stays self-weighting.
+
+The sample size comes from a target margin of error for proportions (null
+rates, outlier and pattern shares) at a confidence level, using the worst
+case p = 0.5. Intervals are Wilson score intervals with the finite
+population correction, so they shrink to the point estimate when the sample
+holds every row.
+"""
+import copy
+import math
+import os
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Callable, FrozenSet
+from app.services.profiler.engine import profile_dataset
+from app.services.profiler.analyzers import ALL_ANALYZERS
+
+# Target margin of error for sampled proportions (0.01 = +/- 1 percentage point)
+SAMPLE_MARGIN = float(os.getenv("PROFILER_SAMPLE_MARGIN", "0.01"))
+# Confidence level of the margin and of the reported intervals
+SAMPLE_CONFIDENCE = float(os.getenv("PROFILER_SAMPLE_CONFIDENCE", "0.95"))
+# Seed for the row keys, so the same file and settings give the same sample
+SAMPLE_SEED = int(os.getenv("PROFILER_SAMPLE_SEED", "0"))
+
+# Most strata a stratified sample keeps reservoirs for
+MAX_STRATA = 100
+
+# Label of the stratum holding rows whose stratify value is null
+_NULL_STRATUM = "<null>"
+
+
+def z_score(confidence: float) -> float:
+    """Two-sided standard normal quantile, e.g. 1.96 for 0.95."""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def sample_size_for_margin(margin: float, confidence: float = SAMPLE_CONFIDENCE) -> int:
+    """
+    Rows needed so any proportion is within `margin` at `confidence`
+    (9604 rows for 1% at 95%). The population size is not known until the
+    input has been read, so no finite population correction is applied.
+    """
+    if not 0 < margin < 1:
+        raise ValueError("Sample margin must be between 0 and 1")
+    return math.ceil((z_score(confidence) / (2 * margin)) ** 2)
+
+
+def proportion_interval(successes: float, n: int, population: int, confidence: float = SAMPLE_CONFIDENCE) -> Tuple[float, float]:
+    """
+    Wilson score interval for a proportion seen `successes` times in `n`
+    sampled rows out of `population`, with the finite population correction.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    fpc = (population - n) / (population - 1) if population > n else 0.0
+    z2 = z_score(confidence) ** 2 * fpc
+    denominator = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denominator
+    half = math.sqrt(z2 * p * (1 - p) / n + z2 * z2 / (4 * n * n)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class ReservoirSampler:
+    """
+    Bottom-k sample of the rows of a chunk stream, optionally stratified by
+    one column. Feed chunks to update(); sample() returns the rows.
+    """
+
+    def __init__(self, size: int, stratify: Optional[str] = None, seed: int = SAMPLE_SEED):
+        self.size = size
+        self.stratify = stratify
+        self.rows_seen = 0
+        self.strata_rows: Dict[str, int] = {}
+        self._rng = np.random.default_rng(seed)
+        self._rows: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+        self._positions = np.empty(0, dtype=np.int64)
+        self._labels = np.empty(0, dtype=object)
+
+    def update(self, chunk: pd.DataFrame):
+        keys = self._rng.random(len(chunk))
+        positions = np.arange(self.rows_seen, self.rows_seen + len(chunk))
+        self.rows_seen += len(chunk)
+        labels = self._stratum_labels(chunk)
+
+        # Rows keyed above a full reservoir's largest key can never enter it
+        selected = np.flatnonzero(keys < self._thresholds(labels))
+        rows = chunk.iloc[selected]
+        if self._rows is not None:
+            rows = pd.concat([self._rows, rows], ignore_index=True)
+        self._rows = rows.reset_index(drop=True)
+        self._keys = np.concatenate([self._keys, keys[selected]])
+        self._positions = np.concatenate([self._positions, positions[selected]])
+        self._labels = np.concatenate([self._labels, labels[selected]])
+        self._keep(self._bottom(self._keys, self._labels, lambda label: self.size))
+
+    def sample(self) -> pd.DataFrame:
+        """
+        The sampled rows. A sample of every row keeps the input order and is
+        the input itself; otherwise rows are in random (key) order, so the
+        first values of any column are a random sample too.
+        """
+        if self._rows is None:
+            return pd.DataFrame()
+        if self.stratify is not None:
+            allocation = self.allocation()
+            self._keep(self._bottom(self._keys, self._labels, lambda label: allocation[label]))
+        order = np.argsort(self._positions if self.complete else self._keys, kind="stable")
+        return self._rows.take(order).reset_index(drop=True)
+
+    @property
+    def complete(self) -> bool:
+        return len(self._keys) == self.rows_seen
+
+    def allocation(self) -> Dict[str, int]:
+        """
+        Sample rows per stratum, proportional to the rows seen in each and
+        rounded by largest remainder so they add up to the sample size.
+        """
+        target = min(self.size, self.rows_seen)
+        shares = {label: target * rows / self.rows_seen for label, rows in self.strata_rows.items()}
+        allocation = {label: math.floor(share) for label, share in shares.items()}
+        by_remainder = sorted(shares, key=lambda label: shares[label] - allocation[label], reverse=True)
+        for label in by_remainder[:target - sum(allocation.values())]:
+            allocation[label] += 1
+        return allocation
+
+    def _stratum_labels(self, chunk: pd.DataFrame) -> np.ndarray:
+        if self.stratify is None:
+            return np.full(len(chunk), None, dtype=object)
+        if self.stratify not in chunk.columns:
+            raise ValueError(f"Unknown stratify column: {self.stratify}")
+        values = chunk[self.stratify]
+        labels = values.astype(str).where(values.notna(), _NULL_STRATUM).to_numpy(dtype=object)
+        for label, rows in pd.Series(labels).value_counts(sort=False).items():
+            self.strata_rows[label] = self.strata_rows.get(label, 0) + int(rows)
+        if len(self.strata_rows) > MAX_STRATA:
+            raise ValueError(f"Cannot stratify by {self.stratify!r}: more than {MAX_STRATA} distinct values")
+        return labels
+
+    def _thresholds(self, labels: np.ndarray) -> np.ndarray:
+        """Per row, the largest key its (full) reservoir holds, else infinity."""
+        if self.stratify is None:
+            full = len(self._keys) >= self.size
+            return np.full(len(labels), self._keys.max() if full else np.inf)
+        kept = pd.Series(self._keys).groupby(self._labels)
+        largest = kept.max()[kept.size() >= self.size]
+        return pd.Series(labels).map(largest).fillna(np.inf).to_numpy()
+
+    def _bottom(self, keys: np.ndarray, labels: np.ndarray, quota: Any) -> np.ndarray:
+        """Positions of the rows with the smallest keys, up to quota(label) per stratum."""
+        if self.stratify is None:
+            if len(keys) <= self.size:
+                return np.arange(len(keys))
+            return np.argpartition(keys, self.size - 1)[:self.size]
+        ranks = pd.Series(keys).groupby(labels).rank(method="first").to_numpy()
+        limits = np.array([quota(label) for label in labels], dtype=np.int64)
+        return np.flatnonzero(ranks <= limits)
+
+    def _keep(self, positions: np.ndarray):
+        if len(positions) == len(self._keys):
+            return
+        positions = np.sort(positions)
+        self._rows = self._rows.take(positions).reset_index(drop=True)
+        self._keys = self._keys[positions]
+        self._positions = self._positions[positions]
+        self._labels = self._labels[positions]
+
+
+def sample_conflicts(
+    approximate: bool, duplicate_groups: int, selected: FrozenSet[str], preview: bool = False, engine: Optional[str] = None
+) -> List[str]:
+    """The options a sampled profile would otherwise ignore."""
+    used = [
+        ("approximate", approximate),
+        ("duplicate_groups", duplicate_groups > 0),
+        ("engine", engine == "polars"),
+        ("analyzers", selected != ALL_ANALYZERS),
+        ("quick_first", preview),
+    ]
+    return [name for name, is_used in used if is_used]
+
+
+def profile_sample(
+    chunks: Iterable[pd.DataFrame],
+    margin: float = SAMPLE_MARGIN,
+    confidence: float = SAMPLE_CONFIDENCE,
+    stratify: Optional[str] = None,
+    seed: int = SAMPLE_SEED,
+    timings: bool = False,
+    compact: bool = False,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Profiles a uniform (or stratified) sample of the rows in `chunks`, sized
+    for `margin` at `confidence`. Reading the chunks is the only full pass.
+    Null, outlier and top-value counts are scaled to the full row count, and
+    null rates, outlier counts and pattern shares get confidence intervals.
+    Distinct counts, uniqueness, stats and the quality score describe the
+    sample. So does the duplicate row count, which is reported as
+    "sample_duplicate_rows" (see add_sample_estimates).
+    The result records how it was sampled under "sample". `progress` gets the
+    events of profiling the sample, with estimates for the full row count.
+    """
+    sampler = ReservoirSampler(sample_size_for_margin(margin, confidence), stratify, seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    sample = sampler.sample()
+
+    if progress is not None:
+        progress = _estimating_progress(progress, len(sample), sampler.rows_seen, confidence)
+    results = profile_dataset(sample, timings=timings, compact=compact, progress=progress)
+    add_sample_estimates(results, sampler.rows_seen, confidence)
+    results["sample"] = {
+        "method": "stratified" if stratify is not None else "reservoir",
+        "stratify_by": stratify,
+        "population_rows": sampler.rows_seen,
+        "sample_rows": len(sample),
+        "complete": sampler.complete,
+        "margin": margin,
+        "confidence": confidence,
+        "seed": seed,
+    }
+    if stratify is not None:
+        allocation = sampler.allocation()
+        results["sample"]["strata"] = [
+            {"value": label, "population_rows": rows, "sample_rows": allocation[label]}
+            for label, rows in sorted(sampler.strata_rows.items(), key=lambda item: item[1], reverse=True)
+        ]
+    return results
+
+
+def add_sample_estimates(results: Dict[str, Any], population: int, confidence: float = SAMPLE_CONFIDENCE) -> Dict[str, Any]:
+    """
+    Turns the profile of a sample into estimates for a population of
+    `population` rows: scales counts and adds intervals under each column's
+    "confidence_intervals" (null_percentage in percent, outlier_count in rows)
+    and to each top pattern ("interval", in percent). Duplicate rows do not
+    scale: a row repeated in the population is often alone in the sample. So
+    unless the sample holds every row, summary "duplicate_rows" is None and
+    the sample's own count moves to "sample_duplicate_rows".
+    """
+    summary = results["summary"]
+    n = summary["row_count"]
+    summary["row_count"] = population
+    if n < population:
+        summary["sample_duplicate_rows"], summary["duplicate_rows"] = summary["duplicate_rows"], None
+    for column in results["columns"]:
+        estimate_column(column, n, population, confidence)
+    return results
+
+
+def estimate_column(column: Dict[str, Any], n: int, population: int, confidence: float = SAMPLE_CONFIDENCE) -> Dict[str, Any]:
+    """add_sample_estimates for one column profile of an `n`-row sample."""
+    scale = population / n if n else 0
+    nulls = column["null_count"]
+    nonnull = n - nulls
+    column["null_count"] = round(nulls * scale)
+    low, high = proportion_interval(nulls, n, population, confidence)
+    intervals = {"null_percentage": [round(low * 100, 2), round(high * 100, 2)]}
+
+    outliers = column["outliers"]
+    if "lower_bound" in outliers:
+        low, high = proportion_interval(outliers["count"], n, population, confidence)
+        outliers["count"] = round(outliers["count"] * scale)
+        intervals["outlier_count"] = [round(low * population), round(high * population)]
+
+    for value in column["top_values"]:
+        value["count"] = round(value["count"] * scale)
+    for key in ("top_patterns", "top_coarse_patterns"):
+        _add_pattern_intervals(column["patterns"].get(key, []), nonnull, round(nonnull * scale), confidence)
+    column["confidence_intervals"] = intervals
+    return column
+
+
+def _estimating_progress(
+    progress: Callable[[str, Dict[str, Any]], None], n: int, population: int, confidence: float
+) -> Callable[[str, Dict[str, Any]], None]:
+    """
+    Passes on the progress of profiling an `n`-row sample with estimates for
+    `population` rows. Columns are estimated on a copy, as the profile itself
+    is estimated again with the rest of the results.
+    """
+    def report(event: str, data: Dict[str, Any]):
+        if event == "start":
+            data = {**data, "row_count": population, "sample_rows": n}
+        elif event == "column":
+            data = {**data, "column": estimate_column(copy.deepcopy(data["column"]), n, population, confidence)}
+        progress(event, data)
+
+    return report
+
+
+def _add_pattern_intervals(patterns: List[Dict[str, Any]], n: int, population: int, confidence: float):
+    for pattern in patterns:
+        low, high = proportion_interval(pattern["percentage"] / 100 * n, n, population, confidence)
+        pattern["interval"] = [round(low * 100, 2), round(high * 100, 2)]
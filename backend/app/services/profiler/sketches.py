@@ -0,0 +1,274 @@
+"""
+Fixed-size, mergeable sketches for approximate profiling.
+
+Error bounds at the default sizes:
+- HyperLogLog (p=14, 16KB): distinct count relative standard error 1.04 / sqrt(2^14) ~= 0.81%.
+- KLL quantiles (k=200): rank error of about 1.7% of n at 99% confidence, so the
+  median and IQR bounds are values whose true rank is within that of the target.
+- Misra-Gries top-k (1000 counters): each count is under-estimated by at most
+  n / 1001 (reported as `error_bound`); any value above that frequency is kept.
+
+Every sketch serialises to a JSON-compatible dict (to_dict / from_dict) and
+merges with a sketch of the same size, so chunk and worker results combine.
+"""
+import base64
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Iterable, Tuple
+
+
+SKETCH_ERROR_BOUNDS = {
+    "distinct_count": "HyperLogLog p=14, ~0.81% relative standard error",
+    "stats.median": "KLL k=200, ~1.7% rank error (99% confidence)",
+    "outliers": "IQR bounds from KLL k=200 quantiles; count estimated from sketch ranks",
+    "top_values": "Misra-Gries 1000 counters, counts under-estimated by at most n/1001",
+}
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """
+    64-bit hashes of values. Numbers hash as float64 so chunks parsed as int
+    and float agree.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "biuf":
+        values = values.astype("f8")
+    elif values.dtype.kind != "O":
+        values = values.astype(object)
+    return pd.util.hash_array(values, categorize=False)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2^p one-byte registers."""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest > 0
+        bit_length[nonzero] = np.floor(np.log2(rest[nonzero].astype("f8"))).astype(np.int64) + 1
+        rank = (64 - self.p) - bit_length + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def add(self, values: Any):
+        self.add_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate at small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch. Level h holds items of weight 2^h; a full level is
+    sorted and every other item (random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: Any):
+        values = np.asarray(values, dtype="f8")
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def update_counts(self, values: Any, counts: Any):
+        """
+        Adds each value `counts` times without repeating it: a count is split
+        into powers of two and the value is placed once at each matching level.
+        """
+        values = np.asarray(values, dtype="f8")
+        counts = np.asarray(counts, dtype=np.int64)
+        self.n += int(counts.sum())
+        level = 0
+        while counts.any():
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values[(counts & 1) == 1]])
+            counts = counts >> 1
+            level += 1
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        if other.k != self.k:
+            raise ValueError("Cannot merge KLL sketches with different k")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so total weight is preserved
+                leftover, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+                offset = int(self._rng.integers(2))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+                self.levels[level] = leftover
+            level += 1
+
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 1 << level, dtype=np.int64) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return float("nan")
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(cumulative, q * (self.n - 1), side="right")
+        return float(items[min(index, len(items) - 1)])
+
+    def count_below(self, value: float) -> int:
+        """Estimated number of items strictly less than value."""
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(items, value, side="left")
+        return int(cumulative[index - 1]) if index > 0 else 0
+
+    def count_above(self, value: float) -> int:
+        """Estimated number of items strictly greater than value."""
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(items, value, side="right")
+        return int(self.n - (cumulative[index - 1] if index > 0 else 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "levels": [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.levels = [np.asarray(items, dtype="f8") for items in data["levels"]]
+        return sketch
+
+
+class MisraGries:
+    """
+    Misra-Gries heavy hitters with a fixed number of counters.
+    Estimates never exceed the true count and fall short by at most `error_bound`.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counters: Dict[Any, int] = {}
+        self.total = 0
+        self.error_bound = 0
+
+    def update_counts(self, items: Iterable[Tuple[Any, int]]):
+        """Adds (value, count) pairs, e.g. from a chunk's value_counts()."""
+        for key, count in items:
+            self.counters[key] = self.counters.get(key, 0) + count
+            self.total += count
+        self._prune()
+
+    def update_value_counts(self, value_counts: pd.Series):
+        """
+        Adds a pandas value_counts() result. Large inputs are summarised to
+        `capacity` counters with vectorised ops before touching the dict.
+        """
+        if len(value_counts) > self.capacity:
+            counts = value_counts.to_numpy()
+            cut = int(np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1])
+            self.total += int(counts.sum())
+            self.error_bound += cut
+            kept = value_counts[value_counts > cut] - cut
+            for key, count in zip(kept.index, kept.tolist()):
+                self.counters[key] = self.counters.get(key, 0) + count
+            self._prune()
+        else:
+            self.update_counts(zip(value_counts.index, value_counts.tolist()))
+
+    def merge(self, other: "MisraGries"):
+        for key, count in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + count
+        self.total += other.total
+        self.error_bound += other.error_bound
+        self._prune()
+
+    def _prune(self):
+        if len(self.counters) <= self.capacity:
+            return
+        counts = np.fromiter(self.counters.values(), dtype=np.int64, count=len(self.counters))
+        # Subtract the (capacity + 1)-th largest count from every counter
+        cut = int(np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1])
+        self.error_bound += cut
+        self.counters = {key: count - cut for key, count in self.counters.items() if count > cut}
+
+    def top(self, n: int) -> List[Tuple[Any, int]]:
+        """The `n` largest counters; ties in the order their values were first counted."""
+        return sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "error_bound": self.error_bound,
+            "items": [[_jsonable(key), count] for key, count in self.counters.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MisraGries":
+        sketch = cls(data["capacity"])
+        sketch.total = data["total"]
+        sketch.error_bound = data["error_bound"]
+        sketch.counters = {key: count for key, count in data["items"]}
+        return sketch
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
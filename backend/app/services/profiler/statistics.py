@@ -1,14 +1,18 @@
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.services.profiler.type_inference import to_datetime_values, to_numeric_values
 
-def calculate_basic_stats(series: pd.Series, inferred_type: str) -> Dict[str, Any]:
+def calculate_basic_stats(series: pd.Series, inferred_type: str, datetime_format: Optional[str] = None) -> Dict[str, Any]:
     """
     Calculates basic stats based on the inferred type.
+    `datetime_format` is the format resolved by type inference for datetime strings.
     """
     stats = {}
 
     if inferred_type in ["integer", "float"]:
         numeric_series = series.dropna()
+        if not pd.api.types.is_numeric_dtype(numeric_series):
+            numeric_series = to_numeric_values(numeric_series)
         if not numeric_series.empty:
             stats = {
                 "min": float(numeric_series.min()),
@@ -26,6 +30,13 @@ def calculate_basic_stats(series: pd.Series, inferred_type: str) -> Dict[str, An
                 "max_length": int(lengths.max()),
                 "mean_length": float(lengths.mean())
             }
+    elif inferred_type == "datetime":
+        timestamps = to_datetime_values(series.dropna(), datetime_format).dropna()
+        if not timestamps.empty:
+            stats = {
+                "min": timestamps.min().isoformat(),
+                "max": timestamps.max().isoformat()
+            }
 
     return stats
 
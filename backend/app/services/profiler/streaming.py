@@ -0,0 +1,86 @@
+import pandas as pd
+from typing import Dict, Any, Iterable, Iterator, Optional, Callable, FrozenSet, List
+from app.services.profiler.accumulators import DatasetAccumulator
+from app.services.profiler.analyzers import ALL_ANALYZERS
+from app.services.profiler.duplicates import row_hashes
+from app.services.profiler.incremental import ChunkCache, chunk_fingerprint
+from app.services.profiler.instrumentation import StageTimer, TRACE_MEMORY, traced_memory, finish_timings
+
+
+def chunked_conflicts(duplicate_groups: int, compact: bool, selected: FrozenSet[str], preview: bool = False) -> List[str]:
+    """The options a chunked profile would otherwise ignore."""
+    used = [
+        ("duplicate_groups", duplicate_groups > 0),
+        ("compact", compact),
+        ("analyzers", selected != ALL_ANALYZERS),
+        ("quick_first", preview),
+    ]
+    return [name for name, is_used in used if is_used]
+
+
+def profile_chunks(
+    chunks: Iterable[pd.DataFrame],
+    approximate: bool = False,
+    timings: bool = False,
+    trace_memory: Optional[bool] = None,
+    chunk_cache: Optional[ChunkCache] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    csv_text: bool = False
+) -> Dict[str, Any]:
+    """
+    Profiles a dataset delivered as consecutive row chunks.
+    Returns results in the same schema as profile_dataset. With approximate=True,
+    per-column memory is fixed by sketch sizes instead of column cardinality.
+    Timings cover reading each chunk, folding it in and the final pass.
+    duplicate_rows counts repeated row hashes without an exact check, so it is
+    an estimate (see DatasetAccumulator.duplicate_rows).
+
+    With a `chunk_cache`, chunks already profiled by an earlier job (e.g. the
+    unchanged prefix of an appended file) are merged from the cache instead of
+    being profiled again; the result is identical either way.
+    `progress` gets column events as in profile_dataset once the last chunk
+    has been read. Pass csv_text=True for chunks of CSV cells read as text
+    (parse_file_chunks(csv_text=True)); columns are then typed once for the
+    whole file, as pd.read_csv types them, instead of chunk by chunk.
+    """
+    trace_memory = TRACE_MEMORY if trace_memory is None else trace_memory
+    timer = StageTimer(trace_memory)
+    accumulator = DatasetAccumulator(approximate, csv_text)
+    chunks_total = chunks_reused = 0
+
+    with traced_memory(trace_memory):
+        iterator = iter(chunks)
+        while True:
+            with timer.stage("read_chunk"):
+                chunk = next(iterator, None)
+            if chunk is None:
+                break
+            if chunk_cache is None or not chunk_cache.enabled:
+                with timer.stage("accumulate", rows=len(chunk)):
+                    accumulator.update(chunk)
+                continue
+            chunks_total += 1
+            with timer.stage("fingerprint", rows=len(chunk)):
+                hashes = row_hashes(chunk)
+                key = chunk_fingerprint(chunk, hashes, approximate, csv_text)
+                part = chunk_cache.get(key)
+            if part is None:
+                with timer.stage("accumulate", rows=len(chunk)):
+                    part = DatasetAccumulator.from_chunk(chunk, approximate, hashes, csv_text)
+                chunk_cache.put(key, part)
+            else:
+                chunks_reused += 1
+            with timer.stage("merge", rows=len(chunk)):
+                accumulator.merge(part)
+        with timer.stage("finalize", rows=accumulator.row_count):
+            results = accumulator.finalize(progress)
+    if chunks_total:
+        results["incremental"] = {"chunks": chunks_total, "reused_chunks": chunks_reused}
+
+    return finish_timings(timer, results, attach=timings)
+
+
+def iter_row_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Splits an in-memory dataframe into consecutive row chunks."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
@@ -1,23 +1,156 @@
 import pandas as pd
 import numpy as np
+from datetime import datetime
+from pandas.tseries.api import guess_datetime_format
+from typing import Dict, Any, Optional
+
+# Non-null values examined when resolving the type of a string column
+TYPE_SAMPLE_SIZE = 100
+
+# Tried after pandas' own guess from the first value; each one is validated
+# against the whole sample in a single vectorised pd.to_datetime(format=...) call
+DATETIME_FORMATS = [
+    "ISO8601",
+    "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d",
+    "%m-%d-%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S",
+    "%d %b %Y", "%b %d, %Y", "%B %d, %Y",
+]
+
+BOOLEAN_STRINGS = {"true", "false", "yes", "no", "t", "f", "y", "n"}
+
+
+def is_text_dtype(series: pd.Series) -> bool:
+    """
+    Object columns, and categoricals of them such as compacted string columns.
+    Analyzers that look at string values treat both alike.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories.dtype == 'object'
+    return dtype == 'object'
+
 
 def infer_column_type(series: pd.Series) -> str:
     """
     Infers the data type of a pandas Series.
     """
+    return infer_column_type_details(series)["type"]
+
+
+def infer_column_type_details(series: pd.Series) -> Dict[str, Any]:
+    """
+    Infers the data type and, for datetimes stored as strings, the format
+    that parses them. Callers pass `datetime_format` on to the stats so the
+    column is parsed once with an explicit format instead of guessed again.
+    """
     if pd.api.types.is_numeric_dtype(series):
+        if pd.api.types.is_bool_dtype(series):
+            return {"type": "boolean", "datetime_format": None}
         if pd.api.types.is_integer_dtype(series):
-            return "integer"
-        return "float"
+            return {"type": "integer", "datetime_format": None}
+        return {"type": "float", "datetime_format": None}
     elif pd.api.types.is_datetime64_any_dtype(series):
-        return "datetime"
+        return {"type": "datetime", "datetime_format": None}
     elif pd.api.types.is_bool_dtype(series):
-        return "boolean"
-    else:
-        # Check if it could be a datetime stored as string
-        try:
-            pd.to_datetime(series.dropna().head(100), errors='raise')
-            return "datetime"
-        except:
-            pass
-        return "string"
+        return {"type": "boolean", "datetime_format": None}
+
+    sample = _head_sample(series)
+    if isinstance(series.dtype, pd.CategoricalDtype) and is_text_dtype(series):
+        sample = sample.astype(object)
+    kind = pd.api.types.infer_dtype(sample, skipna=False)
+    if kind in ("date", "datetime", "datetime64"):
+        return {"type": "datetime", "datetime_format": None}
+    if kind == "boolean":
+        return {"type": "boolean", "datetime_format": None}
+    if kind in ("integer", "floating", "mixed-integer-float", "decimal"):
+        return {"type": "integer" if kind == "integer" else "float", "datetime_format": None}
+    if kind == "string":
+        return _infer_string_type(sample.astype(str))
+    return {"type": "string", "datetime_format": None}
+
+
+def _head_sample(series: pd.Series) -> pd.Series:
+    """First TYPE_SAMPLE_SIZE non-null values, without a null scan of the whole column."""
+    window = TYPE_SAMPLE_SIZE * 4
+    sample = series.iloc[:window].dropna()
+    if len(sample) < TYPE_SAMPLE_SIZE and len(series) > window:
+        sample = series.dropna()
+    return sample.head(TYPE_SAMPLE_SIZE)
+
+
+def _infer_string_type(sample: pd.Series) -> Dict[str, Any]:
+    """Looks for numbers, booleans and datetimes written as text."""
+    stripped = sample.str.strip()
+
+    # Leading zeros mark identifiers (zip codes, account numbers) rather than numbers
+    if not stripped.str.match(r'^[+-]?0\d').any():
+        numbers = pd.to_numeric(stripped, errors="coerce")
+        if numbers.notna().all():
+            is_integer = stripped.str.fullmatch(r'[+-]?\d+').all()
+            return {"type": "integer" if is_integer else "float", "datetime_format": None}
+
+    if stripped.str.lower().isin(BOOLEAN_STRINGS).all():
+        return {"type": "boolean", "datetime_format": None}
+
+    datetime_format = resolve_datetime_format(stripped)
+    if datetime_format is not None:
+        return {"type": "datetime", "datetime_format": datetime_format}
+    return {"type": "string", "datetime_format": None}
+
+
+def resolve_datetime_format(sample: pd.Series) -> Optional[str]:
+    """
+    Returns the first candidate format that parses every sampled value, or None.
+    """
+    if sample.empty or not sample.str.contains(r'\d').all():
+        return None
+
+    candidates = []
+    guessed = guess_datetime_format(sample.iloc[0])
+    if guessed is not None:
+        candidates.append(guessed)
+    candidates.extend(fmt for fmt in DATETIME_FORMATS if fmt != guessed)
+
+    first = sample.iloc[0]
+    for fmt in candidates:
+        # Cheap scalar screen on one value before the vectorised check
+        if not _parses(first, fmt):
+            continue
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        if parsed.notna().all():
+            return fmt
+    return None
+
+
+def _parses(value: str, fmt: str) -> bool:
+    try:
+        if fmt == "ISO8601":
+            datetime.fromisoformat(value)
+        else:
+            datetime.strptime(value, fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def to_datetime_values(series: pd.Series, datetime_format: Optional[str] = None) -> pd.Series:
+    """
+    Converts a column inferred as datetime, using the resolved format when the
+    values are strings. Values that do not parse become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if datetime_format is None:
+        return pd.to_datetime(series, errors="coerce")
+    return pd.to_datetime(series.astype(str).str.strip(), format=datetime_format, errors="coerce")
+
+
+def to_numeric_values(series: pd.Series) -> pd.Series:
+    """
+    Converts a non-numeric column inferred as integer or float (numbers stored
+    as text) to numbers. Values that do not parse are dropped.
+    """
+    if is_text_dtype(series):
+        series = series.astype(str).str.strip()
+    return pd.to_numeric(series, errors="coerce").dropna()
@@ -0,0 +1,246 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from app.services.profiler.column import profile_column, build_column_profile
+from app.services.profiler.kernel import _mean, _std, _by_frequency
+from app.services.profiler.instrumentation import StageTimer
+
+# Tables with at least this many columns profile their numeric columns in dtype-grouped batches
+WIDE_MIN_COLUMNS = int(os.getenv("PROFILER_WIDE_MIN_COLUMNS", "200"))
+
+# Cells per batch; the block, its sort order and sorted copy are held at once
+_BATCH_CELLS = 4_000_000
+
+# Up to this many rows, value counts come from runs in the sorted block; longer columns hash
+# (measured crossover: an argsort is cheaper than pandas' value_counts() below ~5000 rows)
+_SORT_COUNT_ROWS = 4096
+
+# np.percentile's quartiles for the IQR fences
+_QUARTILES = np.array([0.25, 0.75])
+
+
+def should_profile_wide(df: pd.DataFrame, min_columns: int) -> bool:
+    """
+    Batching only pays off once per-column dispatch outweighs the arithmetic.
+    """
+    return len(df.columns) >= min_columns > 0
+
+
+def _batchable(dtype: Any) -> bool:
+    """Plain NumPy integers and floats; booleans and extension types stay per column."""
+    return isinstance(dtype, np.dtype) and (dtype.kind in "iu" or dtype in (np.float32, np.float64))
+
+
+def profile_columns_wide(
+    df: pd.DataFrame,
+    total_rows: int,
+    timer: Optional[StageTimer] = None,
+    top_n: int = 10,
+    on_column: Optional[Callable[[int, Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Profiles a wide table. Numeric columns are grouped by dtype and their
+    completeness, stats, outliers, distinct counts and top values computed
+    for a whole batch at once from one column-wise sort; every other column
+    goes through profile_column. Output matches profile_column exactly and is
+    in the original column order. `on_column(position, profile)` is called as
+    each profile is finished, batch by batch.
+    """
+    timer = timer or StageTimer(enabled=False)
+    groups: Dict[np.dtype, List[int]] = {}
+    for position, dtype in enumerate(df.dtypes):
+        if _batchable(dtype) and total_rows > 0:
+            groups.setdefault(dtype, []).append(position)
+
+    profiles: Dict[int, Dict[str, Any]] = {}
+    batch_size = max(1, _BATCH_CELLS // max(total_rows, 1))
+    for dtype, positions in groups.items():
+        inferred_type = "integer" if dtype.kind in "iu" else "float"
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            with timer.stage("wide_batch", rows=total_rows * len(batch)):
+                # Column-contiguous, so axis-0 sums add in the same order as a single column
+                block = np.asfortranarray(df.iloc[:, batch].to_numpy())
+                if dtype.kind in "iu" and dtype.itemsize < 8:
+                    # Quartile interpolation subtracts values, which could overflow narrow integers
+                    block = block.astype(np.int64, order="F")
+                batch_profiles = profile_numeric_block(df.columns[batch], block, inferred_type, top_n)
+            profiles.update(zip(batch, batch_profiles))
+            if on_column is not None:
+                for position, profile in zip(batch, batch_profiles):
+                    on_column(position, profile)
+
+    for position, name in enumerate(df.columns):
+        if position not in profiles:
+            profiles[position] = profile_column(name, df.iloc[:, position], total_rows, timer)
+            if on_column is not None:
+                on_column(position, profiles[position])
+    return [profiles[position] for position in range(len(df.columns))]
+
+
+def profile_numeric_block(
+    names: pd.Index,
+    block: np.ndarray,
+    inferred_type: str,
+    top_n: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Profiles the columns of a 2D integer or float block (rows x columns).
+    Reductions run along axis 0 for all columns at once and reproduce the
+    fused kernel's arithmetic: NumPy's linear-interpolation quartiles and
+    median, pandas' sum order for means and the kernel's order for top values.
+    """
+    total_rows, width = block.shape
+    columns = np.arange(width)
+    if block.dtype.kind == "f":
+        null_mask = np.isnan(block)
+        null_counts = null_mask.sum(axis=0)
+    else:
+        null_mask = None
+        null_counts = np.zeros(width, dtype=np.int64)
+    counts = total_rows - null_counts
+
+    # NaN sorts last, after each column's non-null values
+    if total_rows <= _SORT_COUNT_ROWS:
+        order = np.argsort(block, axis=0)
+        sorted_block = np.take_along_axis(block, order, axis=0)
+    else:
+        order = None
+        sorted_block = np.sort(block, axis=0)
+
+    # Only columns with values get stats; index 0 stands in for the rest
+    present = counts > 0
+    last = np.where(present, counts - 1, 0)
+    minimums = sorted_block[0]
+    maximums = sorted_block[last, columns]
+    medians = _medians(sorted_block, counts, columns)
+    q1, q3 = _quantiles(sorted_block, counts, columns)
+    iqr = q3 - q1
+    lower_bounds = q1 - 1.5 * iqr
+    upper_bounds = q3 + 1.5 * iqr
+    # Same as searchsorted on the sorted values, including NaN fences (NaN sorts last)
+    below = np.where(np.isnan(lower_bounds), counts, (block < lower_bounds).sum(axis=0))
+    above = np.where(np.isnan(upper_bounds), 0, (block > upper_bounds).sum(axis=0))
+
+    complete = null_counts == 0
+    sum_dtype = block.dtype if block.dtype.kind == "f" else np.float64
+    means = block.sum(axis=0, dtype=sum_dtype) / np.maximum(counts, 1).astype(sum_dtype)
+    averages = block.sum(axis=0, dtype=np.float64) / np.maximum(counts, 1)
+    squares = ((averages - block) ** 2).sum(axis=0, dtype=np.float64)
+    stds = np.sqrt((squares / np.maximum(counts - 1, 1)).astype(sum_dtype))
+
+    profiles = []
+    for j, name in enumerate(names):
+        null_count = int(null_counts[j])
+        stats: Dict[str, Any] = {}
+        outliers: Dict[str, Any] = {"count": 0, "threshold": "N/A"}
+        distinct_count = 0
+        top_values: List[Dict[str, Any]] = []
+        if present[j]:
+            n = int(counts[j])
+            if complete[j]:
+                mean, std = means[j], stds[j]
+            else:
+                values = block[:, j][~null_mask[:, j]]
+                mean, std = _mean(values), (_std(values) if n > 1 else 0)
+            stats = {
+                "min": float(minimums[j]),
+                "max": float(maximums[j]),
+                "mean": float(mean),
+                "median": float(medians[j]),
+                "std": float(std) if n > 1 else 0
+            }
+            outliers = {
+                "count": int(below[j] + above[j]),
+                "lower_bound": float(lower_bounds[j]),
+                "upper_bound": float(upper_bounds[j]),
+                "threshold": "IQR * 1.5"
+            }
+            if order is not None:
+                keys, key_counts, distinct_count = _leading_value_counts(block[:, j], sorted_block[:n, j], order[:n, j], top_n)
+            else:
+                keys, key_counts, distinct_count = _hashed_value_counts(block[:, j], top_n)
+            # Formatted like the kernel's _top_values
+            top_values = [
+                {"value": str(key), "count": count, "percentage": round((count / total_rows) * 100, 2)}
+                for key, count in zip(keys, key_counts)
+            ]
+
+        metrics = {
+            "null_count": null_count,
+            "null_percentage": float((null_count / total_rows) * 100 if total_rows > 0 else 0),
+            "distinct_count": distinct_count,
+            "is_unique": distinct_count == total_rows,
+            "stats": stats,
+            "outliers": outliers,
+            "top_values": top_values,
+        }
+        profiles.append(build_column_profile(name, inferred_type, None, metrics, {}, total_rows))
+    return profiles
+
+
+def _medians(sorted_block: np.ndarray, counts: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    np.median of each column's non-null values in float64, like the kernel.
+    np.median averages the middle values with a sum that starts at 0.0, so
+    the 0.0 is added here too (it turns -0.0 into 0.0).
+    """
+    upper = np.where(counts > 0, counts // 2, 0)
+    lower = np.where(counts % 2 == 0, np.maximum(upper - 1, 0), upper)
+    lows = 0.0 + sorted_block[lower, columns].astype("f8")
+    highs = sorted_block[upper, columns].astype("f8")
+    return np.where(lower == upper, lows, (lows + highs) / 2)
+
+
+def _quantiles(sorted_block: np.ndarray, counts: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    np.percentile(values, [25, 75]) of each column's non-null values: the
+    same virtual indexes, neighbours and lerp, with a different n per column.
+    """
+    sizes = np.maximum(counts, 1)
+    virtual = (sizes - 1)[None, :] * _QUARTILES[:, None]
+    previous = np.floor(virtual)
+    at_end = virtual >= (sizes - 1)[None, :]
+    previous[at_end] = -1
+    gamma = virtual - previous
+
+    previous_rows = np.where(at_end, sizes - 1, previous.astype(np.intp))
+    next_rows = np.where(at_end, sizes - 1, previous_rows + 1)
+    a = sorted_block[previous_rows, columns]
+    b = sorted_block[next_rows, columns]
+    diff_b_a = b - a
+    result = np.add(a, diff_b_a * gamma)
+    np.subtract(b, diff_b_a * (1 - gamma), out=result, where=gamma >= 0.5, casting="unsafe")
+    return result
+
+
+def _hashed_value_counts(values: np.ndarray, top_n: int) -> Tuple[List[Any], List[int], int]:
+    """_leading_value_counts() through pandas' value_counts(), which skips NaN."""
+    value_counts = _by_frequency(pd.Series(values).value_counts(sort=False))
+    return value_counts.index[:top_n].tolist(), value_counts.iloc[:top_n].tolist(), len(value_counts)
+
+
+def _leading_value_counts(
+    values: np.ndarray,
+    sorted_values: np.ndarray,
+    order: np.ndarray,
+    top_n: int
+) -> Tuple[List[Any], List[int], int]:
+    """
+    The values and counts of the `top_n` most frequent values, and the
+    distinct count, from runs in the sorted non-null values. Counts are
+    listed in order of first occurrence, then stably sorted by count, so ties
+    break as in the kernel. Values are Python scalars, as iterating the index
+    yields.
+    """
+    starts = np.flatnonzero(np.concatenate(([True], sorted_values[1:] != sorted_values[:-1])))
+    run_counts = np.diff(np.append(starts, len(sorted_values)))
+    # Equal values (e.g. 0.0 and -0.0) are keyed by their first occurrence
+    first_positions = np.minimum.reduceat(order, starts)
+
+    by_occurrence = np.argsort(first_positions)
+    descending = np.argsort(-run_counts[by_occurrence], kind="stable")
+
+    leading = by_occurrence[descending[:top_n]]
+    return values[first_positions[leading]].tolist(), run_counts[leading].tolist(), len(starts)
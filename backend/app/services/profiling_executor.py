@@ -0,0 +1,128 @@
+import os
+import math
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Callable
+
+# Profiling jobs that run at once; the rest wait in a bounded queue
+PROFILING_CONCURRENCY = int(os.getenv("PROFILING_CONCURRENCY", "2"))
+PROFILING_QUEUE_SIZE = int(os.getenv("PROFILING_QUEUE_SIZE", "8"))
+# Retry-After sent with 503s before any job duration has been observed
+PROFILING_RETRY_AFTER = int(os.getenv("PROFILING_RETRY_AFTER_SECONDS", "30"))
+
+# Recent jobs used for wait-time percentiles and the Retry-After estimate
+_SAMPLE_SIZE = 200
+# Job duration estimate before any job has finished
+_DEFAULT_ESTIMATE = 5
+
+
+class QueueFullError(Exception):
+    """Raised when the profiling queue cannot take another job."""
+
+
+class ProfilingExecutor:
+    """
+    Runs CPU-bound profiling jobs on worker threads, off the asyncio event loop.
+    Admission is bounded: at most `max_workers` jobs run and `max_queue` wait;
+    submit() raises QueueFullError beyond that so the API can shed load.
+    """
+
+    def __init__(self, max_workers: int = PROFILING_CONCURRENCY, max_queue: int = PROFILING_QUEUE_SIZE):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="profiling")
+        self.lock = threading.Lock()
+        self.running = 0
+        self.queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_times: deque = deque(maxlen=_SAMPLE_SIZE)
+        self.run_times: deque = deque(maxlen=_SAMPLE_SIZE)
+
+    def is_full(self) -> bool:
+        with self.lock:
+            return self.running + self.queued >= self.max_workers + self.max_queue
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self.lock:
+            if self.running + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise QueueFullError("Profiling queue is full")
+            self.queued += 1
+            self.submitted += 1
+        return self.pool.submit(self._run, time.perf_counter(), fn, args, kwargs)
+
+    def _run(self, enqueued_at: float, fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        with self.lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_times.append(started - enqueued_at)
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.run_times.append(time.perf_counter() - started)
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def retry_after(self) -> int:
+        """
+        Seconds until a slot is likely to free up, from recent job durations.
+        """
+        with self.lock:
+            if not self.run_times:
+                return PROFILING_RETRY_AFTER
+            average = sum(self.run_times) / len(self.run_times)
+            backlog = self.queued + 1
+        return int(min(max(math.ceil(average * backlog / self.max_workers), 1), 300))
+
+    def estimated_seconds(self) -> int:
+        """
+        Expected seconds until a job that was just submitted completes: its
+        wait behind the jobs ahead of it plus one average run.
+        """
+        with self.lock:
+            if not self.run_times:
+                return _DEFAULT_ESTIMATE
+            average = sum(self.run_times) / len(self.run_times)
+            ahead = max(self.queued + self.running - 1, 0)
+        return int(max(math.ceil(average * (1 + ahead / self.max_workers)), 1))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and recent wait times (for monitoring)."""
+        with self.lock:
+            waits = sorted(self.wait_times)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_seconds": {
+                    "mean": sum(waits) / len(waits) if waits else 0.0,
+                    "p95": waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+                    "max": waits[-1] if waits else 0.0,
+                },
+            }
+
+    def shutdown(self, wait: bool = True):
+        self.pool.shutdown(wait=wait)
+
+
+# Singleton instance
+profiling_executor = ProfilingExecutor()
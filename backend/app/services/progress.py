@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+# Events a job's stream ends with
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class JobProgress:
+    """Event log of one job and the queues of the clients following it."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self.columns_done = 0
+        self.columns_total = 0
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+
+class ProgressBroker:
+    """
+    Fans profiling progress out to streaming clients. Profiling threads
+    publish events; each subscriber gets the events published so far and then
+    every new one on its own asyncio queue. Logs live in this process from
+    open() until finish(); a job that has none (finished, or run by another
+    worker) is served from the job store instead.
+
+    Events: "preview" (a quick profile of types and completeness, when one was
+    asked for), "start" (a table's row and column counts), "column" (a
+    finished column profile with columns done / total), then "completed"
+    (summary and issues, computed last) or "failed". An upload with several
+    tables (workbook sheets, zip members) sends a "start" and a run of
+    "column" events per table; those events name their table (see scoped),
+    and each "column" position counts within its own table.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.jobs: Dict[str, JobProgress] = {}
+
+    def open(self, job_id: str):
+        with self.lock:
+            self.jobs.setdefault(job_id, JobProgress())
+
+    def reporter(self, job_id: str):
+        """The `progress` callback profile_dataset calls for this job."""
+        return lambda event, data: self.publish(job_id, event, data)
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]):
+        with self.lock:
+            progress = self.jobs.get(job_id)
+            if progress is None:
+                return
+            if event == "start":
+                progress.columns_total += data["column_count"]
+            elif event == "column":
+                progress.columns_done += 1
+                data = {"columns_done": progress.columns_done, "columns_total": progress.columns_total, **data}
+            self._send(progress, event, data)
+
+    def finish(self, job_id: str, results: Optional[Dict[str, Any]]):
+        """Sends the terminal event and drops the job's log."""
+        with self.lock:
+            progress = self.jobs.pop(job_id, None)
+            if progress is not None:
+                self._send(progress, *final_event(results))
+
+    def subscribe(self, job_id: str) -> Optional[Tuple[List[Tuple[str, Dict[str, Any]]], asyncio.Queue]]:
+        """
+        The events so far and a queue for the rest, or None when this process
+        holds no log for the job. Must be called from the event loop.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        with self.lock:
+            progress = self.jobs.get(job_id)
+            if progress is None:
+                return None
+            progress.subscribers.append((asyncio.get_running_loop(), queue))
+            return list(progress.events), queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self.lock:
+            progress = self.jobs.get(job_id)
+            if progress is not None:
+                progress.subscribers = [(loop, q) for loop, q in progress.subscribers if q is not queue]
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, int]]:
+        """Columns done out of total, while the job runs in this process."""
+        with self.lock:
+            progress = self.jobs.get(job_id)
+            if progress is None:
+                return None
+            return {"columns_done": progress.columns_done, "columns_total": progress.columns_total}
+
+    def _send(self, progress: JobProgress, event: str, data: Dict[str, Any]):
+        progress.events.append((event, data))
+        for loop, queue in progress.subscribers:
+            # The loop may already be closed if the client went away
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+
+def scoped(
+    progress: Optional[Callable[[str, Dict[str, Any]], None]], field: str, name: str
+) -> Optional[Callable[[str, Dict[str, Any]], None]]:
+    """Wraps a `progress` callback so every event names the table it is for, e.g. {"sheet": name}."""
+    if progress is None:
+        return None
+    return lambda event, data: progress(event, {field: name, **data})
+
+
+def final_event(results: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """The terminal event for a job's results (None when it failed)."""
+    if results is None:
+        return "failed", {}
+    return "completed", {"summary": results["summary"], "issues_summary": results.get("issues_summary")}
+
+
+# Singleton instance
+progress_broker = ProgressBroker()
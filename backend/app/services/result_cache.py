@@ -0,0 +1,118 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from app.services.job_store import payload_size
+
+# Completed results kept for repeat uploads; either limit at 0 disables the cache
+RESULT_CACHE_MB = int(os.getenv("RESULT_CACHE_MB", "256"))
+RESULT_CACHE_ENTRIES = int(os.getenv("RESULT_CACHE_ENTRIES", "256"))
+
+# Result fields that describe the run which produced it, not the data
+RUN_FIELDS = ("timings", "incremental")
+
+
+def content_hasher() -> "hashlib.blake2b":
+    """Incremental hasher fed with upload chunks as they arrive."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def cached_copy(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The result as served to jobs that did not profile it themselves: without
+    the leader's run fields (timings, chunk reuse) and marked `cached`.
+    """
+    served = {name: value for name, value in result.items() if name not in RUN_FIELDS}
+    served["cached"] = True
+    return served
+
+
+def make_cache_key(digest: str, **options: Any) -> str:
+    """Content digest plus every option that changes the profile."""
+    settings = ",".join(f"{name}={options[name]}" for name in sorted(options))
+    return f"{digest}:{settings}"
+
+
+class ResultCache:
+    """
+    Content-addressed cache of profile results.
+    A lookup either hits a stored result, joins the job already profiling the
+    same content (single-flight), or makes the caller the leader that must
+    later call complete() or fail(). Stored results are evicted least recently
+    used first once the byte or entry limit is exceeded. Results are stored
+    as cached_copy() makes them.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MB * 1024 * 1024, max_entries: int = RESULT_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self.inflight: Dict[str, List[str]] = {}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.joins = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.max_entries > 0
+
+    def lookup(self, key: str, job_id: str) -> Tuple[str, Optional[Any]]:
+        """
+        Returns ("hit", result), ("joined", None) when `job_id` was attached to
+        an in-flight job, or ("leader", None) when the caller must profile.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return "hit", self.entries[key][0]
+            if key in self.inflight:
+                self.inflight[key].append(job_id)
+                self.joins += 1
+                return "joined", None
+            self.inflight[key] = []
+            self.misses += 1
+            return "leader", None
+
+    def complete(self, key: str, result: Any) -> List[str]:
+        """Stores the leader's result and returns the job ids that joined it."""
+        result = cached_copy(result)
+        size = payload_size(result)
+        with self.lock:
+            followers = self.inflight.pop(key, [])
+            if size <= self.max_bytes:
+                if key in self.entries:
+                    self.resident_bytes -= self.entries.pop(key)[1]
+                self.entries[key] = (result, size)
+                self.resident_bytes += size
+                while self.resident_bytes > self.max_bytes or len(self.entries) > self.max_entries:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.resident_bytes -= evicted_size
+                    self.evictions += 1
+            return followers
+
+    def fail(self, key: str) -> List[str]:
+        """Releases a failed leader's claim and returns the job ids that joined it."""
+        with self.lock:
+            return self.inflight.pop(key, [])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "in_flight": len(self.inflight),
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "joins": self.joins,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Singleton instance
+result_cache = ResultCache()
@@ -0,0 +1,106 @@
+import os
+import bz2
+import gzip
+import lzma
+import zipfile
+import zstandard
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Total bytes an upload may decompress to, across all archive members (zip bomb guard)
+MAX_DECOMPRESSED_SIZE = int(os.getenv("MAX_DECOMPRESSED_MB", "2048")) * 1024 * 1024
+# Most files profiled from one zip archive
+MAX_ZIP_MEMBERS = int(os.getenv("MAX_ZIP_MEMBERS", "20"))
+
+# Single-stream compression by file suffix, e.g. data.csv.gz
+COMPRESSION_EXTENSIONS = {"gz": "gzip", "bz2": "bz2", "zst": "zstd", "xz": "xz"}
+
+# Decompressed data is copied in pieces of this size
+_COPY_SIZE = 1024 * 1024
+
+
+class DecompressionLimitError(ValueError):
+    """The upload decompresses to more than the allowed size."""
+
+
+def split_compression(filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits a compression suffix off a filename: ("data.csv", "gzip") for
+    data.csv.gz, (filename, "zip") for archives and (filename, None) otherwise.
+    """
+    stem, _, suffix = filename.rpartition(".")
+    suffix = suffix.lower()
+    if stem and suffix in COMPRESSION_EXTENSIONS:
+        return stem, COMPRESSION_EXTENSIONS[suffix]
+    if stem and suffix == "zip":
+        return filename, "zip"
+    return filename, None
+
+
+def _open_stream(path: str, compression: str) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def _copy_limited(source: BinaryIO, target_path: str, budget: int) -> int:
+    """
+    Copies `source` to a new file piece by piece and returns the bytes written.
+    Raises DecompressionLimitError, leaving a partial file, past `budget` bytes.
+    """
+    written = 0
+    with open(target_path, "wb") as target:
+        while True:
+            part = source.read(_COPY_SIZE)
+            if not part:
+                return written
+            written += len(part)
+            if written > budget:
+                raise DecompressionLimitError(
+                    f"Decompressed size exceeds {MAX_DECOMPRESSED_SIZE // (1024 * 1024)}MB"
+                )
+            target.write(part)
+
+
+def decompress_file(path: str, compression: str, target_path: str, budget: int = MAX_DECOMPRESSED_SIZE) -> int:
+    """
+    Streams a gzip, bz2, xz or zstd file into `target_path` without holding
+    it in memory. Returns the decompressed size.
+    """
+    with _open_stream(path, compression) as source:
+        return _copy_limited(source, target_path, budget)
+
+
+def iter_zip_members(path: str, workdir: str, budget: int = MAX_DECOMPRESSED_SIZE) -> Iterator[Tuple[str, str]]:
+    """
+    Extracts the files of a zip archive one at a time into `workdir`, yielding
+    (member name, extracted path). Each file is deleted once the caller moves
+    on. Directories and macOS resource forks are skipped; the decompressed
+    size is enforced while extracting, not trusted from the archive headers.
+    """
+    with zipfile.ZipFile(path) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+        ]
+        if len(members) > MAX_ZIP_MEMBERS:
+            raise DecompressionLimitError(f"Archive has more than {MAX_ZIP_MEMBERS} files")
+        if sum(info.file_size for info in members) > budget:
+            raise DecompressionLimitError(
+                f"Decompressed size exceeds {MAX_DECOMPRESSED_SIZE // (1024 * 1024)}MB"
+            )
+
+        for index, info in enumerate(members):
+            target_path = os.path.join(workdir, f"member-{index}")
+            try:
+                with archive.open(info) as source:
+                    budget -= _copy_limited(source, target_path, budget)
+                yield info.filename, target_path
+            finally:
+                if os.path.exists(target_path):
+                    os.remove(target_path)
@@ -1,26 +1,232 @@
+import os
+import importlib.util
 import pandas as pd
 import polars as pl
-from typing import Union, Optional
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import numpy as np
+from typing import Union, Optional, Iterator, List, Dict, Any, Tuple
 import io
 
-def parse_file(content: bytes, filename: str) -> Union[pd.DataFrame, pl.DataFrame, None]:
+# Rows per chunk in streaming mode; peak memory scales with this, not file size (row hashes past PROFILER_DUPLICATE_HASH_MB go to disk)
+CHUNK_ROWS = int(os.getenv("PROFILER_CHUNK_ROWS", "100000"))
+
+EXCEL_EXTENSIONS = ["xlsx", "xls"]
+NDJSON_EXTENSIONS = ["ndjson", "jsonl"]
+ARROW_IPC_EXTENSIONS = ["arrow", "feather", "ipc"]
+
+# Formats that can be read in row chunks
+STREAMABLE_EXTENSIONS = ["csv", "parquet"] + NDJSON_EXTENSIONS + ARROW_IPC_EXTENSIONS
+
+# Formats the Polars engine scans lazily
+POLARS_EXTENSIONS = ["csv", "parquet"] + NDJSON_EXTENSIONS + ARROW_IPC_EXTENSIONS
+# calamine parses workbooks several times faster than openpyxl; pandas' default engine is used without it
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+# Passed as `sheet` to profile every sheet of a workbook (not a legal sheet name)
+ALL_SHEETS = "*"
+
+# Words pd.read_csv reads as booleans by default
+CSV_BOOLEANS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+# Rows Polars reads to infer CSV column types
+POLARS_INFER_SCHEMA_ROWS = int(os.getenv("POLARS_INFER_SCHEMA_ROWS", "10000"))
+
+def get_extension(filename: str) -> str:
+    return filename.split(".")[-1].lower()
+
+def _source(content: Union[bytes, str]) -> Union[io.BytesIO, str]:
+    """Bytes are wrapped in a buffer; anything else is a path pandas opens itself."""
+    return io.BytesIO(content) if isinstance(content, bytes) else content
+
+def parse_file(
+    content: Union[bytes, str],
+    filename: str,
+    columns: Optional[List[str]] = None,
+    sheet: Optional[str] = None
+) -> Union[pd.DataFrame, pl.DataFrame, None]:
     """
-    Parses file content into a dataframe based on file extension.
-    Currently supports CSV, Excel, and JSON.
+    Parses file content, or the file at a path, into a dataframe based on
+    file extension. Supports CSV, Excel, JSON, NDJSON, Parquet and Arrow IPC.
+    Reading from a path avoids holding the raw file in memory next to the dataframe.
+    `columns` limits parsing to those columns; Parquet and Arrow files on disk
+    are memory-mapped and only the projected columns are read. `sheet` names
+    the Excel sheet to read, the first by default.
     """
-    extension = filename.split(".")[-1].lower()
-    file_obj = io.BytesIO(content)
+    extension = get_extension(filename)
+    file_obj = _source(content)
+    mapped = isinstance(file_obj, str)
 
     try:
         if extension == "csv":
             # For now using pandas, but can switch to polars for large files
-            return pd.read_csv(file_obj)
-        elif extension in ["xlsx", "xls"]:
-            return pd.read_excel(file_obj)
+            return pd.read_csv(file_obj, usecols=columns)
+        elif extension in EXCEL_EXTENSIONS:
+            return pd.read_excel(file_obj, sheet_name=sheet if sheet is not None else 0, usecols=columns, engine=EXCEL_ENGINE)
         elif extension == "json":
-            return pd.read_json(file_obj)
+            return _project(pd.read_json(file_obj), columns)
+        elif extension in NDJSON_EXTENSIONS:
+            # Line by line in chunks, never as one document
+            with pd.read_json(file_obj, lines=True, chunksize=CHUNK_ROWS) as reader:
+                return pd.concat([_project(chunk, columns) for chunk in reader], ignore_index=True)
+        elif extension == "parquet":
+            return pq.read_table(file_obj, columns=columns, memory_map=mapped).to_pandas()
+        elif extension in ARROW_IPC_EXTENSIONS:
+            return feather.read_table(file_obj, columns=columns, memory_map=mapped).to_pandas()
         else:
             return None
     except Exception as e:
         print(f"Error parsing file: {e}")
         return None
+
+def excel_sheet_names(content: Union[bytes, str]) -> List[str]:
+    """Sheet names of a workbook, in workbook order, without reading any cells."""
+    with pd.ExcelFile(_source(content), engine=EXCEL_ENGINE) as workbook:
+        return list(workbook.sheet_names)
+
+def _project(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    return df if columns is None else df[columns]
+
+def parse_file_chunks(
+    content: Union[bytes, str],
+    filename: str,
+    chunksize: int = CHUNK_ROWS,
+    columns: Optional[List[str]] = None,
+    csv_text: bool = False
+) -> Optional[Iterator[pd.DataFrame]]:
+    """
+    Returns an iterator of row chunks for streamable formats, or None.
+    Accepts bytes or a path. Call close() on the iterator when done.
+    pandas infers CSV types chunk by chunk, so a column can be numeric in one
+    chunk and text in the next. With `csv_text`, CSV cells are read as text
+    instead and every chunk has the same schema; csv_text_kind() and
+    csv_dtype() then give the types pd.read_csv infers for the whole file.
+    """
+    extension = get_extension(filename)
+    source = _source(content)
+    if extension == "csv":
+        return pd.read_csv(source, chunksize=chunksize, usecols=columns, dtype=str if csv_text else None)
+    elif extension in NDJSON_EXTENSIONS:
+        return _ndjson_chunks(source, chunksize, columns)
+    elif extension == "parquet":
+        return _parquet_chunks(source, chunksize, columns)
+    elif extension in ARROW_IPC_EXTENSIONS:
+        return _ipc_chunks(source, chunksize, columns)
+    return None
+
+def csv_text_kind(values: pd.Index) -> Optional[str]:
+    """
+    How pd.read_csv types a column whose distinct non-null cells, read as
+    text, are `values`: "integer", "float", "boolean" or "text". None when
+    there are none, which leaves the kind to the rest of the column.
+    """
+    if len(values) == 0:
+        return None
+    if values.isin(list(CSV_BOOLEANS)).all():
+        return "boolean"
+    numbers = pd.to_numeric(values, errors="coerce")
+    if np.isnan(numbers.to_numpy(dtype="f8", na_value=np.nan)).any():
+        return "text"
+    return "integer" if numbers.dtype.kind in "iu" else "float"
+
+def combine_csv_kinds(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """The csv_text_kind of a column made of parts of kinds `a` and `b`."""
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    return "float" if {a, b} == {"integer", "float"} else "text"
+
+def csv_dtype(kind: Optional[str], has_nulls: bool) -> np.dtype:
+    """The dtype pd.read_csv gives a column of `kind`; missing cells turn integers to floats and booleans to objects."""
+    if kind == "integer" and not has_nulls:
+        return np.dtype("int64")
+    if kind == "boolean" and not has_nulls:
+        return np.dtype(bool)
+    if kind in ("boolean", "text"):
+        return np.dtype(object)
+    return np.dtype("float64")
+
+def convert_csv_text(values: pd.Index, kind: str) -> pd.Index:
+    """Text cells of a column of `kind` converted as pd.read_csv converts them."""
+    if kind == "boolean":
+        return pd.Index([CSV_BOOLEANS[value] for value in values], dtype=object)
+    if kind in ("integer", "float"):
+        return pd.Index(pd.to_numeric(values))
+    return values
+
+def _ndjson_chunks(source: Union[io.BytesIO, str], chunksize: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    with pd.read_json(source, lines=True, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield _project(chunk, columns)
+
+def _parquet_chunks(source: Union[io.BytesIO, str], chunksize: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    parquet = pq.ParquetFile(source, memory_map=isinstance(source, str))
+    try:
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    finally:
+        parquet.close()
+
+def _ipc_chunks(source: Union[io.BytesIO, str], chunksize: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    stream = pa.memory_map(source) if isinstance(source, str) else source
+    with pa.ipc.open_file(stream) as reader:
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+
+def parquet_statistics(content: Union[bytes, str]) -> Tuple[int, List[str], Dict[str, Dict[str, Any]]]:
+    """
+    Reads a Parquet footer: the row count, the column names and, for each
+    top-level column that has statistics in every row group, its null count
+    and min/max merged across row groups, with its Arrow type. No data pages
+    are read.
+    """
+    metadata = pq.read_metadata(_source(content))
+    schema = metadata.schema.to_arrow_schema()
+    statistics: Dict[str, Dict[str, Any]] = {}
+    for j in range(metadata.num_columns):
+        name = metadata.schema.column(j).path
+        if name not in schema.names:
+            continue  # a leaf of a nested column
+        merged = {"null_count": 0, "min": None, "max": None, "type": schema.field(name).type}
+        for i in range(metadata.num_row_groups):
+            chunk = metadata.row_group(i).column(j)
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                merged = None
+                break
+            merged["null_count"] += stats.null_count
+            if stats.null_count == metadata.row_group(i).num_rows:
+                continue  # all null: no min/max to merge
+            if not stats.has_min_max:
+                merged = None
+                break
+            merged["min"] = stats.min if merged["min"] is None else min(merged["min"], stats.min)
+            merged["max"] = stats.max if merged["max"] is None else max(merged["max"], stats.max)
+        if merged is not None:
+            statistics[name] = merged
+    return metadata.num_rows, schema.names, statistics
+
+def scan_file(content: Union[bytes, str], filename: str, columns: Optional[List[str]] = None) -> Optional[pl.LazyFrame]:
+    """
+    Returns a lazy Polars scan for CSV, NDJSON, Parquet and Arrow IPC, or None
+    for other formats. Nothing is read until the scan is collected, Polars
+    parses on all cores, and `columns` is pushed down into the reader.
+    """
+    extension = get_extension(filename)
+    source = _source(content)
+    if extension == "csv":
+        lf = pl.scan_csv(source, infer_schema_length=POLARS_INFER_SCHEMA_ROWS)
+    elif extension in NDJSON_EXTENSIONS:
+        lf = pl.scan_ndjson(source, infer_schema_length=POLARS_INFER_SCHEMA_ROWS)
+    elif extension == "parquet":
+        lf = pl.scan_parquet(source)
+    elif extension in ARROW_IPC_EXTENSIONS:
+        lf = pl.scan_ipc(source)
+    else:
+        return None
+    return lf if columns is None else lf.select(columns)
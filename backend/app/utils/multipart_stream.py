@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+class MultipartFileStream:
+    """
+    Pulls one file field out of a multipart/form-data body as it arrives, so
+    the upload can be size-checked and written to its spool file piece by
+    piece instead of being received in full by Request.form() first.
+    Other fields, and repeats of the file field, are skipped.
+    """
+
+    def __init__(self, content_type: str, field: str = "file"):
+        media_type, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if media_type != b"multipart/form-data" or not boundary:
+            raise ValueError("Expected a multipart/form-data body")
+        self.field = field
+        self.filename: Optional[str] = None
+        self.complete = False
+        self._pending: List[bytes] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._reading = False
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Parses the next piece of the body and returns the file bytes it held."""
+        self.parser.write(data)
+        pending, self._pending = self._pending, []
+        return pending
+
+    def finish(self):
+        self.parser.finalize()
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        self._reading = name == self.field and filename is not None and self.filename is None
+        if self._reading:
+            self.filename = filename.decode("utf-8", errors="replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._reading:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self):
+        if self._reading:
+            self.complete = True
+        self._reading = False
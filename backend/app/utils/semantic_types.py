@@ -1,30 +1,186 @@
 import re
+import math
+import ipaddress
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Callable, Dict
+from app.services.profiler.type_inference import is_text_dtype
 
-# Common regex patterns
+# Common regex patterns, in priority order (first match wins for a value)
 PATTERNS = {
     "email": r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
     "url": r'^https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+',
+    "uuid": r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$',
+    "ipv4": r'^\d{1,3}(?:\.\d{1,3}){3}$',
+    "ipv6": r'^[0-9a-fA-F:]*:[0-9a-fA-F:.]*$',
+    "iso_date": r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?$',
+    "credit_card": r'^\d{4}(?:[ -]?\d{4}){2}[ -]?\d{1,7}$',
+    "currency": r'^[-+]?(?:[$€£¥]\s?\d[\d,]*(?:\.\d{1,2})?|\d[\d,]*(?:\.\d{1,2})?\s?(?:USD|EUR|GBP|JPY))$',
     "phone": r'^\+?1?\d{9,15}$', # Simple phone regex
     "zipcode": r'^\d{5}(-\d{4})?$'
 }
 
-def detect_semantic_type(series: pd.Series) -> Optional[str]:
+
+def luhn_valid(value: str) -> bool:
+    """Luhn checksum used by payment card numbers."""
+    digits = [int(c) for c in value if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _valid_ip(version: int) -> Callable[[str], bool]:
+    def validator(value: str) -> bool:
+        try:
+            return ipaddress.ip_address(value).version == version
+        except ValueError:
+            return False
+    return validator
+
+
+VALIDATORS = {
+    "ipv4": _valid_ip(4),
+    "ipv6": _valid_ip(6),
+    "credit_card": luhn_valid,
+}
+
+
+class SemanticTypeEngine:
     """
-    Attempts to identify a semantic type for a string series.
-    Returns the type name if > 50% of non-null values match.
+    Detects semantic types with one precompiled alternation of all registered
+    patterns, so each value is matched once no matter how many detectors exist.
+    Distinct values are evaluated once and weighted by their counts. Large
+    columns are checked by sequential sampling: batches of rows are drawn until
+    a Hoeffding bound puts the leading type clearly above (or every type
+    clearly below) the threshold.
     """
-    if series.dtype != 'object':
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        confidence: float = 0.99,
+        batch_size: int = 64,
+        max_samples: int = 4096,
+        seed: int = 0
+    ):
+        self.threshold = threshold
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.max_samples = max_samples
+        self.seed = seed
+        self.detectors: Dict[str, Dict] = {}
+        self._combined: Optional[re.Pattern] = None
+
+    def register(self, name: str, pattern: str, validator: Optional[Callable[[str], bool]] = None):
+        """
+        Adds (or replaces) a detector. `validator` runs after a regex match,
+        e.g. a checksum; if it rejects the value, later detectors are tried.
+        """
+        self.detectors[name] = {"pattern": re.compile(pattern), "source": pattern, "validator": validator}
+        self._groups = list(self.detectors)
+        self._combined = re.compile("|".join(
+            f"(?P<d{i}>{detector['source']})" for i, detector in enumerate(self.detectors.values())
+        ))
+
+    def classify(self, value: str) -> Optional[str]:
+        """Returns the first registered semantic type that matches a value."""
+        match = self._combined.match(value) if self._combined else None
+        if not match:
+            return None
+        start = int(match.lastgroup[1:])
+        for name in self._groups[start:]:
+            detector = self.detectors[name]
+            if name != self._groups[start] and not detector["pattern"].match(value):
+                continue
+            if detector["validator"] is None or detector["validator"](value):
+                return name
         return None
-        
-    sample = series.dropna().head(100).astype(str)
-    if sample.empty:
+
+    def detect(self, series: pd.Series, value_counts: Optional[pd.Series] = None) -> Optional[str]:
+        """
+        Returns the type matching more than `threshold` of non-null values.
+        Pass the column's non-null `value_counts` to reuse an existing hash pass.
+        """
+        if not is_text_dtype(series):
+            return None
+
+        if value_counts is None:
+            value_counts = series.value_counts()
+        if value_counts.empty:
+            return None
+
+        values = value_counts.index.astype(str)
+        counts = value_counts.to_numpy()
+
+        # Small columns: every distinct value once, exact weighted shares
+        if len(values) <= self.batch_size:
+            shares: Dict[str, int] = {}
+            for value, count in zip(values, counts.tolist()):
+                semantic_type = self.classify(value)
+                if semantic_type:
+                    shares[semantic_type] = shares.get(semantic_type, 0) + count
+            return self._decide(shares, int(counts.sum()))
+
+        return self._detect_sequential(values, counts)
+
+    def _detect_sequential(self, values: pd.Index, counts: np.ndarray) -> Optional[str]:
+        rng = np.random.default_rng(self.seed)
+        cumulative = np.cumsum(counts)
+        looks = math.ceil(self.max_samples / self.batch_size)
+        # Union bound over every look keeps the overall error below 1 - confidence
+        log_term = math.log(2 * looks / (1 - self.confidence))
+
+        cache: Dict[int, Optional[str]] = {}
+        matched: Dict[str, int] = {}
+        sampled = 0
+        while sampled < self.max_samples:
+            # Drawing distinct values proportionally to their counts samples rows
+            rows = rng.integers(cumulative[-1], size=self.batch_size)
+            for index in np.searchsorted(cumulative, rows, side="right").tolist():
+                if index not in cache:
+                    cache[index] = self.classify(values[index])
+                if cache[index]:
+                    matched[cache[index]] = matched.get(cache[index], 0) + 1
+            sampled += self.batch_size
+
+            margin = math.sqrt(log_term / (2 * sampled))
+            leader = max(matched.values(), default=0) / sampled
+            if leader - margin > self.threshold:
+                return max(matched, key=matched.get)
+            if leader + margin < self.threshold:
+                return None
+
+        return self._decide(matched, sampled)
+
+    def _decide(self, matched: Dict[str, int], total: int) -> Optional[str]:
+        for name in self._groups:
+            if matched.get(name, 0) / total > self.threshold:
+                return name
         return None
-        
-    for type_name, pattern in PATTERNS.items():
-        matches = sample.str.match(pattern).sum()
-        if matches / len(sample) > 0.5:
-            return type_name
-            
-    return None
+
+
+semantic_engine = SemanticTypeEngine()
+for _name, _pattern in PATTERNS.items():
+    semantic_engine.register(_name, _pattern, VALIDATORS.get(_name))
+
+
+def register_semantic_type(name: str, pattern: str, validator: Optional[Callable[[str], bool]] = None):
+    """
+    Registers a custom semantic type on the shared detector engine.
+    """
+    semantic_engine.register(name, pattern, validator)
+
+
+def detect_semantic_type(series: pd.Series, value_counts: Optional[pd.Series] = None) -> Optional[str]:
+    """
+    Attempts to identify a semantic type for a string series.
+    Returns the type name if > 50% of non-null values match.
+    """
+    return semantic_engine.detect(series, value_counts)
@@ -0,0 +1,121 @@
+"""
+Benchmark: legacy per-analyzer column profiling vs the fused column kernel.
+
+Run from backend/:
+    python -m benchmarks.bench_column_kernel --rows 400000 --cols 120
+
+Reports wall time and the number of full-column pandas passes (Series method
+calls such as isna, dropna, value_counts, nunique, quantile, ...) for both paths,
+and checks that both paths produce identical metrics.
+"""
+import argparse
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from app.services.profiler.completeness import calculate_completeness
+from app.services.profiler.kernel import compute_column_metrics
+from app.services.profiler.outliers import detect_outliers
+from app.services.profiler.statistics import calculate_basic_stats, get_top_values
+from app.services.profiler.type_inference import infer_column_type
+
+SCAN_METHODS = [
+    "isna", "notna", "dropna", "value_counts", "nunique", "unique", "quantile",
+    "median", "min", "max", "mean", "std", "sum", "astype", "apply", "__eq__",
+    "__lt__", "__gt__", "__or__", "__getitem__",
+]
+
+
+def legacy_metrics(series: pd.Series, inferred_type: str) -> dict:
+    """The analyzer sequence profile_dataset ran before the fused kernel."""
+    completeness = calculate_completeness(series)
+    distinct_count = int(series.nunique())
+    return {
+        "null_count": completeness["null_count"],
+        "null_percentage": completeness["null_percentage"],
+        "empty_string_count": completeness["empty_string_count"],
+        "distinct_count": distinct_count,
+        "is_unique": distinct_count == len(series),
+        "stats": calculate_basic_stats(series, inferred_type),
+        "outliers": detect_outliers(series),
+        "top_values": get_top_values(series),
+    }
+
+
+def fused_metrics(series: pd.Series, inferred_type: str) -> dict:
+    metrics = compute_column_metrics(series, inferred_type)
+    # value_counts is handed on to the pattern analyzer, not part of the comparison
+    metrics.pop("value_counts")
+    return metrics
+
+
+@contextmanager
+def count_scans(counter: Counter):
+    """Counts calls to full-column Series methods while active."""
+    originals = {name: getattr(pd.Series, name) for name in SCAN_METHODS}
+
+    def wrap(name, func):
+        def wrapper(self, *args, **kwargs):
+            counter[name] += 1
+            return func(self, *args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(pd.Series, name, wrap(name, func))
+    try:
+        yield counter
+    finally:
+        for name, func in originals.items():
+            setattr(pd.Series, name, func)
+
+
+def make_frame(rows: int, cols: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"int_{i}"] = rng.integers(0, 10_000, rows)
+        elif kind == 1:
+            values = rng.normal(100, 15, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f"float_{i}"] = values
+        elif kind == 2:
+            data[f"cat_{i}"] = rng.choice(["alpha", "beta", "gamma", "", None], rows)
+        else:
+            data[f"str_{i}"] = [f"ID-{v}" for v in rng.integers(0, rows, rows)]
+    return pd.DataFrame(data)
+
+
+def run(df: pd.DataFrame, func) -> tuple:
+    types = {col: infer_column_type(df[col]) for col in df.columns}
+    counter = Counter()
+    start = time.perf_counter()
+    with count_scans(counter):
+        output = [func(df[col], types[col]) for col in df.columns]
+    return time.perf_counter() - start, sum(counter.values()), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--cols", type=int, default=120)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    legacy_time, legacy_scans, legacy_out = run(df, legacy_metrics)
+    fused_time, fused_scans, fused_out = run(df, fused_metrics)
+
+    print(f"Dataset: {args.rows:,} rows x {args.cols} columns")
+    print(f"{'path':<8}{'wall time (s)':>16}{'scans':>10}{'scans/col':>12}")
+    print(f"{'legacy':<8}{legacy_time:>16.3f}{legacy_scans:>10}{legacy_scans / args.cols:>12.1f}")
+    print(f"{'fused':<8}{fused_time:>16.3f}{fused_scans:>10}{fused_scans / args.cols:>12.1f}")
+    print(f"Speedup: {legacy_time / fused_time:.2f}x")
+    print(f"Identical output: {legacy_out == fused_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic datasets for profiler benchmarks.
+
+Columns cycle through the kinds the profiler meets in real uploads: integers,
+floats with outliers, low-cardinality categories, high-cardinality IDs,
+emails (some malformed), dates stored as text, messy free text (stray
+whitespace, mixed case, empty strings), booleans, timestamps and numbers
+stored as text. Every column gets the same null rate.
+
+Write one to disk from backend/:
+    python -m benchmarks.datasets --rows 1000000 --cols 50 --out /tmp/bench.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMN_KINDS = [
+    "int", "float", "category", "id", "email", "date_text",
+    "messy_text", "bool", "timestamp", "numeric_text",
+]
+
+# rows x cols presets; "wide" and "xl" cover the ends of the production range
+PRESETS = {
+    "smoke": (10_000, 5),
+    "small": (100_000, 20),
+    "medium": (1_000_000, 50),
+    "wide": (10_000, 5_000),
+    "xl": (5_000_000, 20),
+}
+
+
+def generate_dataset(
+    rows: int,
+    cols: int,
+    null_rate: float = 0.05,
+    cardinality: int = 1_000,
+    duplicate_rate: float = 0.01,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Builds a rows x cols frame of mixed, messy columns.
+    `cardinality` sets the number of distinct values in categorical and text
+    columns; `duplicate_rate` is the share of rows copied from earlier rows.
+    """
+    rng = np.random.default_rng(seed)
+    copies = int(rows * duplicate_rate) if rows > 1 else 0
+    targets = rng.integers(1, max(rows, 2), copies)
+    sources = (targets * rng.random(copies)).astype(np.int64)
+
+    data = {}
+    for i in range(cols):
+        kind = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        values = _make_column(kind, rows, cardinality, rng)
+        if null_rate and kind not in ("int", "bool"):
+            values[rng.random(rows) < null_rate] = _missing(values)
+        # Copy whole rows forward so duplicate detection has work to do
+        values[targets] = values[sources]
+        data[f"{kind}_{i}"] = values
+    return pd.DataFrame(data)
+
+
+def _missing(values: np.ndarray):
+    if values.dtype == object:
+        return None
+    if values.dtype.kind == "M":
+        return np.datetime64("NaT")
+    return np.nan
+
+
+def _make_column(kind: str, rows: int, cardinality: int, rng: np.random.Generator) -> np.ndarray:
+    # Text columns draw from a pool of distinct values, which keeps generation
+    # vectorised even at millions of rows
+    if kind == "int":
+        return rng.integers(0, 100_000, rows)
+    if kind == "float":
+        values = rng.normal(100, 15, rows)
+        values[rng.random(rows) < 0.01] *= 50
+        return values
+    if kind == "category":
+        pool = np.array([f"category_{j}" for j in range(min(cardinality, 50))], dtype=object)
+        return pool[rng.zipf(1.5, rows) % len(pool)]
+    if kind == "id":
+        return np.array(pd.Series(rng.integers(0, rows * 10, rows)).map("ID-{:08d}".format), dtype=object)
+    if kind == "email":
+        pool = np.array([f"user{j}@example{j % 7}.com" for j in range(cardinality)], dtype=object)
+        pool[::20] = "not-an-email"
+        return pool[rng.integers(0, len(pool), rows)]
+    if kind == "date_text":
+        days = pd.date_range("2015-01-01", periods=min(cardinality, 3_650), freq="D")
+        pool = np.array(days.strftime("%m/%d/%Y"), dtype=object)
+        return pool[rng.integers(0, len(pool), rows)]
+    if kind == "messy_text":
+        words = ["alpha", "Beta", " gamma", "DELTA ", "epsilon", "", "zeta eta", "theta-9"]
+        pool = np.array([f"{words[j % len(words)]}{j if j % 3 else ''}" for j in range(cardinality)], dtype=object)
+        return pool[rng.integers(0, len(pool), rows)]
+    if kind == "bool":
+        return rng.random(rows) < 0.3
+    if kind == "timestamp":
+        start = np.datetime64("2020-01-01T00:00:00")
+        return start + rng.integers(0, 5 * 365 * 86_400, rows).astype("timedelta64[s]")
+    if kind == "numeric_text":
+        pool = np.array([f"{v:.2f}" for v in rng.uniform(0, 10_000, cardinality)], dtype=object)
+        return pool[rng.integers(0, len(pool), rows)]
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--null-rate", type=float, default=0.05)
+    parser.add_argument("--cardinality", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True, help="Output path (.csv or .pkl)")
+    args = parser.parse_args()
+
+    df = generate_dataset(args.rows, args.cols, args.null_rate, args.cardinality, seed=args.seed)
+    if args.out.endswith(".pkl"):
+        df.to_pickle(args.out)
+    else:
+        df.to_csv(args.out, index=False)
+    print(f"Wrote {len(df):,} rows x {len(df.columns)} columns to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
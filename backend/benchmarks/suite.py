@@ -0,0 +1,335 @@
+"""
+Profiler benchmark suite: parsing, each analyzer and profile_dataset end to end.
+
+Run from backend/:
+    python -m benchmarks.suite --preset small
+    python -m benchmarks.suite --preset small --save-baseline main
+    python -m benchmarks.suite --preset small --compare main
+
+Each case runs in a fresh spawned process on a dataset from
+benchmarks.datasets, so peak RSS is measured per case. Reported time is the
+fastest of --repeat runs (median alongside). Baselines are JSON files in
+benchmarks/baselines/; --compare prints a regression report and exits with
+status 1 when any case is slower than the baseline by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datasets import PRESETS, generate_dataset
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def _each_column(func: Callable) -> Callable:
+    def run(df: pd.DataFrame, context: Dict[str, Any]):
+        for col in df.columns:
+            func(df[col], context["types"][col])
+    return run
+
+
+def _parse_csv(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.utils.file_parser import parse_file
+    parse_file(context["csv"], "bench.csv")
+
+
+def _type_inference(series: pd.Series, inferred_type: str):
+    from app.services.profiler.type_inference import infer_column_type_details
+    infer_column_type_details(series)
+
+
+def _semantic_detection(series: pd.Series, inferred_type: str):
+    from app.utils.semantic_types import detect_semantic_type
+    detect_semantic_type(series)
+
+
+def _completeness(series: pd.Series, inferred_type: str):
+    from app.services.profiler.completeness import calculate_completeness
+    calculate_completeness(series)
+
+
+def _basic_stats(series: pd.Series, inferred_type: str):
+    from app.services.profiler.statistics import calculate_basic_stats
+    calculate_basic_stats(series, inferred_type)
+
+
+def _outliers(series: pd.Series, inferred_type: str):
+    from app.services.profiler.outliers import detect_outliers
+    detect_outliers(series)
+
+
+def _top_values(series: pd.Series, inferred_type: str):
+    from app.services.profiler.statistics import get_top_values
+    get_top_values(series)
+
+
+def _patterns(series: pd.Series, inferred_type: str):
+    from app.services.profiler.patterns import analyze_patterns
+    analyze_patterns(series, coarse=True)
+
+
+def _column_kernel(series: pd.Series, inferred_type: str):
+    from app.services.profiler.kernel import compute_column_metrics
+    compute_column_metrics(series, inferred_type)
+
+
+def _duplicates(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.duplicates import find_duplicate_rows
+    find_duplicate_rows(df)
+
+
+def _profile_dataset(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.engine import profile_dataset
+    profile_dataset(df, workers=0)
+
+
+def _profile_wide(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.engine import profile_dataset
+    profile_dataset(df, workers=0, wide_min_columns=1)
+
+
+def _profile_chunks(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.streaming import profile_chunks, iter_row_chunks
+    from app.utils.file_parser import CHUNK_ROWS
+    profile_chunks(iter_row_chunks(df, CHUNK_ROWS))
+
+
+def _profile_sample(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.sampling import profile_sample
+    from app.services.profiler.streaming import iter_row_chunks
+    from app.utils.file_parser import CHUNK_ROWS
+    profile_sample(iter_row_chunks(df, CHUNK_ROWS))
+
+
+def _profile_polars(df: pd.DataFrame, context: Dict[str, Any]):
+    from app.services.profiler.polars_engine import profile_polars
+    from app.utils.file_parser import scan_file
+    profile_polars(scan_file(context["csv"], "bench.csv"))
+
+
+CASES: Dict[str, Callable] = {
+    "parse_csv": _parse_csv,
+    "type_inference": _each_column(_type_inference),
+    "semantic_detection": _each_column(_semantic_detection),
+    "completeness": _each_column(_completeness),
+    "basic_stats": _each_column(_basic_stats),
+    "outliers": _each_column(_outliers),
+    "top_values": _each_column(_top_values),
+    "patterns": _each_column(_patterns),
+    "column_kernel": _each_column(_column_kernel),
+    "duplicates": _duplicates,
+    "profile_dataset": _profile_dataset,
+    "profile_wide": _profile_wide,
+    "profile_chunks": _profile_chunks,
+    "profile_sample": _profile_sample,
+    "profile_polars": _profile_polars,
+}
+
+
+def _reset_peak_rss() -> bool:
+    """Resets the kernel's peak RSS counter (Linux 4.0+)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return _peak_rss_bytes()
+
+
+def _run_case(name: str, dataset_path: str, repeat: int) -> Dict[str, Any]:
+    """Child-process entry point: loads the dataset and times one case."""
+    from app.services.profiler.type_inference import infer_column_type
+
+    df = pd.read_pickle(dataset_path)
+    context = {"types": {col: infer_column_type(df[col]) for col in df.columns}}
+    if name in ("parse_csv", "profile_polars"):
+        context["csv"] = df.to_csv(index=False).encode("utf-8")
+
+    case = CASES[name]
+    # Warm-up run: imports, regex compilation and allocator growth are not measured
+    case(df, context)
+
+    times = []
+    rss_before = _current_rss_bytes()
+    exact_rss = _reset_peak_rss()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(df, context)
+        times.append(time.perf_counter() - start)
+    peak = _peak_rss_bytes()
+
+    return {
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "peak_rss_mb": max(peak - rss_before, 0) / (1024 * 1024),
+        "rss_exact": exact_rss,
+    }
+
+
+def run_suite(rows: int, cols: int, cases: List[str], repeat: int = 3, seed: int = 42) -> Dict[str, Any]:
+    """Runs the selected cases and returns results with environment metadata."""
+    df = generate_dataset(rows, cols, seed=seed)
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = os.path.join(tmp, "dataset.pkl")
+        df.to_pickle(dataset_path)
+        del df
+        for name in cases:
+            # A fresh process per case keeps peak RSS and allocator state independent
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                results[name] = pool.submit(_run_case, name, dataset_path, repeat).result()
+            print(f"  {name:<20}{results[name]['seconds_min']:>10.3f}s{results[name]['peak_rss_mb']:>10.1f} MB", flush=True)
+
+    return {
+        "meta": {
+            "rows": rows,
+            "cols": cols,
+            "seed": seed,
+            "repeat": repeat,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Per-case time and memory ratios against a baseline. A case regresses when
+    its fastest time exceeds the baseline's by more than `threshold`.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append({"case": name, "status": "new", **result})
+            continue
+        time_ratio = result["seconds_min"] / base["seconds_min"] if base["seconds_min"] else float("inf")
+        rss_ratio = result["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] else None
+        if time_ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif time_ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({
+            "case": name,
+            "status": status,
+            "baseline_seconds": base["seconds_min"],
+            "seconds_min": result["seconds_min"],
+            "time_ratio": time_ratio,
+            "baseline_rss_mb": base["peak_rss_mb"],
+            "peak_rss_mb": result["peak_rss_mb"],
+            "rss_ratio": rss_ratio,
+        })
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]], baseline_meta: Dict[str, Any], current_meta: Dict[str, Any]) -> str:
+    lines = [
+        f"Baseline: {baseline_meta['rows']:,} x {baseline_meta['cols']} on {baseline_meta['machine']}, pandas {baseline_meta['pandas']} ({baseline_meta['created']})",
+        f"Current:  {current_meta['rows']:,} x {current_meta['cols']} on {current_meta['machine']}, pandas {current_meta['pandas']}",
+        "",
+        f"{'case':<20}{'baseline s':>12}{'current s':>12}{'ratio':>8}{'base MB':>10}{'cur MB':>10}  status",
+    ]
+    for row in rows:
+        if row["status"] == "new":
+            lines.append(f"{row['case']:<20}{'-':>12}{row['seconds_min']:>12.3f}{'-':>8}{'-':>10}{row['peak_rss_mb']:>10.1f}  new")
+            continue
+        lines.append(
+            f"{row['case']:<20}{row['baseline_seconds']:>12.3f}{row['seconds_min']:>12.3f}{row['time_ratio']:>8.2f}"
+            f"{row['baseline_rss_mb']:>10.1f}{row['peak_rss_mb']:>10.1f}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def _baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--rows", type=int, help="Overrides the preset row count")
+    parser.add_argument("--cols", type=int, help="Overrides the preset column count")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the results JSON here")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="Baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    rows, cols = PRESETS[args.preset]
+    rows = args.rows or rows
+    cols = args.cols or cols
+    cases = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    print(f"Benchmarking {rows:,} rows x {cols} columns ({args.repeat} runs per case)")
+    current = run_suite(rows, cols, cases, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(_baseline_path(args.save_baseline), "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline '{args.save_baseline}'")
+
+    if args.compare:
+        with open(_baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        if (baseline["meta"]["rows"], baseline["meta"]["cols"]) != (rows, cols):
+            print("Warning: baseline was recorded on a different dataset size")
+        report = compare(baseline, current, args.threshold)
+        print()
+        print(format_report(report, baseline["meta"], current["meta"]))
+        if any(row["status"] == "REGRESSION" for row in report):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
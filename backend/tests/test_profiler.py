@@ -66,3 +66,941 @@ def test_scoring_logic():
     assert messy_col['quality_score'] < 100
     assert 'quality_grade' in results['summary']
     assert results['issues_summary']['critical'] > 0 or results['issues_summary']['warning'] > 0
+
+def test_fused_kernel_matches_analyzers():
+    from app.services.profiler.kernel import compute_column_metrics
+    from app.services.profiler.type_inference import infer_column_type
+    from app.services.profiler.completeness import calculate_completeness
+    from app.services.profiler.statistics import calculate_basic_stats, get_top_values
+
+    df = pd.DataFrame({
+        'i': [5, 1, 3, 3, 100, 2],
+        'f': [1.5, None, 2.25, 3.0, -40.0, 2.0],
+        's': ['a', 'bb', '', None, 'bb', 'ccc'],
+        'm': [1, '1', 1.0, None, 'x', 2.5]
+    })
+    for col in df.columns:
+        series = df[col]
+        inferred_type = infer_column_type(series)
+        metrics = compute_column_metrics(series, inferred_type)
+        completeness = calculate_completeness(series)
+
+        assert metrics['null_count'] == completeness['null_count']
+        assert metrics['null_percentage'] == completeness['null_percentage']
+        assert metrics['empty_string_count'] == completeness['empty_string_count']
+        assert metrics['distinct_count'] == series.nunique()
+        assert metrics['stats'] == calculate_basic_stats(series, inferred_type)
+        assert metrics['outliers'] == detect_outliers(series)
+        assert metrics['top_values'] == get_top_values(series)
+
+def test_parallel_profiling_matches_serial():
+    df = pd.DataFrame({
+        'id': range(6),
+        'name': ['a', 'b', None, 'dd', 'a', 'ABC-123'],
+        'score': [1.5, None, 3.0, 4.0, 100.0, 2.0],
+        'when': pd.date_range('2024-01-01', periods=6),
+        'mixed': [1, 'x', None, 2.5, 'x', 1]
+    })
+    serial = profile_dataset(df, workers=0)
+    parallel = profile_dataset(df, workers=2, parallel_min_cells=0)
+    assert parallel == serial
+    assert [c['name'] for c in parallel['columns']] == list(df.columns)
+
+def test_parallel_pool_and_shared_memory_outlive_their_users():
+    import numpy as np
+    from multiprocessing import shared_memory
+    from app.services.profiler import parallel
+
+    # A run that borrowed the pool keeps it after another run changes the worker count
+    with parallel._borrow_pool(2) as first:
+        with parallel._borrow_pool(3) as second:
+            assert second is not first
+        assert first.submit(abs, -1).result() == 1
+    with pytest.raises(RuntimeError):
+        first.submit(abs, -1)
+    parallel.shutdown_pool()
+
+    # A view still held when the block is closed must not replace the error being raised
+    shm = shared_memory.SharedMemory(create=True, size=64)
+    view = np.frombuffer(shm.buf, dtype=np.uint8)
+    parallel._close_shared(shm)
+    del view
+    shm.close()
+    shm.unlink()
+
+def test_chunked_profiling_matches_in_memory():
+    from app.services.profiler.streaming import profile_chunks
+    from app.utils.file_parser import parse_file_chunks
+
+    rows = ["id,name,score"] + [f"{i},{'user_' + str(i % 7) if i % 5 else ''},{i % 13}" for i in range(1, 101)]
+    rows[50] = "50,user_1,1000"
+    content = "\n".join(rows).encode()
+
+    full = profile_dataset(parse_file(content, "data.csv"))
+    streamed = profile_chunks(parse_file_chunks(content, "data.csv", chunksize=17, csv_text=True), csv_text=True)
+
+    assert streamed['summary']['row_count'] == full['summary']['row_count']
+    assert streamed['summary']['duplicate_rows'] == full['summary']['duplicate_rows']
+    for expected, actual in zip(full['columns'], streamed['columns']):
+        assert actual['name'] == expected['name']
+        assert actual['inferred_type'] == expected['inferred_type']
+        assert actual['null_count'] == expected['null_count']
+        assert actual['distinct_count'] == expected['distinct_count']
+        assert actual['outliers'] == expected['outliers']
+        assert actual['patterns'] == expected['patterns']
+        assert actual['stats'].keys() == expected['stats'].keys()
+        for key, value in expected['stats'].items():
+            assert actual['stats'][key] == pytest.approx(value)
+
+def assert_matches_in_memory(streamed, full):
+    """A chunked profile equals the in-memory one, up to float rounding in stats and memory."""
+    assert streamed['summary'].pop('estimated_fields') == ['duplicate_rows']
+    assert streamed['summary'] == pytest.approx(full['summary'])
+    assert len(streamed['columns']) == len(full['columns'])
+    for expected, actual in zip(full['columns'], streamed['columns']):
+        expected_stats, actual_stats = expected.pop('stats'), actual.pop('stats')
+        assert actual_stats == pytest.approx(expected_stats)
+        assert actual == expected
+
+def test_chunked_csv_profiling_types_columns_for_the_whole_file():
+    from app.services.profiler.streaming import profile_chunks
+    from app.utils.file_parser import parse_file_chunks
+
+    # pandas would read "code" as int in the first two chunks and as text in the last,
+    # and "qty" as int, then float once a cell is missing
+    rows = ["code,qty,flag,price"] + [
+        f"{'unknown' if i == 2500 else i % 21},{'' if i == 2200 else i % 7},{['True', 'false', 'TRUE'][i % 3]},{(i % 50) / 4}"
+        for i in range(3000)
+    ]
+    content = "\n".join(rows).encode()
+
+    full = profile_dataset(parse_file(content, "data.csv"))
+    streamed = profile_chunks(parse_file_chunks(content, "data.csv", chunksize=1000, csv_text=True), csv_text=True)
+
+    assert_matches_in_memory(streamed, full)
+    assert streamed['columns'][0]['distinct_count'] == 22
+
+def test_chunked_profiling_sketches_columns_past_the_distinct_limit(monkeypatch):
+    import app.services.profiler.accumulators as accumulators
+    from app.services.profiler.streaming import profile_chunks, iter_row_chunks
+
+    monkeypatch.setattr(accumulators, "EXACT_DISTINCT_LIMIT", 500)
+    df = pd.DataFrame({
+        'id': range(3000),
+        'code': [f"c{i}" for i in range(3000)],
+        'group': [f"g{i % 40}" for i in range(3000)],
+    })
+    results = profile_chunks(iter_row_chunks(df, 400))
+    ids, codes, groups = results['columns']
+    assert 'approximation' in results
+    assert 'distinct_count' in ids['estimated_fields'] and 'estimated_fields' in codes
+    assert ids['distinct_count'] == pytest.approx(3000, rel=0.03)
+    assert ids['stats']['median'] == pytest.approx(1499.5, rel=0.05)
+    assert ids['stats']['mean'] == pytest.approx(1499.5)
+    # Low-cardinality columns stay exact
+    assert 'estimated_fields' not in groups
+    assert groups['distinct_count'] == 40 and groups['top_values'][0]['count'] == 75
+
+def test_approximate_mode_reports_estimates():
+    df = pd.DataFrame({
+        'id': range(2000),
+        'group': [f"g{i % 40}" for i in range(2000)],
+        'value': [float(i % 100) for i in range(2000)]
+    })
+    results = profile_dataset(df, approximate=True)
+    assert 'approximation' in results
+
+    id_col = next(c for c in results['columns'] if c['name'] == 'id')
+    group_col = next(c for c in results['columns'] if c['name'] == 'group')
+    value_col = next(c for c in results['columns'] if c['name'] == 'value')
+    assert 'distinct_count' in id_col['estimated_fields']
+    assert id_col['distinct_count'] == pytest.approx(2000, rel=0.03)
+    assert group_col['distinct_count'] == 40
+    assert group_col['top_values'][0]['count'] == 50
+    assert value_col['stats']['median'] == pytest.approx(49.5, abs=3)
+
+    # Options the sketch path cannot honour are rejected rather than ignored
+    for options in [{'duplicate_groups': 3}, {'compact': True}, {'workers': 4}, {'level': 'standard'}]:
+        with pytest.raises(ValueError):
+            profile_dataset(df, approximate=True, **options)
+
+def test_sketches_merge_after_serialisation():
+    from app.services.profiler.sketches import HyperLogLog, KLLSketch, MisraGries
+
+    left, right = HyperLogLog(), HyperLogLog()
+    left.add(list(range(0, 6000)))
+    right.add(list(range(3000, 9000)))
+    merged = HyperLogLog.from_dict(left.to_dict())
+    merged.merge(HyperLogLog.from_dict(right.to_dict()))
+    assert merged.count() == pytest.approx(9000, rel=0.03)
+
+    quantiles = KLLSketch()
+    quantiles.update(range(0, 5000))
+    other = KLLSketch()
+    other.update(range(5000, 10000))
+    quantiles = KLLSketch.from_dict(quantiles.to_dict())
+    quantiles.merge(KLLSketch.from_dict(other.to_dict()))
+    assert quantiles.n == 10000
+    assert quantiles.quantile(0.5) == pytest.approx(5000, abs=250)
+
+    heavy = MisraGries(capacity=10)
+    heavy.update_counts([('a', 500)] + [(f"x{i}", 1) for i in range(100)])
+    heavy = MisraGries.from_dict(heavy.to_dict())
+    top_value, top_count = heavy.top(1)[0]
+    assert top_value == 'a'
+    assert 500 - heavy.error_bound <= top_count <= 500
+
+def test_duplicate_detection_with_top_groups():
+    from app.services.profiler.duplicates import find_duplicate_rows
+
+    df = pd.DataFrame({
+        'a': [1, 2, 1, 3, 1, None, None],
+        'b': ['x', 'y', 'x', 'z', 'x', None, None]
+    })
+    duplicates = find_duplicate_rows(df, top_groups=2)
+    assert duplicates['duplicate_rows'] == int(df.duplicated().sum()) == 3
+    assert duplicates['top_groups'][0] == {'row': {'a': '1.0', 'b': 'x'}, 'count': 3, 'row_positions': [0, 2, 4]}
+    assert duplicates['top_groups'][1]['row'] == {'a': None, 'b': None}
+
+    results = profile_dataset(df, duplicate_groups=1)
+    assert results['summary']['duplicate_rows'] == 3
+    assert len(results['summary']['duplicate_groups']) == 1
+
+def test_pattern_analysis_covers_full_column():
+    series = pd.Series(['AB-12'] * 600 + ['ab_1'] * 400 + [None])
+    patterns = analyze_patterns(series, coarse=True)
+    assert patterns['top_patterns'] == [
+        {'pattern': 'AA-99', 'percentage': 60.0},
+        {'pattern': 'aa_9', 'percentage': 40.0}
+    ]
+    assert patterns['top_coarse_patterns'][0] == {'pattern': 'A+-9+', 'percentage': 60.0}
+    assert all(type(p['percentage']) is float for p in patterns['top_patterns'] + patterns['top_coarse_patterns'])
+
+    from app.services.profiler.patterns import summarize_pattern_counts
+    import numpy as np
+    summary = summarize_pattern_counts({'AA-99': np.int64(3), 'aa_9': np.int64(1)})
+    assert [type(p['percentage']) for p in summary['top_patterns']] == [float, float]
+
+def test_semantic_detectors_and_registry():
+    from app.utils.semantic_types import SemanticTypeEngine, PATTERNS, VALIDATORS
+
+    engine = SemanticTypeEngine()
+    for name, pattern in PATTERNS.items():
+        engine.register(name, pattern, VALIDATORS.get(name))
+    assert engine.classify('4111 1111 1111 1111') == 'credit_card'
+    assert engine.classify('4111111111111112') is None # fails Luhn
+    assert engine.classify('10.0.0.1') == 'ipv4'
+    assert engine.classify('2001:db8::1') == 'ipv6'
+    assert engine.classify('2024-05-01T10:30:00Z') == 'iso_date'
+    assert engine.classify('$1,200.50') == 'currency'
+
+    engine.register('sku', r'^SKU-\d{6}$')
+    # Distinct values are weighted by count and large columns are sampled
+    skus = pd.Series([f"SKU-{i:06d}" for i in range(5000)] * 2 + ['n/a'] * 3000)
+    assert engine.detect(skus) == 'sku'
+    assert engine.detect(pd.Series(['SKU-000001'] * 2 + ['n/a'] * 3)) is None
+
+def test_string_type_inference_resolves_formats():
+    from app.services.profiler.type_inference import infer_column_type_details
+    from app.services.profiler.statistics import calculate_basic_stats
+
+    dates = pd.Series(['03/14/2024', '12/01/2023', None, '07/04/2024'])
+    details = infer_column_type_details(dates)
+    assert details == {'type': 'datetime', 'datetime_format': '%m/%d/%Y'}
+    stats = calculate_basic_stats(dates, 'datetime', details['datetime_format'])
+    assert stats == {'min': '2023-12-01T00:00:00', 'max': '2024-07-04T00:00:00'}
+
+    assert infer_column_type_details(pd.Series([' 1.5', '2', '-3e2']))['type'] == 'float'
+    assert infer_column_type_details(pd.Series(['007', '123']))['type'] == 'string'
+    assert infer_column_type_details(pd.Series(['Yes', 'no', 'TRUE']))['type'] == 'boolean'
+    assert infer_column_type_details(pd.Series(['hello 1', 'world 2']))['type'] == 'string'
+
+    results = profile_dataset(pd.DataFrame({'n': ['10', '20', '30', None]}))
+    assert results['columns'][0]['inferred_type'] == 'integer'
+    assert results['columns'][0]['stats']['mean'] == 20.0
+
+def test_profile_dataset_timings():
+    from app.services.profiler.instrumentation import profiler_metrics
+
+    profiler_metrics.reset()
+    df = pd.DataFrame({'a': [1, 2, 3, 100], 'b': ['x@y.com', 'z@y.com', None, 'q@y.com']})
+    results = profile_dataset(df, timings=True, trace_memory=True)
+
+    timings = results['timings']
+    assert timings['memory_traced'] is True
+    for stage in ['type_inference', 'semantic_detection', 'completeness', 'stats',
+                  'outliers', 'patterns', 'top_values', 'duplicates']:
+        assert stage in timings['stages']
+    assert [c['name'] for c in timings['columns']] == ['a', 'b']
+    assert timings['columns'][0]['stages']['completeness']['rows'] == 4
+
+    assert 'timings' not in profile_dataset(df)
+    stats = profiler_metrics.get_stats()
+    assert stats['datasets_profiled'] == 2
+    assert stats['stages']['duplicates']['calls'] == 2
+    assert len(stats['slowest_columns']) == 4
+    assert all('name' not in column and 'completeness' in column['stages'] for column in stats['slowest_columns'])
+
+def test_memory_peaks_are_not_reported_while_runs_overlap():
+    from app.services.profiler.instrumentation import memory_tracing
+
+    df = pd.DataFrame({'a': list(range(1000))})
+    solo = profile_dataset(df, timings=True, trace_memory=True)
+    assert solo['timings']['stages']['stats']['peak_bytes'] is not None
+
+    # Another run in flight shares tracemalloc, so no stage peak is trustworthy
+    memory_tracing.begin(False)
+    try:
+        overlapped = profile_dataset(df, timings=True, trace_memory=True)
+    finally:
+        memory_tracing.end(False)
+    assert overlapped['timings']['stages']['stats']['peak_bytes'] is None
+
+def test_profiling_executor_rejects_when_full():
+    import threading
+    from app.services.profiling_executor import ProfilingExecutor, QueueFullError
+
+    executor = ProfilingExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    first = executor.submit(release.wait)
+    second = executor.submit(lambda: 'done')
+    assert executor.is_full()
+    with pytest.raises(QueueFullError):
+        executor.submit(lambda: None)
+
+    release.set()
+    assert second.result(timeout=5) == 'done'
+    first.result(timeout=5)
+    stats = executor.get_stats()
+    assert (stats['completed'], stats['rejected'], stats['queued']) == (2, 1, 0)
+    assert executor.retry_after() >= 1
+    executor.shutdown()
+
+def test_redis_job_store_shares_jobs_across_managers():
+    import fakeredis
+    from app.services.job_manager import JobManager
+    from app.services.job_store import RedisJobStore
+
+    server = fakeredis.FakeServer()
+    # Two managers stand in for two uvicorn workers sharing one Redis
+    upload_worker = JobManager(store=RedisJobStore(fakeredis.FakeRedis(server=server)))
+    poll_worker = JobManager(store=RedisJobStore(fakeredis.FakeRedis(server=server)))
+
+    job_id = upload_worker.create_job('data.csv')
+    assert poll_worker.get_job(job_id)['status'] == 'processing'
+
+    results = profile_dataset(pd.DataFrame({'a': [1, 2, 3]}))
+    upload_worker.update_job(job_id, 'completed', result=results)
+    poll_worker.cache_insights(job_id, 'model-a', {'summary': 'ok'})
+
+    job = upload_worker.get_job(job_id)
+    assert job['result'] == results
+    assert job['insights_cache'] == {'model-a': {'summary': 'ok'}}
+    assert poll_worker.get_stats()['jobs_by_status']['completed'] == 1
+    assert poll_worker.get_job_status(job_id) == 'completed'
+    assert 0 < fakeredis.FakeRedis(server=server).ttl(f"tdprofiler:job:{job_id}") <= 3600
+
+    poll_worker.delete_job(job_id)
+    upload_worker.update_job(job_id, 'failed')
+    assert upload_worker.get_job(job_id) is None
+    assert upload_worker.get_job_status(job_id) is None
+
+def test_in_memory_job_store_budget_and_expiry():
+    from app.services.job_manager import JobManager
+    from app.services.job_store import InMemoryJobStore, payload_size
+
+    result = {'columns': [{'name': 'x' * 100}]}
+    store = InMemoryJobStore(expiration_minutes=1, memory_budget_bytes=payload_size(result) * 2, reaper_interval=0)
+    now = [0.0]
+    store.clock = lambda: now[0]
+    manager = JobManager(store=store)
+
+    first, second, third = (manager.create_job(f"{i}.csv") for i in range(3))
+    manager.update_job(first, 'completed', result=result)
+    manager.update_job(second, 'completed', result=result)
+    manager.get_job(first)  # first becomes most recently used
+    manager.update_job(third, 'completed', result=result)
+
+    assert manager.get_job(second) is None
+    assert manager.get_job(first) is not None and manager.get_job(third) is not None
+    stats = manager.get_stats()
+    assert stats['store']['evictions'] == 1
+    assert stats['store']['resident_bytes'] == payload_size(result) * 2
+    assert stats['jobs_by_status']['completed'] == 2
+
+    now[0] = 61
+    manager.create_job('late.csv')  # pops due deadlines from the heap
+    assert manager.get_stats()['total_jobs'] == 1
+    assert manager.get_stats()['store']['expirations'] == 2
+    assert manager.get_stats()['store']['resident_bytes'] == 0
+
+    # A running job holding a quick preview is never evicted
+    running = manager.create_job('running.csv')
+    manager.update_job(running, 'processing', result=result)
+    for name in ('a.csv', 'b.csv'):
+        manager.update_job(manager.create_job(name), 'completed', result=result)
+    assert manager.get_job(running)['status'] == 'processing'
+    assert manager.get_stats()['store']['evictions'] == 2
+
+def test_result_cache_single_flight_and_eviction():
+    from app.services.job_store import payload_size
+    from app.services.result_cache import ResultCache, make_cache_key, content_hasher, cached_copy
+
+    hasher = content_hasher()
+    hasher.update(b"a,b\n1,2\n")
+    key = make_cache_key(hasher.hexdigest(), approximate=False, extension='csv')
+    assert key == make_cache_key(hasher.hexdigest(), extension='csv', approximate=False)
+
+    result = {'summary': {'row_count': 1}, 'timings': {'total_seconds': 0.5}}
+    # Hits are marked as such and do not report the leader's timings
+    assert cached_copy(result) == {'summary': {'row_count': 1}, 'cached': True}
+    cache = ResultCache(max_bytes=payload_size(cached_copy(result)), max_entries=10)
+    assert cache.lookup(key, 'job-1') == ('leader', None)
+    assert cache.lookup(key, 'job-2') == ('joined', None)
+    assert cache.complete(key, result) == ['job-2']
+    assert cache.lookup(key, 'job-3') == ('hit', cached_copy(result))
+
+    # A second result pushes the first out of the byte budget
+    cache.lookup('other', 'job-4')
+    cache.complete('other', {'summary': {'row_count': 2}})
+    assert cache.lookup(key, 'job-5') == ('leader', None)
+    assert cache.fail(key) == []
+    assert cache.get_stats()['evictions'] == 1
+
+def test_incremental_profiling_reuses_appended_prefix():
+    from app.services.profiler.streaming import profile_chunks
+    from app.services.profiler.incremental import ChunkCache
+    from app.utils.file_parser import parse_file_chunks
+
+    # The appended rows turn "score" from integers into text and leave a "qty" cell empty
+    rows = ["id,name,score,qty"] + [f"{i},{'user_' + str(i % 7) if i % 5 else ''},{i % 13},{i % 4}" for i in range(1, 121)]
+    rows[110] = "110,user_5,unknown,"
+    snapshot = "\n".join(rows[:101]).encode()
+    appended = "\n".join(rows).encode()
+
+    def chunks(content):
+        return parse_file_chunks(content, "data.csv", chunksize=20, csv_text=True)
+
+    cache = ChunkCache()
+    first = profile_chunks(chunks(snapshot), chunk_cache=cache, csv_text=True)
+    assert first.pop('incremental') == {'chunks': 5, 'reused_chunks': 0}
+    assert_matches_in_memory(first, profile_dataset(parse_file(snapshot, "data.csv")))
+
+    second = profile_chunks(chunks(appended), chunk_cache=cache, csv_text=True)
+    assert second.pop('incremental') == {'chunks': 6, 'reused_chunks': 5}
+    assert second == profile_chunks(chunks(appended), csv_text=True)
+
+    df = parse_file(appended, "data.csv")
+    assert [str(dtype) for dtype in df.dtypes] == ['int64', 'object', 'object', 'float64']
+    assert_matches_in_memory(second, profile_dataset(df))
+
+def test_parse_file_reads_spooled_path(tmp_path):
+    from app.utils.file_parser import parse_file_chunks
+
+    content = b"id,name\n1,Alice\n2,Bob\n3,Carol"
+    path = tmp_path / "upload-spool"
+    path.write_bytes(content)
+
+    assert parse_file(str(path), "test.csv").equals(parse_file(content, "test.csv"))
+    with parse_file_chunks(str(path), "test.csv", chunksize=2) as chunks:
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+
+def test_polars_engine_matches_pandas_engine():
+    from app.services.profiler.polars_engine import profile_polars
+    from app.utils.file_parser import scan_file
+
+    rows = ["id,name,score,joined,flag"] + [
+        f"{i},{'user_' + str(i % 7) if i % 5 else ''},{i % 13},2024-01-{i % 28 + 1:02d},{'true' if i % 2 else 'false'}"
+        for i in range(1, 201)
+    ]
+    rows[50] = "50,user_1,1000,2024-02-01,true"
+    rows += [rows[10], rows[10]]
+    content = "\n".join(rows).encode()
+
+    expected = profile_dataset(parse_file(content, "data.csv"), duplicate_groups=1)
+    actual = profile_polars(scan_file(content, "data.csv"), duplicate_groups=1)
+
+    assert actual.keys() == expected.keys()
+    assert actual['summary'].keys() == expected['summary'].keys()
+    assert actual['summary']['duplicate_rows'] == expected['summary']['duplicate_rows'] == 2
+    assert actual['summary']['duplicate_groups'][0]['row_positions'] == [9, 200, 201]
+    for want, got in zip(expected['columns'], actual['columns']):
+        assert got.keys() == want.keys()
+        for key in ['name', 'inferred_type', 'semantic_type', 'null_count', 'distinct_count', 'outliers', 'patterns', 'quality_score']:
+            assert got[key] == want[key], (want['name'], key)
+        if want['inferred_type'] == 'datetime':
+            assert got['stats'] == want['stats']
+        else:
+            assert got['stats'] == pytest.approx(want['stats'])
+        assert sorted(v['count'] for v in got['top_values']) == sorted(v['count'] for v in want['top_values'])
+
+def test_parquet_statistics_profile_constant_and_null_columns(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from app.utils.file_parser import parquet_statistics
+    from app.services.profiler.metadata import profiles_from_statistics
+
+    df = pd.DataFrame({
+        "id": range(300),
+        "region": ["eu"] * 300,
+        "flag": pd.array([None] * 300, dtype="Int64"),
+        "score": [i % 7 for i in range(300)],
+    })
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=100)
+
+    total_rows, names, statistics = parquet_statistics(str(path))
+    assert total_rows == 300 and names == list(df.columns)
+    known = profiles_from_statistics(total_rows, statistics, names)
+    assert sorted(known) == ["flag", "region"]
+
+    expected = {col['name']: col for col in profile_dataset(parse_file(str(path), "data.parquet"))['columns']}
+    for name, profile in known.items():
+        assert profile == expected[name]
+
+    projected = parse_file(str(path), "data.parquet", columns=["score"])
+    assert list(projected.columns) == ["score"]
+
+def test_parse_ndjson_and_arrow_ipc(tmp_path):
+    import pyarrow.feather as feather
+    from app.utils.file_parser import parse_file_chunks
+
+    df = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+    ndjson = df.to_json(orient="records", lines=True).encode()
+    arrow = tmp_path / "data.arrow"
+    feather.write_feather(df, arrow)
+
+    assert parse_file(ndjson, "data.ndjson").equals(df)
+    assert parse_file(str(arrow), "data.arrow").equals(df)
+    for source, filename in [(ndjson, "data.jsonl"), (str(arrow), "data.feather")]:
+        chunks = parse_file_chunks(source, filename, chunksize=2, columns=["name"])
+        assert [list(chunk["name"]) for chunk in chunks] == [["a", "b"], ["c"]]
+
+def test_compressed_uploads_and_decompression_guard(tmp_path):
+    import gzip
+    import zipfile
+    from app.routers.upload import _profile_upload
+    from app.utils.compression import split_compression, DecompressionLimitError, decompress_file, iter_zip_members
+
+    assert split_compression("data.csv.gz") == ("data.csv", "gzip")
+    assert split_compression("Data.NDJSON.ZST") == ("Data.NDJSON", "zstd")
+    assert split_compression("export.zip") == ("export.zip", "zip")
+    assert split_compression("data.csv") == ("data.csv", None)
+
+    content = b"id,name\n1,Alice\n2,Bob\n3,Carol"
+    expected = profile_dataset(parse_file(content, "data.csv"))
+    compressed = tmp_path / "data.csv.gz"
+    compressed.write_bytes(gzip.compress(content))
+    assert _profile_upload(str(compressed), "data.csv.gz", False, 0, False)['columns'] == expected['columns']
+
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.csv", content)
+        zf.writestr("b.csv", b"x\n1\n2")
+    results = _profile_upload(str(archive), "export.zip", False, 0, False)
+    assert [f['filename'] for f in results['files']] == ["a.csv", "b.csv"]
+    assert results['columns'] == expected['columns']
+
+    bomb = tmp_path / "bomb.csv.gz"
+    bomb.write_bytes(gzip.compress(b"0" * 100_000))
+    with pytest.raises(DecompressionLimitError):
+        decompress_file(str(bomb), "gzip", str(tmp_path / "out"), budget=10_000)
+    with pytest.raises(DecompressionLimitError):
+        list(iter_zip_members(str(archive), str(tmp_path), budget=10))
+
+def test_excel_sheet_selection_and_all_sheets(tmp_path):
+    from app.routers.upload import _profile_upload
+    from app.utils.file_parser import excel_sheet_names
+
+    path = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]}).to_excel(writer, index=False, sheet_name="Orders")
+        pd.DataFrame({"sku": ["x", "y"]}).to_excel(writer, index=False, sheet_name="Items")
+
+    assert excel_sheet_names(str(path)) == ["Orders", "Items"]
+    assert list(parse_file(str(path), "book.xlsx").columns) == ["id", "name"]
+    assert list(parse_file(str(path), "book.xlsx", sheet="Items").columns) == ["sku"]
+
+    events = []
+    results = _profile_upload(str(path), "book.xlsx", False, 0, False, sheet="*", progress=lambda e, d: events.append((e, d)))
+    assert [(s['sheet'], s['summary']['row_count']) for s in results['sheets']] == [("Orders", 3), ("Items", 2)]
+    assert results['columns'] == results['sheets'][0]['columns']
+    # Sheets run concurrently, so each event names its sheet and positions count within it
+    columns = sorted((d['sheet'], d['position'], d['column']['name']) for e, d in events if e == "column")
+    assert columns == [("Items", 0, "sku"), ("Orders", 0, "id"), ("Orders", 1, "name")]
+    assert sorted(d['sheet'] for e, d in events if e == "start") == ["Items", "Orders"]
+
+def test_wide_table_batches_match_per_column_profiles(monkeypatch):
+    import numpy as np
+    import app.services.profiler.wide as wide
+
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({f"f{i}": np.round(rng.normal(size=300), 1) for i in range(20)})
+    df.iloc[rng.integers(0, 300, 40), 3] = np.nan
+    df["ties"] = rng.permutation(np.repeat(np.arange(30), 10))
+    df["small"] = rng.integers(0, 5, 300).astype("uint8")
+    df["f32"] = rng.normal(size=300).astype("float32")
+    df["empty"] = np.nan
+    df["label"] = rng.choice(["a", "b"], 300)
+    df["flag"] = rng.random(300) > 0.5
+
+    expected = profile_dataset(df, wide_min_columns=0)
+    assert profile_dataset(df, wide_min_columns=1) == expected
+
+    # Long columns count values by hashing instead of from the sorted block
+    monkeypatch.setattr(wide, "_SORT_COUNT_ROWS", 0)
+    monkeypatch.setattr(wide, "_BATCH_CELLS", 1000)
+    assert profile_dataset(df, wide_min_columns=1) == expected
+
+def test_compaction_keeps_profiles_and_reports_memory():
+    df = pd.DataFrame({
+        "city": ["Paris", "Rome", "", None, "Paris", "Rome"] * 50,
+        "date": ["2024-01-01", "2024-02-03"] * 150,
+        "email": ["a@b.com", "c@d.org", None] * 100,
+        "small": list(range(-3, 297)),
+        "id": [f"id{i}" for i in range(300)],
+    })
+    before = df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+    expected = profile_dataset(df.copy())
+    compacted = df.copy()
+    results = profile_dataset(compacted, compact=True)
+
+    compaction = results['summary'].pop('compaction')
+    assert compaction['categorical_columns'] == ["city", "date", "email"]
+    assert compaction['downcast_columns'] == ["small"]
+    assert str(compacted["small"].dtype) == "int16"
+    assert compacted["id"].dtype == object
+    assert compaction['memory_mb_before'] == pytest.approx(before, rel=0.01)
+    assert results['summary'].pop('memory_mb') < expected['summary'].pop('memory_mb')
+    assert results == expected
+
+def test_sampled_profile_estimates_with_confidence_intervals():
+    import numpy as np
+    from app.services.profiler.streaming import iter_row_chunks
+    from app.services.profiler.sampling import profile_sample, sample_size_for_margin
+
+    assert sample_size_for_margin(0.01, 0.95) == 9604
+    rng = np.random.default_rng(11)
+    n = 50_000
+    df = pd.DataFrame({
+        "x": np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        "code": rng.choice(["AB-12", "x9"], n, p=[0.8, 0.2]),
+        "region": rng.choice(["north", "south"], n, p=[0.9, 0.1]),
+    })
+
+    results = profile_sample(iter_row_chunks(df, 7000), margin=0.02, stratify="region")
+    sample = results['sample']
+    assert (sample['population_rows'], sample['sample_rows'], sample['complete']) == (n, 2401, False)
+    strata = {s['value']: s for s in sample['strata']}
+    for stratum in strata.values():
+        # Proportional allocation, so the sample stays self-weighting
+        assert stratum['sample_rows'] == pytest.approx(2401 * stratum['population_rows'] / n, abs=1)
+    assert sum(s['sample_rows'] for s in strata.values()) == 2401
+    assert results['summary']['row_count'] == n
+    # Duplicates among sampled rows say little about the population's
+    assert results['summary']['duplicate_rows'] is None
+    assert 0 < results['summary']['sample_duplicate_rows'] < sample['sample_rows']
+
+    x, code = results['columns'][0], results['columns'][1]
+    low, high = x['confidence_intervals']['null_percentage']
+    assert low <= df['x'].isna().mean() * 100 <= high
+    assert x['null_count'] == pytest.approx(x['null_percentage'] / 100 * n, abs=1)
+    share = code['patterns']['top_patterns'][0]
+    assert share['pattern'] == "AA-99" and share['interval'][0] <= 80 <= share['interval'][1]
+
+    # A sample holding every row is the dataset, in order, with zero-width intervals
+    small = df.head(500)
+    exact = profile_sample(iter_row_chunks(small, 64))
+    assert exact['sample']['complete']
+    assert exact['summary']['duplicate_rows'] == profile_dataset(small)['summary']['duplicate_rows']
+    assert exact['columns'][0]['null_count'] == profile_dataset(small)['columns'][0]['null_count']
+    low, high = exact['columns'][0]['confidence_intervals']['null_percentage']
+    assert low == high
+
+def test_progress_events_stream_columns_before_summary():
+    import asyncio
+    from app.services.progress import ProgressBroker
+
+    df = pd.DataFrame({"a": [1, 2, 2], "b": ["x", "y", None], "c": [0.5, None, 1.5]})
+    broker = ProgressBroker()
+
+    async def follow():
+        broker.open("job")
+        _, queue = broker.subscribe("job")
+        results = profile_dataset(df, progress=broker.reporter("job"))
+        broker.finish("job", results)
+        events = []
+        while not events or events[-1][0] != "completed":
+            events.append(await queue.get())
+        return results, events
+
+    results, events = asyncio.run(follow())
+    assert [name for name, _ in events] == ["start", "column", "column", "column", "completed"]
+    assert events[0][1] == {"row_count": 3, "column_count": 3}
+    assert [(data["columns_done"], data["columns_total"], data["position"]) for _, data in events[1:4]] == [(1, 3, 0), (2, 3, 1), (3, 3, 2)]
+    assert [data["column"] for _, data in events[1:4]] == results["columns"]
+    assert events[-1][1]["summary"] == results["summary"]
+    assert broker.snapshot("job") is None
+
+def test_polars_and_sampled_profiles_report_progress():
+    from app.services.profiler.polars_engine import profile_polars
+    from app.services.profiler.sampling import profile_sample
+    from app.utils.file_parser import scan_file
+
+    content = b"id,name\n1,a\n2,b\n3,\n4,d"
+    events = []
+    results = profile_polars(scan_file(content, "data.csv"), progress=lambda e, d: events.append((e, d)))
+    assert events[0] == ("start", {"row_count": 4, "column_count": 2})
+    assert [(d['position'], d['column']) for _, d in events[1:]] == list(enumerate(results['columns']))
+
+    df = pd.DataFrame({"a": range(1000), "b": ["x", None] * 500})
+    events = []
+    results = profile_sample([df], margin=0.1, progress=lambda e, d: events.append((e, d)))
+    assert events[0][1]['row_count'] == 1000
+    assert events[0][1]['sample_rows'] == results['sample']['sample_rows'] < 1000
+    # Column events carry the same population estimates as the final profile
+    assert [d['column'] for _, d in events[1:]] == results['columns']
+
+def test_profile_levels_and_quick_preview():
+    from app.services.profiler.analyzers import resolve_analyzers
+
+    df = pd.DataFrame({"a": [1, 2, 2, 100], "b": ["x@y.com", "x@y.com", None, "z@w.org"]})
+    assert resolve_analyzers(analyzers=["outliers"]) == {"types", "completeness", "stats", "outliers"}
+    with pytest.raises(ValueError):
+        resolve_analyzers(analyzers=["nope"])
+
+    quick = profile_dataset(df.copy(), level="quick")
+    assert quick['analyzers']['skipped'] == ["memory", "distinct", "top_values", "semantic_types", "stats", "outliers", "patterns", "duplicates"]
+    b_col = quick['columns'][1]
+    assert (b_col['inferred_type'], b_col['null_count']) == ("string", 1)
+    assert b_col['distinct_count'] is b_col['top_values'] is b_col['patterns'] is b_col['outliers'] is None
+    assert (b_col['quality_score'], b_col['issues'][0]['type']) == (None, "completeness")
+    summary = quick['summary']
+    assert summary['duplicate_rows'] is summary['memory_mb'] is summary['quality_score'] is summary['quality_grade'] is None
+
+    standard = profile_dataset(df.copy(), analyzers=["outliers", "patterns", "duplicates"])
+    assert standard['columns'][0]['outliers']['count'] == 1 and standard['columns'][0]['top_values'] is None
+    assert standard['summary']['quality_score'] is not None
+
+    previews = []
+    full = profile_dataset(df.copy(), preview=previews.append)
+    assert previews == [quick]
+    assert "analyzers" not in full
+    assert full == profile_dataset(df.copy())
+    assert full['columns'][0]['stats']['max'] == 100
+
+def test_chunked_profiling_converts_numbers_and_datetimes_stored_as_text():
+    import numpy as np
+    from app.services.profiler.streaming import profile_chunks, iter_row_chunks
+
+    df = pd.DataFrame({
+        "amount": [f" {i % 17}.5" if i % 9 else None for i in range(120)],
+        "code": [str(i * 3) for i in range(120)],
+        "when": [f"{i % 12 + 1:02d}/{i % 28 + 1:02d}/2024" for i in range(120)],
+        "stamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(120), unit="h"),
+    })
+    df.loc[100, "amount"] = "900"
+
+    full = profile_dataset(df.copy())
+    streamed = profile_chunks(iter_row_chunks(df, 25))
+    for expected, actual in zip(full['columns'], streamed['columns']):
+        assert actual['inferred_type'] == expected['inferred_type']
+        assert actual['stats'] == pytest.approx(expected['stats'])
+        assert actual['outliers'] == expected['outliers']
+    assert streamed['columns'][0]['outliers']['count'] == 1
+    assert streamed['columns'][2]['stats'] == {"min": "2024-01-01T00:00:00", "max": "2024-12-28T00:00:00"}
+
+def test_multipart_file_stream_extracts_file_field_piecewise():
+    from app.utils.multipart_stream import MultipartFileStream
+
+    body = (
+        b"--xyz\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+        b"--xyz\r\nContent-Disposition: form-data; name=\"file\"; filename=\"data.csv\"\r\n"
+        b"Content-Type: text/csv\r\n\r\na,b\r\n1,2\r\n--xyz--\r\n"
+    )
+    stream = MultipartFileStream("multipart/form-data; boundary=xyz")
+    received = b"".join(piece for i in range(0, len(body), 7) for piece in stream.feed(body[i:i + 7]))
+    stream.finish()
+    assert (stream.filename, stream.complete, received) == ("data.csv", True, b"a,b\r\n1,2")
+    with pytest.raises(ValueError):
+        MultipartFileStream("application/json")
+
+def test_duplicate_detection_matches_duplicated_for_equal_values():
+    import numpy as np
+    from app.services.profiler.duplicates import find_duplicate_rows
+
+    frames = [
+        pd.DataFrame({"a": [0.0, -0.0, 1.0]}),
+        pd.DataFrame({"a": [np.nan, -np.nan, 1.0], "b": ["x", "x", "y"]}),
+        pd.DataFrame({"a": pd.Series([1, 1.0, True, "1"], dtype=object)}),
+        pd.DataFrame({"a": pd.Series([-0.0, 0.0, None], dtype="Float64")}),
+    ]
+    for df in frames:
+        assert find_duplicate_rows(df)['duplicate_rows'] == int(df.duplicated().sum()) > 0
+
+    # An integer column that turns float (a missing value) in a later chunk hashes alike
+    from app.services.profiler.streaming import profile_chunks
+    chunks = [pd.DataFrame({"a": [1, 2, 3], "b": [True, False, True]}), pd.DataFrame({"a": [1.0, 2.0, np.nan], "b": [1.0, 0.0, 1.0]})]
+    summary = profile_chunks(chunks)['summary']
+    assert summary['duplicate_rows'] == int(pd.concat(chunks).duplicated().sum()) == 2
+    assert summary['estimated_fields'] == ['duplicate_rows']
+
+
+def test_duplicate_counter_spills_to_disk_past_its_budget():
+    import os
+    from app.services.profiler.duplicates import DuplicateCounter, row_hashes
+    df = pd.DataFrame({"a": [i % 700 for i in range(5000)], "b": [i % 3 for i in range(5000)]})
+    chunks = [df.iloc[i:i + 500] for i in range(0, len(df), 500)]
+
+    spilled, in_memory = DuplicateCounter(max_bytes=8 * 1000), DuplicateCounter()
+    for chunk in chunks:
+        spilled.add(row_hashes(chunk))
+        in_memory.add(row_hashes(chunk))
+    assert spilled.spill is not None and spilled.nbytes <= 8 * 1000
+    path = spilled.spill.name
+
+    merged = DuplicateCounter(max_bytes=8 * 1000)
+    merged.merge(spilled)
+    assert spilled.count() == merged.count() == in_memory.count() == int(df.duplicated().sum())
+    spilled.close()
+    assert not os.path.exists(path)
+
+
+@pytest.fixture
+def upload_app(monkeypatch):
+    from collections import defaultdict
+    from fastapi import FastAPI
+    from app.routers import upload, profile
+    from app.utils.rate_limiter import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "requests", defaultdict(list))
+    monkeypatch.setitem(rate_limiter.limits, "upload", {"max_requests": 100, "window_minutes": 60})
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/api")
+    app.include_router(profile.router, prefix="/api/profile")
+    return app
+
+
+@pytest.fixture
+def upload_client(upload_app):
+    from fastapi.testclient import TestClient
+    with TestClient(upload_app) as client:
+        yield client
+
+
+def test_upload_rejects_options_sampled_and_chunked_profiles_ignore(upload_client, monkeypatch, tmp_path):
+    from app.routers import upload
+    csv = "a,b\n" + "".join(f"{i},{i % 7}\n" for i in range(2000))
+
+    for params in [{"approximate": "true"}, {"duplicate_groups": 3}, {"engine": "polars"}, {"level": "quick"}, {"quick_first": "true"}]:
+        response = upload_client.post("/api/upload", params={"sample": "true", **params}, files={"file": ("data.csv", csv)})
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("sample does not support")
+
+    # Past MAX_FILE_SIZE the file would be profiled in chunks; the spooled upload is removed
+    monkeypatch.setattr(upload, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(upload, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    for params, rejected in [({"duplicate_groups": 3}, "duplicate_groups"), ({"compact": "true"}, "compact"), ({"level": "standard"}, "analyzers")]:
+        response = upload_client.post("/api/upload", params=params, files={"file": ("data.csv", csv)})
+        assert response.status_code == 400
+        assert response.json()["detail"].endswith(f"do not support {rejected}")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_sheds_load_with_retry_after_when_the_executor_is_full(upload_client, monkeypatch):
+    import threading
+    from app.routers import upload
+    from app.services.profiling_executor import ProfilingExecutor
+
+    executor = ProfilingExecutor(max_workers=1, max_queue=1)
+    monkeypatch.setattr(upload, "profiling_executor", executor)
+    release = threading.Event()
+    blocked = [executor.submit(release.wait), executor.submit(release.wait)]
+    try:
+        response = upload_client.post("/api/upload", files={"file": ("data.csv", "a\n1\n")})
+        assert response.status_code == 503
+        assert response.json()["detail"]["error"] == "Profiling queue full"
+        assert response.headers["Retry-After"] == str(response.json()["detail"]["retry_after_seconds"])
+        assert int(response.headers["Retry-After"]) >= 1
+    finally:
+        release.set()
+        for future in blocked:
+            future.result(timeout=5)
+        executor.shutdown()
+    # Shed on the headers, before the body was spooled or a job submitted
+    assert executor.get_stats()["rejected"] == 0
+
+
+def test_oversized_upload_is_rejected_before_the_body_is_read(upload_app, monkeypatch, tmp_path):
+    import asyncio
+    from app.routers import upload
+
+    # TestClient reads the whole body before calling the app, so the ASGI app is driven directly
+    monkeypatch.setattr(upload, "MAX_STREAMING_FILE_SIZE", 64 * 1024)
+    monkeypatch.setattr(upload, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    boundary = "limit-test"
+    pieces = (
+        [f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="data.csv"\r\n\r\na\n'.encode()]
+        + [b"1\n" * 8192] * 64
+        + [f"\r\n--{boundary}--\r\n".encode()]
+    )
+
+    def post(declare_length: bool):
+        headers = [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())]
+        if declare_length:
+            headers.append((b"content-length", str(sum(map(len, pieces))).encode()))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+            "path": "/api/upload", "raw_path": b"/api/upload", "root_path": "", "query_string": b"",
+            "headers": headers, "client": ("127.0.0.1", 50000), "server": ("test", 80),
+        }
+        consumed, messages = 0, []
+
+        async def receive():
+            nonlocal consumed
+            if consumed == len(pieces):
+                return {"type": "http.disconnect"}
+            consumed += 1
+            return {"type": "http.request", "body": pieces[consumed - 1], "more_body": consumed < len(pieces)}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(upload_app(scope, receive, send))
+        return messages[0]["status"], consumed
+
+    # A declared size over the limit is refused once the filename is known, from the first piece
+    assert post(declare_length=True) == (413, 1)
+    # Otherwise as soon as more than the limit has arrived: the first piece's two bytes and four 16KB pieces
+    assert post(declare_length=False) == (413, 5)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_progress_events_endpoint_streams_a_jobs_events(upload_client):
+    import json
+
+    def read_events(url):
+        with upload_client.stream("GET", url) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = response.read().decode()
+        events = []
+        for message in body.split("\n\n"):
+            lines = [line for line in message.split("\n") if line and not line.startswith(":")]
+            if lines:
+                fields = dict(line.split(": ", 1) for line in lines)
+                events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    response = upload_client.post("/api/upload", files={"file": ("data.csv", "a,b\n1,x\n2,y\n2,y\n")})
+    events_url = response.json()["events_url"]
+    events = read_events(events_url)
+    assert [event for event, _ in events] == ["start", "column", "column", "completed"]
+    assert events[0][1] == {"row_count": 3, "column_count": 2}
+    assert [data["column"]["name"] for event, data in events if event == "column"] == ["a", "b"]
+    assert events[-1][1]["summary"]["duplicate_rows"] == 1
+
+    # A finished job replays the same events
+    assert read_events(events_url) == events
+    assert upload_client.get("/api/profile/missing/events").status_code == 404
@@ -16,7 +16,7 @@ interface Props {
 
 interface FilePreview {
   file: File;
-  type: 'csv' | 'excel' | 'json';
+  type: 'csv' | 'excel' | 'json' | 'columnar';
   size: string;
 }
 
@@ -39,13 +39,23 @@ const fileTypeConfig = {
     bgColor: 'bg-[var(--color-warning)]/10',
     label: 'JSON',
   },
+  columnar: {
+    icon: File,
+    color: 'text-[var(--color-accent)]',
+    bgColor: 'bg-[var(--color-accent)]/10',
+    label: 'Parquet / Arrow',
+  },
 };
 
-function getFileType(file: File): 'csv' | 'excel' | 'json' | null {
-  const extension = file.name.split('.').pop()?.toLowerCase();
-  if (extension === 'csv') return 'csv';
+function getFileType(file: File): 'csv' | 'excel' | 'json' | 'columnar' | null {
+  // Compressed files are typed by the format inside, e.g. data.csv.gz
+  const name = file.name.toLowerCase().replace(/\.(gz|bz2|zst|xz)$/, '');
+  const extension = name.split('.').pop();
+  // Zip archives are shown as CSV, the usual export they hold
+  if (['csv', 'zip'].includes(extension || '')) return 'csv';
   if (['xlsx', 'xls'].includes(extension || '')) return 'excel';
-  if (extension === 'json') return 'json';
+  if (['json', 'ndjson', 'jsonl'].includes(extension || '')) return 'json';
+  if (['parquet', 'arrow', 'feather', 'ipc'].includes(extension || '')) return 'columnar';
   return null;
 }
 
@@ -65,7 +75,7 @@ const FileUploader: React.FC<Props> = ({ onSuccess }) => {
   const validateFile = useCallback((file: File): string | null => {
     const type = getFileType(file);
     if (!type) {
-      return 'Invalid file type. Please upload a CSV, Excel, or JSON file.';
+      return 'Invalid file type. Please upload a CSV, Excel, JSON, Parquet or Arrow file.';
     }
     if (file.size > 50 * 1024 * 1024) {
       return 'File too large. Maximum size is 50MB.';
@@ -180,7 +190,7 @@ const FileUploader: React.FC<Props> = ({ onSuccess }) => {
                   id="file-input"
                   type="file"
                   className="hidden"
-                  accept=".csv,.xlsx,.xls,.json"
+                  accept=".csv,.xlsx,.xls,.json,.ndjson,.jsonl,.parquet,.arrow,.feather,.ipc,.gz,.bz2,.zst,.xz,.zip"
                   onChange={(e) => e.target.files?.[0] && handleFileSelect(e.target.files[0])}
                 />
 
@@ -87,6 +87,7 @@ const OverviewDashboard: React.FC<Props> = ({ jobId, status, onStatusUpdate }) =
   const [error, setError] = useState<string | null>(null);
   const [exporting, setExporting] = useState<string | null>(null);
   const [selectedColumn, setSelectedColumn] = useState<ColumnData | null>(null);
+  const [progress, setProgress] = useState<{ done: number; total: number } | null>(null);
 
   const handleExport = async (format: 'json' | 'csv' | 'pdf') => {
     setExporting(format);
@@ -126,27 +127,57 @@ const OverviewDashboard: React.FC<Props> = ({ jobId, status, onStatusUpdate }) =
   };
 
   useEffect(() => {
-    const fetchResults = async () => {
+    let cancelled = false;
+    let events: EventSource | null = null;
+
+    const fetchResults = async (poll: boolean) => {
       try {
         const response = await axios.get(`${API_BASE_URL}/api/profile/${jobId}`);
+        if (cancelled) return;
         if (response.data.status === 'completed') {
           setData(response.data.result);
           onStatusUpdate('completed');
         } else if (response.data.status === 'failed') {
           setError(response.data.error || 'Processing failed');
           onStatusUpdate('failed');
-        } else {
-          setTimeout(fetchResults, 2000);
+        } else if (poll) {
+          setTimeout(() => fetchResults(true), 2000);
         }
       } catch (err) {
+        if (cancelled) return;
         setError('Failed to fetch results');
         onStatusUpdate('failed');
       }
     };
 
     if (status === 'processing') {
-      fetchResults();
+      if (typeof EventSource === 'undefined') {
+        fetchResults(true);
+      } else {
+        // Column progress is pushed as it happens; the full result is fetched once at the end
+        events = new EventSource(`${API_BASE_URL}/api/profile/${jobId}/events`);
+        events.addEventListener('column', (event) => {
+          const update = JSON.parse((event as MessageEvent).data);
+          setProgress({ done: update.columns_done, total: update.columns_total });
+        });
+        const finish = () => {
+          events?.close();
+          fetchResults(false);
+        };
+        events.addEventListener('completed', finish);
+        events.addEventListener('failed', finish);
+        events.onerror = () => {
+          // Stream unavailable (e.g. a proxy without SSE support): fall back to polling
+          events?.close();
+          fetchResults(true);
+        };
+      }
     }
+
+    return () => {
+      cancelled = true;
+      events?.close();
+    };
   }, [jobId, status, onStatusUpdate]);
 
   // Calculate issues summary from columns
@@ -291,8 +322,15 @@ const OverviewDashboard: React.FC<Props> = ({ jobId, status, onStatusUpdate }) =
             Analyzing Data Quality
           </h2>
           <p className="text-[var(--color-text-muted)]">
-            Running profiling algorithms and detecting anomalies...
+            {progress
+              ? `Profiled ${progress.done} of ${progress.total} columns...`
+              : 'Running profiling algorithms and detecting anomalies...'}
           </p>
+          {progress && progress.total > 0 && (
+            <div className="w-64 mt-4">
+              <ProgressBar value={progress.done} max={progress.total} variant="brand" />
+            </div>
+          )}
         </div>
 
         {/* Skeleton cards */}